@@ -34,7 +34,7 @@
 ##  ------------------------------- ##
 ##     Written by: Jason Deters     ##
 ##  ------------------------------- ##
-##    Last Edited on:  2020-05-27   ##
+##    Last Edited on:  2026-10-18   ##
 ##  ------------------------------- ##
 ######################################
 
@@ -49,14 +49,13 @@ import tkinter.filedialog
 import os
 import sys
 import shutil
-import subprocess
 import traceback
 import datetime
 import time
 import ftplib
+import multiprocessing
 
 # Import 3rd-Party Libraries
-import PyPDF2
 import requests
 
 # Find module path
@@ -66,21 +65,13 @@ ROOT = os.path.split(MODULE_PATH)[0]
 
 # Import Custom Libraries
 try:
-    from . import huc_query
-    from . import custom_watershed_query
-    from . import check_usa
-    from . import watershed_summary
+    from . import batch_engine
     from . import help_window
-    from . import get_all
     from .utilities import JLog
 except Exception:
     # Old unfrozen version backwards compatibility step
-    import huc_query
-    import custom_watershed_query
-    import check_usa
-    import watershed_summary
+    import batch_engine
     import help_window
-    import get_all
     # Add utilities folder to path directly
     PYTHON_SCRIPTS_FOLDER = os.path.join(ROOT, 'Python Scripts')
     TEST = os.path.exists(PYTHON_SCRIPTS_FOLDER)
@@ -95,17 +86,6 @@ except Exception:
         sys.path.append(UTILITIES_FOLDER)
     import JLog
 
-# Version stuff
-get_all.ensure_version_file()
-VERSION_FILES_FOLDER = os.path.join(ROOT, 'v')
-VERSION_FILE_PATH = os.path.join(VERSION_FILES_FOLDER, 'main_ex')
-with open(VERSION_FILE_PATH, 'r') as VERSION_FILE:
-    for line in VERSION_FILE:
-        VERSION_STRING = line.replace('\n','')
-        VERSION_LIST = VERSION_STRING.split('.')
-        VERSION_FOR_PATHS = 'v{}_{}_{}'.format(VERSION_LIST[0], VERSION_LIST[1], VERSION_LIST[2])
-        break
-
 def click_help_button():
     help_app = help_window.Main()
     help_app.run()
@@ -121,9 +101,8 @@ class Main(object):
         self.date_entry_boxes = []
         self.custom_watershed_fields_active = False
         # Define class attributes
-        self.rain_instance = None
-        self.snow_instance = None
-        self.snow_depth_instance = None
+        # Date range batches run their dates in parallel processes
+        self.engine = batch_engine.BatchEngine(open_results=True, date_workers=batch_engine.DEFAULT_DATE_WORKERS)
         self.input_list_list_prcp = []
         self.input_list_list_snow = []
         self.input_list_list_snwd = []
@@ -534,6 +513,7 @@ class Main(object):
         """
         Closes the program.
         """
+        self.engine.shutdown()
         self.master.destroy()
     # End of quit_command method
 
@@ -942,104 +922,15 @@ class Main(object):
                         fixed_y_max,
                         forecast_enabled):
         """Test whether or not all parameters are valid"""
-        parameters_valid = True
-        try:
-            float(latitude)
-        except Exception:
-            self.L.Wrap('Latitude must be in decimal degree format!')
-            parameters_valid = False
-        try:
-            float(longitude)
-        except Exception:
-            self.L.Wrap('Longitude must be in decimal degree format!')
-            parameters_valid = False
-        # Ensure location is within USA boundary
-        in_usa = check_usa.main(latitude, longitude)
-        if not in_usa:
-            self.L.Wrap('Coordinates must be within the United States!')
-            parameters_valid = False
-        try:
-            observation_year = int(observation_year)
-            if observation_year < 1900:
-                if str(observation_year) != '50' and str(observation_year) != '30':
-                    self.L.Wrap('Year must be greater than 1900!')
-                    parameters_valid = False
-        except Exception:
-            self.L.Wrap('Year must be a number!')
-            parameters_valid = False
-        try:
-            observation_month = int(observation_month)
-            if observation_month > 12:
-                self.L.Wrap('Month cannot exceed 12!')
-                parameters_valid = False
-            if observation_month < 1:
-                self.L.Wrap('Month cannot be less than 1!')
-                parameters_valid = False
-        except Exception:
-            self.L.Wrap('Month must be a number!')
-            parameters_valid = False
-        try:
-            observation_day = int(observation_day)
-            if observation_day > 31:
-                self.L.Wrap('Day cannot exceed 31')
-                parameters_valid = False
-            if observation_day < 1:
-                self.L.Wrap('Day cannot be less than 1!')
-        except Exception:
-            self.L.Wrap('Day must be a number!')
-            parameters_valid = False
-        # Discern Watershed Scale
-        watershed_scale = self.watershed_scope_string_var.get()
-        # Test if shapefile exists
-        if custom_watershed_file != '':
-            watershed_file_exists = os.path.exists(custom_watershed_file)
-            if not watershed_file_exists:
-                self.L.Wrap('SUPPLIED CUSTOM WATERSHED FILE NOT FOUND!')
-                parameters_valid = False
-            watershed_extension = os.path.splitext(custom_watershed_file)[1]
-            if watershed_extension.lower() == '.shp':
-                prj_file = custom_watershed_file[:-4] + '.prj'
-                prj_exists = os.path.exists(prj_file)
-                if not prj_exists:
-                    self.L.Wrap('SUPPLIED CUSTOM WATERSHED FILE LACKS REQUIRED PROJECTION (.prj) FILE!')
-                    parameters_valid = False
-            if custom_watershed_name == '':
-                custom_watershed_name = os.path.splitext(os.path.split(custom_watershed_file)[1])[0]
-        else:
-            custom_watershed_file = None
-            if watershed_scale == 'Custom Polygon':
-                self.L.Wrap('"CUSTOM POLYGON" SELECTED BY NOT PROVIDED!')
-                parameters_valid = False
-        # Test for actual date
-        if parameters_valid:
-            try:
-                # RECTIFY INPUTS
-                if len(str(observation_day)) == 1:
-                    observation_day = '0'+str(observation_day)
-                else:
-                    observation_day = str(observation_day)
-                if len(str(observation_month)) == 1:
-                    observation_month = '0'+str(observation_month)
-                else:
-                    observation_month = str(observation_month)
-                observation_date = str(observation_year)+'-'+observation_month+'-'+observation_day
-                observation_datetime = datetime.datetime.strptime(observation_date, '%Y-%m-%d')
-            except Exception as error:
-                self.L.Wrap('')
-                self.L.Wrap('{}!'.format(str(error).upper()))
-                parameters_valid = False
-        if parameters_valid:
-            # Ensure date is no later than 2 days prior to current date
-            two_days_prior_datetime = datetime.datetime.today()- datetime.timedelta(days=2)
-            if observation_datetime > two_days_prior_datetime:
-                observation_date = two_days_prior_datetime.strftime('%Y-%m-%d')
-                self.L.Wrap('Date cannot exceed two days ago due to data availability')
-                self.L.Wrap('  Observation date updated to: {}'.format(observation_date))
-                observation_day = two_days_prior_datetime.strftime('%d')
-                observation_month = two_days_prior_datetime.strftime('%m')
-                observation_year = int(two_days_prior_datetime.strftime('%Y'))
-                observation_datetime = two_days_prior_datetime
-        return parameters_valid
+        inputs = batch_engine.validate_inputs(latitude,
+                                              longitude,
+                                              observation_year,
+                                              observation_month,
+                                              observation_day,
+                                              self.watershed_scope_string_var.get(),
+                                              custom_watershed_file,
+                                              log=self.L)
+        return inputs is not None
 
 
 
@@ -1047,11 +938,11 @@ class Main(object):
     def calculate_or_add_batch(self, batch, params):
         """
         If batch is False
-        --Executes main business logic of the Antecedent Precipitation Tool
+        --Executes main business logic of the Antecedent Precipitation Tool (see batch_engine)
         If batch is True
         --Adds current field values to batch list
         """
-        start_time = time.clock()
+        start_time = time.time()
         # Get Paramaters
         latitude = params[0]
         longitude = params[1]
@@ -1067,111 +958,19 @@ class Main(object):
         radio = params[11]
         fixed_y_max = params[12]
         forecast_enabled = params[13]
-        # Remove Spaces and Line Breaks from numeric fields (They were showing up when copying from Excel for some reason)
-        latitude = latitude.replace(' ', '').replace('\n', '')
-        longitude = longitude.replace(' ', '').replace('\n', '')
-        observation_year = observation_year.replace(' ', '').replace('\n', '')
-        observation_month = observation_month.replace(' ', '').replace('\n', '')
-        observation_day = observation_day.replace(' ', '').replace('\n', '')
         # Test whether or not all parameters are valid
-        parameters_valid = True
-        try:
-            float(latitude)
-        except Exception:
-            self.L.Wrap('Latitude must be in decimal degree format!')
-            parameters_valid = False
-        try:
-            float(longitude)
-        except Exception:
-            self.L.Wrap('Longitude must be in decimal degree format!')
-            parameters_valid = False
-        # Ensure location is within USA boundary
-        in_usa = check_usa.main(latitude, longitude)
-        if not in_usa:
-            self.L.Wrap('Coordinates must be within the United States!')
-            parameters_valid = False
-        try:
-            observation_year = int(observation_year)
-            if observation_year < 1900:
-                if str(observation_year) != '50' and str(observation_year) != '30':
-                    self.L.Wrap('Year must be greater than 1900!')
-                    parameters_valid = False
-        except Exception:
-            self.L.Wrap('Year must be a number!')
-            parameters_valid = False
-        try:
-            observation_month = int(observation_month)
-            if observation_month > 12:
-                self.L.Wrap('Month cannot exceed 12!')
-                parameters_valid = False
-            if observation_month < 1:
-                self.L.Wrap('Month cannot be less than 1!')
-                parameters_valid = False
-        except Exception:
-            self.L.Wrap('Month must be a number!')
-            parameters_valid = False
-        try:
-            observation_day = int(observation_day)
-            if observation_day > 31:
-                self.L.Wrap('Day cannot exceed 31')
-                parameters_valid = False
-            if observation_day < 1:
-                self.L.Wrap('Day cannot be less than 1!')
-        except Exception:
-            self.L.Wrap('Day must be a number!')
-            parameters_valid = False
-        # Test if shapefile exists
-        if custom_watershed_file != '':
-            watershed_file_exists = os.path.exists(custom_watershed_file)
-            if not watershed_file_exists:
-                self.L.Wrap('SUPPLIED CUSTOM WATERSHED FILE NOT FOUND!')
-                parameters_valid = False
-            watershed_extension = os.path.splitext(custom_watershed_file)[1]
-            if watershed_extension.lower() == '.shp':
-                prj_file = custom_watershed_file[:-4] + '.prj'
-                prj_exists = os.path.exists(prj_file)
-                if not prj_exists:
-                    self.L.Wrap('SUPPLIED CUSTOM WATERSHED FILE LACKS REQUIRED PROJECTION (.prj) FILE!')
-                    parameters_valid = False
-            if custom_watershed_name == '':
-                custom_watershed_name = os.path.splitext(os.path.split(custom_watershed_file)[1])[0]
-        else:
-            custom_watershed_file = None
-            if watershed_scale == 'Custom Polygon':
-                self.L.Wrap('"CUSTOM POLYGON" SELECTED BY NOT PROVIDED!')
-                parameters_valid = False
-        # Test for actual date
-        if parameters_valid:
-            try:
-                # RECTIFY INPUTS
-                if len(str(observation_day)) == 1:
-                    observation_day = '0'+str(observation_day)
-                else:
-                    observation_day = str(observation_day)
-                if len(str(observation_month)) == 1:
-                    observation_month = '0'+str(observation_month)
-                else:
-                    observation_month = str(observation_month)
-                observation_date = str(observation_year)+'-'+observation_month+'-'+observation_day
-                observation_datetime = datetime.datetime.strptime(observation_date, '%Y-%m-%d')
-            except Exception as error:
-                self.L.Wrap('')
-                self.L.Wrap('{}!'.format(str(error).upper()))
-                parameters_valid = False
-        # Ensure date is no later than 2 days prior to current date
-        if parameters_valid:
-            two_days_prior_datetime = datetime.datetime.today()- datetime.timedelta(days=2)
-            if observation_datetime > two_days_prior_datetime:
-                observation_date = two_days_prior_datetime.strftime('%Y-%m-%d')
-                self.L.Wrap('Date cannot exceed two days ago due to data availability')
-                self.L.Wrap('  Observation date updated to: {}'.format(observation_date))
-                observation_day = two_days_prior_datetime.strftime('%d')
-                observation_month = two_days_prior_datetime.strftime('%m')
-                observation_year = int(two_days_prior_datetime.strftime('%Y'))
-                observation_datetime = two_days_prior_datetime
+        inputs = batch_engine.validate_inputs(latitude,
+                                              longitude,
+                                              observation_year,
+                                              observation_month,
+                                              observation_day,
+                                              watershed_scale,
+                                              custom_watershed_file,
+                                              log=self.L)
         # Terminate function of parameters invalid
-        if not parameters_valid:
+        if inputs is None:
             return
+        latitude, longitude, observation_year, observation_month, observation_day = inputs
         if image_name == '':
             image_name = None
         if image_source == '':
@@ -1182,33 +981,14 @@ class Main(object):
             fixed_y_max = True
         if forecast_enabled == "1":
             forecast_enabled = True
-        # Import anteProcess
-        try:
-            from . import anteProcess
-        except Exception:
-            import anteProcess
         # Set data_variable specific variables
         if radio == 'Rain':
-            if self.rain_instance is None:
-                self.L.Wrap("Creating Rain anteProcess.Main() instance...")
-                self.rain_instance = anteProcess.Main()
             input_list_list = self.input_list_list_prcp
-            ante_instance = self.rain_instance
-            data_variable = 'PRCP'
         elif radio == 'Snow':
-            if self.snow_instance is None:
-                self.L.Wrap("Creating Snow anteProcess.Main() instance...")
-                self.snow_instance = anteProcess.Main()
             input_list_list = self.input_list_list_snow
-            ante_instance = self.snow_instance
-            data_variable = 'SNOW'
         elif radio == 'Snow Depth':
-            if self.snow_depth_instance is None:
-                self.L.Wrap("Creating Snow Depth anteProcess.Main() instance...")
-                self.snow_depth_instance = anteProcess.Main()
             input_list_list = self.input_list_list_snwd
-            ante_instance = self.snow_depth_instance
-            data_variable = 'SNWD'
+        data_variable = batch_engine.DATA_VARIABLES[radio]
         # Create Batch or Execute Function
         input_list = [data_variable,
                       latitude,
@@ -1228,332 +1008,20 @@ class Main(object):
                 self.L.Wrap('The selected inputs have already been added to the batch list.')
             self.L.Wrap("")
         if batch is False:
-#-WATERSHED START
+            self.engine.run_inputs(input_list,
+                                   input_list_list,
+                                   save_folder,
+                                   watershed_scale=watershed_scale,
+                                   custom_watershed_name=custom_watershed_name,
+                                   custom_watershed_file=custom_watershed_file,
+                                   fixed_y_max=fixed_y_max,
+                                   forecast_enabled=forecast_enabled)
             if radio == 'Rain':
-                # WATERSHED PROCESSING SECTION
-                if watershed_scale != 'Single Point':
-                    # Announce Watershed Processing
-                    self.L.print_title('WATERSHED IDENTIFICATION AND RANDOM SAMPLING')
-                    # Clear the Batch Queue (If necessary) [We currently don't support batch watershed runs]
-                    if len(input_list_list) > 1:
-                        # Let user know the batch processes are being cleared
-                        self.L.Wrap('Manual batch processing lists are not supported for Watershed Scales other than "Single Point"')
-                        self.L.Wrap('  Clearing Batch Process Queue to prepare for Watershed Random Sampling Points...')
-                        input_list_list = []
-                    self.L.Wrap('Selected Watershed Scale: {}'.format(watershed_scale))
-                    self.L.Wrap('Identifying and sampling watershed...')
-                    if watershed_scale != 'Custom Polygon':
-                        # Get HUC & Random Sampling Points
-                        huc, sampling_points, huc_square_miles = huc_query.id_and_sample(lat=latitude,
-                                                                                         lon=longitude,
-                                                                                         watershed_scale=watershed_scale)
-                    else:
-                        # Get Random Sampling points and square miles
-                        sampling_points, huc_square_miles = custom_watershed_query.shapefile_sample(lat=latitude,
-                                                                                                    lon=longitude,
-                                                                                                    shapefile=custom_watershed_file)
-                    # Add each sampling point to batch process
-                    self.L.print_section('Batch Process Queueing')
-                    self.L.Wrap('Adding Random Sampling Points for the watershed to the Batch Process Queue...')
-                    if watershed_scale != 'Custom Polygon':
-                        self.L.Wrap('{} ({}) - Watershed Sampling Points:'.format(watershed_scale, huc))
-                    else:
-                        self.L.Wrap('{} ({}) - Watershed Sampling Points:'.format(watershed_scale, custom_watershed_name))
-                    for sampling_point in sampling_points:
-                        # Create input list for sampling point
-                        input_list = [data_variable,
-                                      sampling_point[0],
-                                      sampling_point[1],
-                                      observation_year,
-                                      observation_month,
-                                      observation_day,
-                                      image_name,
-                                      image_source]
-                        # Add sampling point to input_list_list
-                        input_list_list.append(input_list)
-                        # Announce the addition of this sampling point
-                        self.L.Wrap(' Sampling Point {} - {}'.format(str(len(input_list_list)),
-                                                                     str(input_list)))
-                    self.L.print_separator_line()
-#-WATERSHED END
-            ### - INDIVIDUAL PROCESS OR BATCH ITERATION - ###
-            current_input_list_list = list(input_list_list)
-            
-            if not len(input_list_list) > 1:
-                self.L.print_title("SINGLE POINT ANALYSIS")
-                run_list = input_list + [save_folder, forecast_enabled]
-                self.L.Wrap('Running: '+str(run_list))
-                result_pdf, run_y_max, condition, ante_score, wet_dry_season, palmer_value, palmer_class = ante_instance.setInputs(run_list, watershed_analysis=False, all_sampling_coordinates=None)
-                if result_pdf is not None:
-                    # Open folder containing outputs
-                    version_folder = os.path.join(save_folder, VERSION_FOR_PATHS)
-                    coord_string = '{}, {}'.format(input_list[1], input_list[2])
-                    output_folder = os.path.join(version_folder, coord_string)
-                    subprocess.Popen('explorer "{}"'.format(output_folder))
-                    # Open PDF in new process
-                    self.L.Wrap('Opening PDF in a new process...')
-                    subprocess.Popen(result_pdf, shell=True)
-                del run_list
-            else:
-                pdf_list = []
-                highest_y_max = 0
-                # Ensure batches are saved to a folder (Force Desktop if empty)
-                if save_folder is None:
-                    save_folder = os.path.join(ROOT, 'Outputs')
-                    self.L.Wrap('Setting Output Folder to default location: {}...'.format(save_folder))
-                # Test for common naming
-                img_event_name = current_input_list_list[0][6]
-                for specific_input_list in current_input_list_list:
-                    if img_event_name != specific_input_list[6]:
-                        img_event_name = ''
-                        break
-                if img_event_name != '':
-                    img_event_name = '{} '.format(img_event_name)
-                # Calculate output_folder
-                if radio == 'Rain':
-                    if watershed_scale == 'Single Point':
-                        watershed_analysis = False
-                        version_folder = os.path.join(save_folder, VERSION_FOR_PATHS)
-                        coord_string = '{}, {}'.format(input_list[1], input_list[2])
-                        output_folder = os.path.join(version_folder, coord_string)
-                        # Define PDF Outputs
-                        final_path_variable = os.path.join(output_folder, '({}, {}) Batch Result.pdf'.format(latitude, longitude))
-                        final_path_fixed = os.path.join(output_folder, '({}, {}) Batch Result - Fixed.pdf'.format(latitude, longitude))
-                        # Define CSV Output
-                        csv_path = os.path.join(output_folder, '({}, {}) Batch Result.csv'.format(latitude, longitude))
-                    elif watershed_scale == 'Custom Polygon':
-                        watershed_analysis = True
-                        version_folder = os.path.join(save_folder, VERSION_FOR_PATHS)
-                        general_watershed_folder = os.path.join(version_folder, '~Watershed')
-                        watershed_scale_folder = os.path.join(general_watershed_folder, watershed_scale)
-                        output_folder = os.path.join(watershed_scale_folder, custom_watershed_name)
-                        watershed_analysis = True
-                        # Define PDF Outputs
-                        final_path_variable = os.path.join(output_folder, '{} - {} - Batch Result.pdf'.format(observation_date, custom_watershed_name))
-                        watershed_summary_path = os.path.join(output_folder, '{} - {} - Summary Page.pdf'.format(observation_date, custom_watershed_name))
-                        final_path_fixed = os.path.join(output_folder, '{} - {} - Batch Result - Fixed Scale.pdf'.format(observation_date, custom_watershed_name))
-                        # Define CSV Output
-                        csv_path = os.path.join(output_folder, '{} - {} - Sampling Results.csv'.format(observation_date, custom_watershed_name))
-                    else:
-                        version_folder = os.path.join(save_folder, VERSION_FOR_PATHS)
-                        general_watershed_folder = os.path.join(version_folder, '~Watershed')
-                        watershed_scale_folder = os.path.join(general_watershed_folder, watershed_scale)
-                        output_folder = os.path.join(watershed_scale_folder, huc)
-                        watershed_analysis = True
-                        # Define PDF Outputs
-                        final_path_variable = os.path.join(output_folder, '{} - {} - Batch Result.pdf'.format(observation_date, huc))
-                        watershed_summary_path = os.path.join(output_folder, '{} - {} - Summary Page.pdf'.format(observation_date, huc))
-                        final_path_fixed = os.path.join(output_folder, '{} - {} - Batch Result - Fixed Scale.pdf'.format(observation_date, huc))
-                        # Define CSV Output
-                        csv_path = os.path.join(output_folder, '{} - {} - Sampling Results.csv'.format(observation_date, huc))
-                elif radio == 'Snow':
-                    watershed_analysis = False
-                    version_folder = os.path.join(save_folder, VERSION_FOR_PATHS)
-                    snow_folder = os.path.join(version_folder, 'Snowfall')
-                    coord_string = '{}, {}'.format(input_list[1], input_list[2])
-                    output_folder = os.path.join(snow_folder, coord_string)
-                    # Define PDF Outputs
-                    final_path_variable = os.path.join(output_folder, '({}, {}) Batch Result.pdf'.format(latitude, longitude))
-                    final_path_fixed = os.path.join(output_folder, '({}, {}) Batch Result - Fixed.pdf'.format(latitude, longitude))
-                    # Define CSV Output
-                    csv_path = os.path.join(output_folder, '({}, {}) Batch Result.csv'.format(latitude, longitude))
-                elif radio == 'Snow Depth':
-                    watershed_analysis = False
-                    version_folder = os.path.join(save_folder, VERSION_FOR_PATHS)
-                    snow_depth_folder = os.path.join(version_folder, 'Snow Depth')
-                    coord_string = '{}, {}'.format(input_list[1], input_list[2])
-                    output_folder = os.path.join(snow_depth_folder, coord_string)
-                    # Define PDF Outputs
-                    final_path_variable = os.path.join(output_folder, '({}, {}) Batch Result.pdf'.format(latitude, longitude))
-                    final_path_fixed = os.path.join(output_folder, '({}, {}) Batch Result - Fixed.pdf'.format(latitude, longitude))
-                    # Define CSV Output
-                    csv_path = os.path.join(output_folder, '({}, {}) Batch Result.csv'.format(latitude, longitude))
-                # Add save_folder and Forecast setting to input lists
-                for count, specific_input_list in enumerate(current_input_list_list):
-                    current_input_list_list[count] = specific_input_list + [save_folder, forecast_enabled]
-
-
-                # Create csv_writer
-                csv_writer = JLog.PrintLog(Delete=True,
-                                           Log=csv_path,
-                                           Indent=0,
-                                           Width=400,
-                                           LogOnly=True)
-                # Write first line of CSV
-                if watershed_scale == 'Single Point':
-                    csv_writer.Wrap('Latitude,Longitude,Date,PDSI Value,PDSI Class,Season,ARC Score,Antecedent Precip Condition')
-                else:
-                    csv_writer.Wrap('Latitude,Longitude,Date,PDSI Value,PDSI Class,Season,ARC Score,Antecedent Precip Condition')
-                # Create watershed_summary results_list
-                watershed_results_list = []
-                # Set PDF Counter and Part Counter to 0
-                pdf_count = 0
-                part_count = 0
-                parts_2_delete = []
-                total_pdfs = len(current_input_list_list)
-                run_count = 0
-                for current_input_list in current_input_list_list:
-                    run_count += 1
-                    if watershed_scale == 'Single Point':
-                        sampling_points = None
-                        self.L.print_title("Single Point Batch Analysis - Date {} of {}".format(run_count, total_pdfs))
-                    else:
-                        self.L.print_title("{} WATERSHED ANALYSIS - SAMPLING POINT {} of {}".format(watershed_scale, run_count, total_pdfs))
-                    self.L.Wrap('')
-                    self.L.Wrap('Running: '+str(current_input_list))
-                    self.L.Wrap('')
-                    result_pdf, run_y_max, condition, ante_score, wet_dry_season, palmer_value, palmer_class = ante_instance.setInputs(current_input_list, watershed_analysis=watershed_analysis, all_sampling_coordinates=sampling_points)
-                    if run_y_max > highest_y_max:
-                        highest_y_max = run_y_max
-                    if result_pdf is not None:
-                        if total_pdfs > 1:
-                            pdf_list.append(result_pdf)
-                            # CHECK TO SEE IF INCREMENTAL MERGING IS NECESSARY
-                            pdf_count += 1
-                            if len(pdf_list) > 365:
-                                if (total_pdfs - pdf_count) > 25:
-                                    part_count += 1
-                                    # Merging current PDFs to avoid crash when too many PDFs are merged at once
-                                    self.L.Wrap('')
-                                    self.L.Wrap('Merging PDFs to temp file to avoid crash at the end from merging too many files at once...')
-                                    self.L.Wrap('')
-                                    # Determine available temp file name
-                                    final_path_variable_part = '{} - Part {}.pdf'.format(final_path_variable[:-4],
-                                                                                         part_count)
-                                    # Merge current PDFs
-                                    merger = PyPDF2.PdfFileMerger()
-                                    for doc in pdf_list:
-                                        merger.append(PyPDF2.PdfFileReader(doc), "rb")
-                                    merger.write(final_path_variable_part)
-                                    # Clear pdf_list
-                                    pdf_list = []
-                                    # Add Merged PDF to the newly cleared PDF list
-                                    pdf_list.append(final_path_variable_part)
-                                    del merger
-                                    # Remember to delete these partial files later
-                                    parts_2_delete.append(final_path_variable_part)
-                            # Create all_items list for CSV writing
-                            all_items = current_input_list + [palmer_value, palmer_class, wet_dry_season, condition, ante_score]
-                            if watershed_scale == 'Single Point':
-                                # Write results to CSV
-                                csv_writer.Wrap('{},{},{}-{}-{},{},{},{},{},{}'.format(current_input_list[1], # Latitude
-                                                                                             current_input_list[2], # Longitude
-                                                                                             all_items[3], # Observation Year
-                                                                                             all_items[4], # Observation Month
-                                                                                             all_items[5], # Observation Day
-                                                                                             all_items[10], # PDSI Value
-                                                                                             all_items[11], # PDSI Class
-                                                                                             all_items[12], # Season
-                                                                                             all_items[14], # ARC Score
-                                                                                             all_items[13])) # Antecedent Precip Condition
-                            else:
-                                watershed_results_list.append((ante_score, condition, wet_dry_season, palmer_class))
-                                csv_writer.Wrap('{},{},{}-{}-{},{},{},{},{},{}'.format(current_input_list[1], # Latitude
-                                                                                       current_input_list[2], # Longitude
-                                                                                       all_items[3], # Observation Year
-                                                                                       all_items[4], # Observation Month
-                                                                                       all_items[5], # Observation Day
-                                                                                       all_items[10], # PDSI Value
-                                                                                       all_items[11], # PDSI Class
-                                                                                       all_items[12], # Season
-                                                                                       all_items[14], # ARC Score
-                                                                                       all_items[13])) # Antecedent Precip Condition
-                        else:
-                            # Open PDF in new process
-                            self.L.Wrap('Opening PDF in a new process...')
-                            subprocess.Popen(result_pdf, shell=True)
-                            # Open Output Folder
-                            subprocess.Popen('explorer "{}"'.format(output_folder))
-                if watershed_scale != 'Single Point':
-                    if watershed_scale == 'Custom Polygon':
-                        huc = custom_watershed_name
-                    generated = watershed_summary.create_summary(site_lat=latitude,
-                                                                 site_long=longitude,
-                                                                 observation_date=observation_date,
-                                                                 geographic_scope=watershed_scale,
-                                                                 huc=huc,
-                                                                 huc_size=huc_square_miles,
-                                                                 results_list=watershed_results_list,
-                                                                 watershed_summary_path=watershed_summary_path)
-                    if generated:
-                        pdf_list = [watershed_summary_path] + pdf_list
-                        parts_2_delete.append(watershed_summary_path)
-                if pdf_list: # Testing list for content
-                    merger = PyPDF2.PdfFileMerger()
-                    for doc in pdf_list:
-                        merger.append(PyPDF2.PdfFileReader(doc), "rb")
-                    merger.write(final_path_variable)
-                    # Open Excel Results
-                    self.L.Wrap('Opening Batch Results CSV in new process...')
-                    subprocess.Popen(csv_path, shell=True)
-                    # Open finalPDF
-                    self.L.Wrap('Opening finalPDF in new process...')
-                    subprocess.Popen(final_path_variable, shell=True)
-                    # Open folder containing outputs
-                    subprocess.Popen('explorer "{}"'.format(output_folder))
-                    del merger
-                    if fixed_y_max is True:
-                        # Re-run batch with fixed yMax value
-                        ante_instance.set_yMax(highest_y_max)
-                        # Set PDF Counter and Part Counter to 0
-                        pdf_count = 0
-                        part_count = 0
-                        # Clear pdf_list
-                        pdf_list = []
-                        for current_input_list in current_input_list_list:
-                            self.L.Wrap('')
-                            self.L.Wrap('Re-running with fixed yMax value: '+str(current_input_list))
-                            self.L.Wrap('')
-                            result_pdf, run_y_max, condition, ante_score, wet_dry_season, palmer_value, palmer_class = ante_instance.setInputs(current_input_list, watershed_analysis=False, all_sampling_coordinates=None)
-                            pdf_list.append(result_pdf)
-                            # CHECK TO SEE IF INCREMENTAL MERGING IS NECESSARY
-                            pdf_count += 1
-                            if len(pdf_list) > 365:
-                                if (total_pdfs - pdf_count) > 25:
-                                    part_count += 1
-                                    # Merging current PDFs to avoid crash when too many PDFs are merged at once
-                                    self.L.Wrap('')
-                                    self.L.Wrap('Merging PDFs to temp file to avoid crash at the end from merging too many files at once...')
-                                    self.L.Wrap('')
-                                    # Determine available temp file name
-                                    final_path_fixed_part = '{} - Part {}.pdf'.format(final_path_fixed[:-4],
-                                                                                      part_count)
-                                    # Merge current PDFs
-                                    merger = PyPDF2.PdfFileMerger()
-                                    for doc in pdf_list:
-                                        merger.append(PyPDF2.PdfFileReader(doc), "rb")
-                                    merger.write(final_path_fixed_part)
-                                    # Clear pdf_list
-                                    pdf_list = []
-                                    # Add temp file to pdf_list
-                                    pdf_list.append(final_path_fixed_part)
-                                    del merger
-                                    # Remember to delete these partial files later
-                                    parts_2_delete.append(final_path_fixed_part)
-                        ante_instance.set_yMax(None)
-                        if pdf_list:
-                            merger = PyPDF2.PdfFileMerger()
-                            for doc in pdf_list:
-                                merger.append(PyPDF2.PdfFileReader(doc), "rb")
-                            merger.write(final_path_fixed)
-                            # Open finalPDF
-                            self.L.Wrap('Opening finalPDF in new process...')
-                            subprocess.Popen(final_path_fixed, shell=True)
-                            del merger
-                    # Attempt to delete partial files
-                    self.L.Wrap('Attempting to delete temporary files...')
-                    if parts_2_delete:
-                        for part in parts_2_delete:
-                            try:
-                                os.remove(part)
-                            except Exception:
-                                pass
-                if radio == 'Rain':
-                    self.input_list_list_prcp = []
-                elif radio == 'Snow':
-                    self.input_list_list_snow = []
-                elif radio == 'Snow Depth':
-                    self.input_list_list_snwd = []
+                self.input_list_list_prcp = []
+            elif radio == 'Snow':
+                self.input_list_list_snow = []
+            elif radio == 'Snow Depth':
+                self.input_list_list_snwd = []
             self.L.Wrap('')
             self.L.Time(StartTime=start_time,
                         Task="All tasks")
@@ -1791,5 +1259,7 @@ class DateEntry(tkinter.Frame):
 
 
 if __name__ == '__main__':
+    # Date worker processes start from this module when frozen
+    multiprocessing.freeze_support()
     APP = Main()
     APP.run()
@@ -34,7 +34,7 @@
 ##  ------------------------------- ##
 ##      Writen by: Jason Deters     ##
 ##  ------------------------------- ##
-##    Last Edited on: 2020-05-27    ##
+##    Last Edited on: 2026-10-18    ##
 ##  ------------------------------- ##
 ######################################
 
@@ -43,7 +43,7 @@ import os
 import sys
 import time
 import datetime
-import multiprocessing
+import concurrent.futures
 import traceback
 import warnings
 import pickle
@@ -64,7 +64,6 @@ import json
 import numpy
 import pandas
 import ulmo
-from geopy.distance import great_circle
 import matplotlib.pyplot as plt
 from matplotlib.legend_handler import HandlerLine2D
 import matplotlib.dates as dates
@@ -84,6 +83,11 @@ try:
     from . import station_manager
     from . import get_forecast
     from . import get_all
+    from . import normals
+    from . import station_index
+    from . import geodesy
+    from . import station_merge
+    from . import station_cache
     from .utilities import JLog
     from .utilities import web_wimp_scraper
 except Exception:
@@ -94,6 +98,11 @@ except Exception:
     import station_manager
     import get_forecast
     import get_all
+    import normals
+    import station_index
+    import geodesy
+    import station_merge
+    import station_cache
     # Add utilities folder to path directly
     PYTHON_SCRIPTS_FOLDER = os.path.join(ROOT, 'Python Scripts')
     TEST = os.path.exists(PYTHON_SCRIPTS_FOLDER)
@@ -265,99 +274,88 @@ def time2String(total_seconds):
 
 def value_list_to_water_year_table(dates, values):
     log = JLog.PrintLog()
-    n = 0
-    newrow = None
-    list_of_arrays = []
-    leap_day_rolling_totals = []
     log.Wrap('Collecting all rolling totals for each day of the year...')
-    for row in dates:
-        if '-10-01' in str(row):
-            if newrow is not None:
-                # convert list to array
-                A = numpy.array(newrow)
-                # Add array to list of arrays
-                list_of_arrays.append(A)
-                # create / empty newrow list
-                newrow = []
-            else:
-                # Create newrow list
-                newrow = []
-        if '-02-29' in str(row):
-            leap_day_rolling_totals.append(values[n])
-        else:
-            newrow.append(values[n])
-        n += 1
-    allDays = numpy.array(list_of_arrays)
-#    numpy.set_printoptions(precision=2)
-#    numpy.set_printoptions(suppress=True)
-#    self.log.Wrap(allDays)
-#    self.log.Wrap(allDays.shape)
-#    # Save Numpy Array as CSV
-#    allDays.tofile("C:/Temp/allDays.csv", ',','%f')
+    allDays = normals.water_year_table(dates=dates, values=values)
     return allDays
 
+def query_ancillary_data(wimp_scraper, lat, lon, year, month, output_folder, watershed_analysis,
+                         pdsidv_file, sampling_coordinates=None, epqs_variant=None, season=None):
+    """Queries the PDSI, WebWIMP Wet/Dry Season and (optionally) sampling point elevations for one point
 
-def calc_normal_values(dates, values):
-    n = 0
-    normal_low_values = []
-    normal_high_values = []
-    # Normal Year
-    if len(dates) == (365):
-        while n < (365):
-            day = []
-            for row in values:
-                day.append(row[n])
-            # Calculate Numpy Percentiles for High and Low normal
-            normal_low_values.append(numpy.percentile(day, 30))
-            normal_high_values.append(numpy.percentile(day, 70))
-            n += 1
-    # Leap Year
-    if len(dates) == (366):
-        while n < (365):
-            if n == 151: # Leap day, Feb 29 in a Leap Year
-                # Leap Year Processing - Estimate Feb 29th by Averaging percentiles of 2/28 and 3/1
-                feb_28_rolling_totals = []
-                mar_1_rolling_totals = []
-                for row in values:
-                    # Get day before and day after
-                    feb_28_rolling_totals.append(row[150])
-                    mar_1_rolling_totals.append(row[151])
-                # Get before and after low and high values from values
-                feb_28_normal_low = numpy.percentile(feb_28_rolling_totals, 30)
-                feb_28_normal_high = numpy.percentile(feb_28_rolling_totals, 70)
-                mar_1_normal_low = numpy.percentile(mar_1_rolling_totals, 30)
-                mar_1_normal_high = numpy.percentile(mar_1_rolling_totals, 70)
-                # Split the difference between the two dates
-                Low = (feb_28_normal_low + mar_1_normal_low)/2
-                High = (feb_28_normal_high + mar_1_normal_high)/2
-                # Append the averaged data
-                normal_low_values.append(Low)
-                normal_high_values.append(High)
-            # Even if the above executed (Leap Day), we'd still add n=151 as leap day was missing
-            day = []
-            for row in values:
-                day.append(row[n])
-            # Calculate Numpy Percentiles for High and Low normal
-            normal_low_values.append(numpy.percentile(day, 30))
-            normal_high_values.append(numpy.percentile(day, 70))
-            n += 1
-    # Convert lists to pandas series
-    normal_low_series = pandas.Series(normal_low_values, dates)
-    normal_high_series = pandas.Series(normal_high_values, dates)
-    return normal_low_series, normal_high_series
+    When sampling_coordinates are given (the first point of a watershed),
+    WebWIMP is scraped at all of them in one batch first and their seasons
+    are read from the WebWIMP grid in one call.  A season already known
+    for this point is used instead of querying WebWIMP again.
+
+    Returns a dict with keys 'pdsi' ((value, class, color, pdsidv_file) or
+    None on failure), 'season' ('Wet Season', 'Dry Season', 'ERROR' or
+    'Error'), 'sampling_elevations' and 'sampling_seasons' ({"lat,lon,month":
+    season}); the last two are None unless sampling_coordinates were given
+    and queried successfully.
+    """
+    log = JLog.PrintLog()
+    ancillary = {'pdsi': None, 'season': 'Error', 'sampling_elevations': None, 'sampling_seasons': None}
+    # Query PDSI
+    try:
+        ancillary['pdsi'] = tuple(query_climdiv.get_pdsidv(lat=lat,
+                                                           lon=lon,
+                                                           year=year,
+                                                           month=month,
+                                                           pdsidv_file=pdsidv_file))
+    except Exception:
+        log.Wrap(traceback.format_exc())
+    # Scrape WebWIMP at every sampling point at once
+    if sampling_coordinates is not None:
+        try:
+            wimp_scraper.batch(sampling_coordinates)
+            season_names = wimp_scraper.season_names(sampling_coordinates, int(month))
+            ancillary['sampling_seasons'] = dict(('{},{},{}'.format(point[0], point[1], int(month)), '{} Season'.format(name))
+                                                 for point, name in zip(sampling_coordinates, season_names)
+                                                 if name is not None)
+        except Exception:
+            log.Wrap(traceback.format_exc())
+    # Querying WebWIMP to collect Wet / Dry season info...
+    if season is not None:
+        log.Wrap('WebWIMP H2O Balance at {},{}: {} (from the watershed batch)'.format(lat, lon, season))
+        ancillary['season'] = season
+    else:
+        try:
+            ancillary['season'] = wimp_scraper.get_season(lat=lat,
+                                                          lon=lon,
+                                                          month=int(month),
+                                                          output_folder=output_folder,
+                                                          watershed_analysis=watershed_analysis)
+        except Exception:
+            log.Wrap(traceback.format_exc())
+    # Query all Elevations
+    if sampling_coordinates is not None:
+        try:
+            ancillary['sampling_elevations'] = getElev.batch(sampling_coordinates, epqs_variant=epqs_variant)
+        except Exception:
+            log.Wrap(traceback.format_exc())
+    return ancillary
 
 # CLASS DEFINITIONS
 
 class Main(object):
-    def __init__(self, yMax=None):
+    def __init__(self, yMax=None, download_workers=process_manager.DEFAULT_DOWNLOAD_WORKERS, epqs_variant=None):
         self.yMax = yMax
         self.searchDistance = 30 # Miles
         self.allStations = []
         self.recentStations = []
         self.ghcn_station_list = None
+        self.station_index = None
+        self.download_workers = download_workers
+        self.download_pool = None
+        self.station_cache = None
         self.oldLatLong = None
         self.PDFs = []
+        # Day-of-year normals reused by later dates sharing a Normal Period
+        self.normals_cache = normals.NormalsCache()
         self.pdsidv_file = None
+        # PDSI, WebWIMP and elevation queries for the current point (run alongside the station downloads)
+        self.ancillary_pool = None
+        self.ancillary_future = None
         # Create PrintLog object
         self.log = JLog.PrintLog()
         self.log.Wrap('Initializing anteProcess Class...')
@@ -368,8 +366,25 @@ class Main(object):
         # Watershed Analysis variables
         self.old_all_sampling_coordinates = None
         self.all_sampling_coordinate_elevations = None
-        # Test USGS EPQS Servers
-        self.epqs_variant = test_usgs_epqs_servers() 
+        self.all_sampling_coordinate_seasons = None
+        # Test USGS EPQS Servers (unless the variant to use is already known)
+        if epqs_variant is None:
+            epqs_variant = test_usgs_epqs_servers()
+        self.epqs_variant = epqs_variant
+
+    def get_point_state(self):
+        """Returns the station data loaded for the current point (see restore_point_state)"""
+        return {'ghcn_station_list': self.ghcn_station_list,
+                'recentStations': self.recentStations,
+                'oldLatLong': self.oldLatLong,
+                'obs_elevation': self.obs_elevation,
+                'pdsidv_file': self.pdsidv_file,
+                'yMax': self.yMax}
+
+    def restore_point_state(self, state):
+        """Adopts another instance's point state, so setInputs for more dates at that point reuses its stations"""
+        for name, value in state.items():
+            setattr(self, name, value)
 
     def set_yMax(self, yMax):
         self.log.Wrap('Setting yMax to ' + str(yMax))
@@ -390,42 +405,10 @@ class Main(object):
         self.watershed_analysis = watershed_analysis
         self.all_sampling_coordinates = all_sampling_coordinates
 
-        if not self.allStations:
-            # Check for previously Cached Station Data from same day
-            pickle_folder = os.path.join(ROOT, 'cached')
-            # Ensure pickle_folder exists
-            try:
-                os.makedirs(pickle_folder)
-            except Exception:
-                pass
-            pickle_path = os.path.join(pickle_folder, 'station_classes.pickle')
-            if self.data_type == 'PRCP':
-                self.log.Wrap('Checking for previously cached NCDC GHCN Weather Station Records...')
-                stations_pickle_exists = os.path.exists(pickle_path)
-                if stations_pickle_exists:
-                    self.log.Wrap('  Cached station data found. Testing...')
-                    expiration_hours = 12
-                    stale = file_older_than(file_path=pickle_path,
-                                            time_unit='hours',
-                                            time_value=expiration_hours)
-                    if stale:
-                        self.log.Wrap('    Cached station data older than {} hours. Deleting...'.format(expiration_hours))
-                        os.remove(pickle_path)
-                    else:
-                        pickle_size = os.path.getsize(pickle_path)
-                        if pickle_size < 15682622:
-                            self.log.Wrap('    Cached station data corrupt. Deleting...')
-                            os.remove(pickle_path)
-                stations_pickle_exists = os.path.exists(pickle_path)
-                if stations_pickle_exists:
-                    self.log.Wrap('Unserializing cached station data..."')
-                    try:
-                        with open(pickle_path, 'rb') as handle:
-                            self.allStations = pickle.load(handle)
-                    except:
-                        self.log.Wrap('Unserialization failed. Deleting...')
-                        self.allStations = []
-                        os.remove(pickle_path)
+        if self.data_type == 'PRCP' and self.station_cache is None:
+            # Open cached Station Data (each record expires 12 hours after it was downloaded)
+            self.log.Wrap('Opening previously cached NCDC GHCN Weather Station Records...')
+            self.station_cache = station_cache.StationCache()
         # Calculate Dates
         self.dates = date_calcs.Main(year, month, day)
 
@@ -466,6 +449,7 @@ class Main(object):
                             self.log.Wrap('New Watershed Analysis - starting new recent stations list.')
                             self.recentStations = []
                             self.all_sampling_coordinate_elevations = None
+                            self.all_sampling_coordinate_seasons = None
                             self.old_all_sampling_coordinates = self.all_sampling_coordinates
 
 
@@ -575,6 +559,9 @@ class Main(object):
         if self.image_source is None:
             self.image_source = "N/A"
         self.site_loc = (self.site_lat, self.site_long)
+        if self.data_type == 'PRCP':
+            # Start the ancillary queries now so they overlap the station downloads
+            self.start_ancillary_queries()
 
 # COMMANDS
         # Get Stations
@@ -584,12 +571,13 @@ class Main(object):
             for station in self.recentStations:
                 if station.data is None:
                     station.run()
-                station.updateValues(self.site_loc,
-                                     self.obs_elevation,
-                                     self.dates.normal_period_data_start_date,
-                                     self.dates.actual_data_end_date,
-                                     self.dates.antecedent_period_start_date)
-                self.stations.append(station)
+            station_manager.update_stations(self.recentStations,
+                                            self.site_loc,
+                                            self.obs_elevation,
+                                            self.dates.normal_period_data_start_date,
+                                            self.dates.actual_data_end_date,
+                                            self.dates.antecedent_period_start_date)
+            self.stations.extend(self.recentStations)
             if self.watershed_analysis:
                 # Sort stations by weighted difference of current sampling point (Recalculated immediately above)
                 sorted_stations = []
@@ -604,279 +592,214 @@ class Main(object):
         return self.createFinalDF()
     # End setInputs function
 
-    def start_multiprocessing(self):
-        """Creates queues and sub-processes"""
-        self.log.print_section('MULTIPROCESSING START')
-        self.log.Wrap('Preparing to use sub-processes to accelerate data acquisition...')
-        # Kill any lingering child processes from previous runs
-        for minion in multiprocessing.active_children():
-            minion.terminate()
-        # Set Path to Python Executable
-        executable = sys.executable
-        multiprocessing.set_executable(executable)
-        # Set number of Sub-processes based on CPU_Count
-#        num_minions = multiprocessing.cpu_count()
-        num_minions = 4 # > 4 resulted in many failed FTP downloads that succeeded in-line later
-        # Establish communication queues
-        self.log.Wrap("Establishing Communication Queues...")
-        tasks_queue = multiprocessing.Queue()
-        results_queue = multiprocessing.Queue()
-        # Create minions
-        self.log.Wrap('Creating %d sub-processes...' % num_minions)
-        minions = [process_manager.Minion(tasks_queue, results_queue) for i in range(num_minions)]
-        # Start minions
-        ### MANDATORY CODE TO DEAL WITH GLITCH ###
-        sys.argv = ['']
-        ### MANDATORY CODE TO DEAL WITH GLITCH ###
-            # Glitch states the following:
-            # File "C;\Python27\ArcGIS10.3\Lib\multiprocessing\forking.py",
-            #  line 399, in get_preparation_data
-            #  sys_argv=sys.argv,
-            # AttributeError: 'module' object has no attribute 'argv'
-        num = 0
-        for minion in minions:
-            num += 1
-            minion.start()
-            self.log.Wrap('Sub-process {} started'.format(num))
-        self.log.print_separator_line()
-        self.log.Wrap('')
-        return tasks_queue, results_queue, minions
-    # End of start_multiprocessing function
-
-    def find_and_enqueue_stations(self, tasks_queue):
-        """Locates and enqueus all stations within the selected search distance"""
+    def start_ancillary_queries(self):
+        """Submits the PDSI, WebWIMP and sampling point elevation queries for this point to a background thread
+
+        createFinalDF joins the result (see join_ancillary_queries).
+        """
+        if self.ancillary_pool is None:
+            # One worker, so successive points never query at the same time
+            self.ancillary_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        sampling_coordinates = None
+        if self.watershed_analysis is True and self.all_sampling_coordinate_elevations is None:
+            sampling_coordinates = self.all_sampling_coordinates
+        season = None
+        if self.watershed_analysis is True and self.all_sampling_coordinate_seasons is not None:
+            dict_key = '{},{},{}'.format(self.site_lat, self.site_long, int(self.dates.observation_month))
+            season = self.all_sampling_coordinate_seasons.get(dict_key)
+        self.ancillary_future = self.ancillary_pool.submit(query_ancillary_data,
+                                                           wimp_scraper=self.wimp_scraper,
+                                                           lat=float(self.site_lat),
+                                                           lon=float(self.site_long),
+                                                           year=self.dates.observation_year,
+                                                           month=self.dates.observation_month,
+                                                           output_folder=self.folderPath,
+                                                           watershed_analysis=self.watershed_analysis,
+                                                           pdsidv_file=self.pdsidv_file,
+                                                           sampling_coordinates=sampling_coordinates,
+                                                           epqs_variant=self.epqs_variant,
+                                                           season=season)
+    # End of start_ancillary_queries function
+
+    def join_ancillary_queries(self):
+        """Waits for this point's ancillary queries and returns their results (starting them first if needed)"""
+        if self.ancillary_future is None:
+            self.start_ancillary_queries()
+        future = self.ancillary_future
+        self.ancillary_future = None
+        ancillary = future.result()
+        if ancillary['pdsi'] is not None:
+            self.pdsidv_file = ancillary['pdsi'][3]
+        if ancillary['sampling_elevations'] is not None:
+            self.all_sampling_coordinate_elevations = ancillary['sampling_elevations']
+        if ancillary['sampling_seasons'] is not None:
+            self.all_sampling_coordinate_seasons = ancillary['sampling_seasons']
+        return ancillary
+    # End of join_ancillary_queries function
+
+    def get_download_pool(self):
+        """Returns the long-lived station download thread pool, creating it on first use"""
+        if self.download_pool is None:
+            self.log.Wrap('Starting station download pool ({} threads)...'.format(self.download_workers))
+            self.download_pool = process_manager.DownloadPool(num_workers=self.download_workers)
+        return self.download_pool
+    # End of get_download_pool function
+
+    def shutdown(self):
+        """Stops the station download pool and the ancillary query thread (both restart if the instance is used again)"""
+        if self.download_pool is not None:
+            self.download_pool.shutdown()
+            self.download_pool = None
+        if self.ancillary_pool is not None:
+            self.ancillary_pool.shutdown(wait=True)
+            self.ancillary_pool = None
+    # End of shutdown function
+
+    def find_and_enqueue_stations(self, download_pool, min_distance=None):
+        """Locates all stations within the selected search distance and submits their downloads
+
+        If min_distance is given, only stations beyond min_distance (those not
+        found by the previous, smaller search) are added.
+        """
         # Reset Station Numbering (Affects print display only)
         station_number_for_print = 0
-        self.recentStations = []
-        # Find min and max ranges (Speed up search, Especially for HUC8 Watershed)
-        min_lat = None
-        max_lat = None
-        min_lon = None
-        max_lon = None
-        if self.watershed_analysis:
-            for sampling_coordinates in self.all_sampling_coordinates:
-                if min_lat == None:
-                    min_lat = sampling_coordinates[0]
-                elif sampling_coordinates[0] < min_lat:
-                    min_lat =sampling_coordinates[0]
-                if max_lat == None:
-                    max_lat = sampling_coordinates[0]
-                elif sampling_coordinates[0] > max_lat:
-                    max_lat = sampling_coordinates[0]
-                if min_lon == None:
-                    min_lon = sampling_coordinates[1]
-                elif sampling_coordinates[1] < min_lon:
-                    min_lon = sampling_coordinates[1]
-                if max_lon == None:
-                    max_lon = sampling_coordinates[1]
-                elif sampling_coordinates[1] > max_lon:
-                    max_lon = sampling_coordinates[1]
-        else:
-            min_lat = float(self.site_lat)
-            max_lat = float(self.site_lat)
-            min_lon = float(self.site_long)
-            max_lon = float(self.site_long)
-        # Add 3 to maximums and subtract 3 from the minimums to eliminate most stations quickly
-        min_lat -= 4
-        max_lat += 4
-        min_lon -= 4
-        max_lon += 4
         #  ALL STATIONS WITHIN searchDistance
         self.log.print_section('ENQUEUEING STATION DATA DOWNLOADS')
-        self.log.Wrap("Searching for weather stations within "+str(self.searchDistance)+" miles...")
+        if min_distance is None:
+            self.recentStations = []
+            self.log.Wrap("Searching for weather stations within "+str(self.searchDistance)+" miles...")
+        else:
+            self.log.Wrap("Searching for weather stations between {} and {} miles...".format(min_distance, self.searchDistance))
+        if self.station_index is None:
+            self.station_index = station_index.get_station_index(self.ghcn_station_list)
+        if self.watershed_analysis:
+            sampling_points = self.all_sampling_coordinates
+        else:
+            sampling_points = None
+        positions, distances = self.station_index.query_radius(site=self.site_loc,
+                                                               radius_miles=self.searchDistance,
+                                                               sampling_points=sampling_points,
+                                                               min_radius_miles=min_distance)
+        # Elevation and weighting for every candidate at once
+        station_elevations = self.ghcn_station_list['elevation'].values[positions] * geodesy.FEET_PER_METER
+        elevation_differences = geodesy.elevation_differences([self.obs_elevation], station_elevations)[0]
+        weighted_differences = geodesy.weighted_difference(distances, elevation_differences)
+        # Stations already downloaded, by name
+        acquired_stations = {}
+        for item in self.allStations:
+            acquired_stations.setdefault(item.name, []).append(item)
+        # Stations already listed for this point (a widening search finds them again)
+        listed_station_ids = set(id(item) for item in self.stations)
+        recent_station_ids = set(id(item) for item in self.recentStations)
+        previously_acquired = []
         constructor_class_list = []
-        for index, row in self.ghcn_station_list.iterrows():
-            # Eliminate Stations quickly using buffered min/max lat/lon
-            ballpark = True
-            if row['latitude'] < min_lat:
-                ballpark = False
-            elif row['latitude'] > max_lat:
-                ballpark = False
-            elif row['longitude'] < min_lon:
-                ballpark = False
-            elif row['longitude'] > max_lon:
-                ballpark = False
-            if self.searchDistance > 30:
-                ballpark = True
-            if ballpark:
-                include_station = False
-                location_tuple = (row['latitude'], row['longitude'])
-                distance = great_circle(self.site_loc, location_tuple).miles
-                if not self.watershed_analysis:
-                    if distance < self.searchDistance:
-                        include_station = True
-                if self.watershed_analysis:
-                    for sampling_coordinates in self.all_sampling_coordinates:
-                        sampling_distance = great_circle(sampling_coordinates, location_tuple).miles
-                        if sampling_distance < self.searchDistance:
-                            include_station = True
-                            break
-                if include_station:
-                    station_index = index
-                    name = str(row['name'])
-                    already = False
-                    location = str(row['latitude']) + ", " + str(row['longitude'])
-                    row_elev_meters = row['elevation']
-                    elevation = row_elev_meters*3.28084
-                    elevDiff = abs(self.obs_elevation - elevation)
-                    weightedDiff = distance*((elevDiff/1000)+0.45)
-                    for item in self.allStations:
-                        if item.name == name:
-                            station_number_for_print += 1
-                            self.log.Wrap('Station {} - {} - Data previously acquired'.format(station_number_for_print,
-                                                                                              name))
-                            already = item
-                            already.updateValues(self.site_loc,
-                                                 self.obs_elevation,
-                                                 self.dates.normal_period_data_start_date,
-                                                 self.dates.actual_data_end_date,
-                                                 self.dates.antecedent_period_start_date)
-                            self.stations.append(already)
-                            self.recentStations.append(already)
-                    if already is False:
-                        station_number_for_print += 1
-                        self.log.Wrap('Station {} - {}'.format(station_number_for_print, name))
-                        constructor_class = station_manager.Constructor(self.data_type,
-                                                                        station_index,
-                                                                        name,
-                                                                        location,
-                                                                        location_tuple,
-                                                                        elevation,
-                                                                        distance,
-                                                                        elevDiff,
-                                                                        weightedDiff,
-                                                                        self.dates.normal_period_data_start_date,
-                                                                        self.dates.actual_data_end_date,
-                                                                        self.dates.antecedent_period_start_date)
-                        constructor_class_list.append(constructor_class)
-        enqueue_count = 0
+        for position, distance, elevation, elevDiff, weightedDiff in zip(positions, distances.tolist(),
+                                                                         station_elevations.tolist(),
+                                                                         elevation_differences.tolist(),
+                                                                         weighted_differences.tolist()):
+            index = self.ghcn_station_list.index[position]
+            row = self.ghcn_station_list.iloc[position]
+            location_tuple = (row['latitude'], row['longitude'])
+            name = str(row['name'])
+            already = False
+            location = str(row['latitude']) + ", " + str(row['longitude'])
+            if name not in acquired_stations and self.station_cache is not None:
+                # Check the on-disk cache for a recent download of this station
+                cached_station = self.station_cache.get(station_cache.station_key(self.data_type, index))
+                if cached_station is not None and cached_station.name == name:
+                    self.allStations.append(cached_station)
+                    acquired_stations[name] = [cached_station]
+            acquired = acquired_stations.get(name, [])
+            if acquired:
+                # One download per station (preferring one already listed for this point)
+                already = acquired[-1]
+                for item in acquired:
+                    if id(item) in listed_station_ids:
+                        already = item
+                if id(already) not in listed_station_ids:
+                    station_number_for_print += 1
+                    self.log.Wrap('Station {} - {} - Data previously acquired'.format(station_number_for_print,
+                                                                                      name))
+                    listed_station_ids.add(id(already))
+                    previously_acquired.append(already)
+                    self.stations.append(already)
+                    if id(already) not in recent_station_ids:
+                        recent_station_ids.add(id(already))
+                        self.recentStations.append(already)
+            if already is False:
+                station_number_for_print += 1
+                self.log.Wrap('Station {} - {}'.format(station_number_for_print, name))
+                constructor_class = station_manager.Constructor(self.data_type,
+                                                                index,
+                                                                name,
+                                                                location,
+                                                                location_tuple,
+                                                                elevation,
+                                                                distance,
+                                                                elevDiff,
+                                                                weightedDiff,
+                                                                self.dates.normal_period_data_start_date,
+                                                                self.dates.actual_data_end_date,
+                                                                self.dates.antecedent_period_start_date)
+                constructor_class_list.append(constructor_class)
+        # Recalculate relationships of previously acquired stations to this point
+        station_manager.update_stations(previously_acquired,
+                                        self.site_loc,
+                                        self.obs_elevation,
+                                        self.dates.normal_period_data_start_date,
+                                        self.dates.actual_data_end_date,
+                                        self.dates.antecedent_period_start_date)
+        futures = []
         for constructor_class in constructor_class_list:
-            tasks_queue.put(constructor_class)
-            enqueue_count += 1
+            futures.append(download_pool.submit(constructor_class))
         self.log.print_separator_line()
         self.log.Write('')
-        return enqueue_count
+        return futures
     # End of find_and_enqueue_stations function
 
-    def finish_multiprocessing(self, tasks_queue, results_queue, minions, enqueue_count):
-        """Maintains processing pool until all jobs are complete"""
-        self.log.print_section('MULTIPROCESSING FINISH')
-        count_copy = enqueue_count
-        timer_list = []
-        timer_list.append([time.clock(), count_copy])
-        self.log.Wrap('Waiting for sub-processes to download stations:')
-        while count_copy > 0:
-            # Keep # Minions at original num_minions
-            for minion in minions:
-                if not minion.is_alive():
-                    self.log.Wrap('Sub-process died, creating a replacement...')
-                    count_copy -= 1
-                    minions.remove(minion)
-                    new_minion = process_manager.Minion(tasks_queue, results_queue)
-                    new_minion.start()
-                    minions.append(new_minion)
-            # Pull results_queue to keep queue buffer from overflowing
-            try:
-                result = results_queue.get(block=True, timeout=5)
-                if result == "Maxed":
-                    count_copy += 1
-                else:
-                    # Get another chance to download missing data while waiting
-                    if result.data is None: 
-                        result.run()
-                    self.stations.append(result)
-                    self.recentStations.append(result)
-                    self.allStations.append(result)
-                count_copy -= 1
-                # Discern avg. pace and approximate time remaining
-                if count_copy < enqueue_count:
-                    try:
-                        timer_list.append([time.clock(), count_copy])
-                        if len(timer_list) > 20:
-                            timer_list.remove(timer_list[0])
-                        time_taken = time.clock() - timer_list[0][0]
-                        tasks_complete = timer_list[0][1] - count_copy
-                        seconds_per_task = time_taken/tasks_complete
-                        seconds_remaining = count_copy * seconds_per_task
-                        remaining_string = time2String(seconds_remaining)
-                        if count_copy < 2:
-                            msg = '{} station remaining.  Approximately {} remaining.'.format(count_copy, remaining_string)
-                        else:
-                            msg = '{} stations left.  Approximately {} remaining.'.format(count_copy, remaining_string)
-                        self.log.print_status_message(msg)
-                    except Exception:
-                        pass
-            except Exception:
-                result = None
-                # Discern avg. pace and approximate time remaining
-                if count_copy < enqueue_count:
-                    try:
-                        time_taken = time.clock() - timer_list[0][0]
-                        tasks_complete = timer_list[0][1] - count_copy
-                        seconds_per_task = time_taken/tasks_complete
-                        seconds_remaining = count_copy * seconds_per_task
-                        remaining_string = time2String(seconds_remaining)
-                        if count_copy < 2:
-                            msg = '{} station remaining.  Approximately {} remaining.'.format(count_copy, remaining_string)
-                        else:
-                            msg = '{} stations left.  Approximately {} remaining.'.format(count_copy, remaining_string)
-                        self.log.print_status_message(msg)
-                    except Exception:
-                        pass
-                time.sleep(1)
-        # Add poison pill to queue so we can track when all processes are actually complete
-            # This method is less glitchy than using a joinable queue
-        self.log.Wrap('All jobs complete.  Killing sub-processes...')
-        for minion in minions:
-            if minion.is_alive():
-                tasks_queue.put(None)
-        # Waiting for poison pills to dissapear from queue, meaning the actual tasks_queue are complete
-        self.log.Write('Waiting for sub-processes to close...')
-        while True:
-            size = tasks_queue.qsize()
-            if size < 1:
-                break
+    def finish_downloads(self, futures):
+        """Waits for all submitted station downloads, collects the results and returns the new stations"""
+        self.log.print_section('STATION DOWNLOADS FINISH')
+        enqueue_count = len(futures)
+        start_time = time.time()
+        count_complete = 0
+        self.log.Wrap('Waiting for station downloads:')
+        for future in concurrent.futures.as_completed(futures):
+            count_complete += 1
+            count_remaining = enqueue_count - count_complete
+            # Discern avg. pace and approximate time remaining
+            seconds_per_task = (time.time() - start_time) / count_complete
+            remaining_string = time2String(count_remaining * seconds_per_task)
+            if count_remaining < 2:
+                msg = '{} station remaining.  Approximately {} remaining.'.format(count_remaining, remaining_string)
             else:
-                msg = '{0} sub-processes remaining'.format(size)
-                self.log.print_status_message(msg)
-            time.sleep(1)
-        self.log.Write('All sub-processes dead and accounted for.')
+                msg = '{} stations left.  Approximately {} remaining.'.format(count_remaining, remaining_string)
+            self.log.print_status_message(msg)
+        # Collect in submission order so results do not depend on download timing
+        new_stations = []
+        for future in futures:
+            result = future.result()
+            if result is None:
+                continue
+            # Get another chance to download missing data
+            if result.data is None:
+                result.run()
+            self.stations.append(result)
+            self.recentStations.append(result)
+            self.allStations.append(result)
+            new_stations.append(result)
+        self.log.Write('All station downloads complete.')
         self.log.print_separator_line()
         self.log.Write('')
-    # End of finish_multiprocessing function
-
-    def getStations(self):
-        # Start Multiprocessing
-        tasks_queue, results_queue, minions = self.start_multiprocessing()
-        # Find an enqueue stations within the selected search distance
-        enqueue_count = self.find_and_enqueue_stations(tasks_queue)
-        # WebWimp Use this downtime to pre-load the WebWIMP Querry
-                # Get WebWIMP Wet/Dry Season Determination
-        if self.data_type == 'PRCP':
-            # MAKING EARLY REQUESTS BELOW TO USE THIS DOWNTIME
-            try:
-                # Querry PDSI
-                palmer_value, palmer_class, palmer_color, self.pdsidv_file = query_climdiv.get_pdsidv(lat=float(self.site_lat),
-                                                                                                      lon=float(self.site_long),
-                                                                                                      year=self.dates.observation_year,
-                                                                                                      month=self.dates.observation_month,
-                                                                                                      pdsidv_file=self.pdsidv_file)
-                # Querying WebWIMP to collect Wet / Dry season info...'
-                self.wimp_scraper.get_season(lat=float(self.site_lat),
-                                             lon=float(self.site_long),
-                                             month=int(self.dates.observation_month),
-                                             output_folder=None,
-#                                             output_folder=self.folderPath,
-                                             watershed_analysis=self.watershed_analysis)
-                del palmer_value, palmer_class, palmer_color
-                # Query all Elevations
-                if self.watershed_analysis is True:
-                    if self.all_sampling_coordinate_elevations is None:
-                        self.all_sampling_coordinate_elevations = getElev.batch(self.all_sampling_coordinates, epqs_variant=self.epqs_variant)
-            except Exception:
-                self.log.Wrap(traceback.format_exc())
-        # Maintain processing pool until all jobs are complete and collect results
-        self.finish_multiprocessing(tasks_queue, results_queue, minions, enqueue_count)
+        return new_stations
+    # End of finish_downloads function
+
+    def getStations(self, min_distance=None):
+        """Downloads stations within the search distance (beyond min_distance, if given) and adds them to self.stations"""
+        # Find and submit downloads for stations within the selected search distance
+        futures = self.find_and_enqueue_stations(self.get_download_pool(), min_distance=min_distance)
+        # Wait for all downloads to complete and collect results
+        changed_stations = self.finish_downloads(futures)
         # Sort stations by weighted difference
         sorted_stations = []
         for station in self.stations:
@@ -894,23 +817,14 @@ class Main(object):
                     self.log.Wrap('      Download failed again. Ignoring station.')
                 else:
                     self.log.Wrap('      Download successful!')
+                    if station not in changed_stations:
+                        changed_stations.append(station)
             self.stations.append(station)
-        # Pickle All Stations for re-use the same day
-        if self.data_type == 'PRCP':
-            self.log.Wrap('Attempting to pickle Station Records for future use within 12 hours...')
-            pickle_folder = os.path.join(ROOT, 'cached')
-            pickle_path = os.path.join(pickle_folder, 'station_classes.pickle')
-            if os.path.exists(pickle_path) is True:
-                try:
-                    os.remove(pickle_path)
-                except Exception:
-                    pass
-            # Store Data (serialize)
-            try:
-                with open(pickle_path, 'wb') as handle:
-                    pickle.dump(self.allStations, handle, protocol=pickle.HIGHEST_PROTOCOL)
-            except Exception:
-                pass
+        # Cache new and re-downloaded Stations for re-use the same day
+        if self.station_cache is not None:
+            self.log.Wrap('Caching Station Records for future use within 12 hours...')
+            self.station_cache.put_many([(station_cache.station_key(self.data_type, station.index), station)
+                                         for station in changed_stations if station.data is not None])
 
     def getBest(self, need_primary):
         lowestDiff = 10000
@@ -987,17 +901,17 @@ class Main(object):
         station_table_values = [["Weather Station Name", "Coordinates", "Elevation (ft)", "Distance (mi)",
                                  r"Elevation $\Delta$", r"Weighted $\Delta$", "Days (Normal)", "Days (Antecedent)"]]
 
-        # CREATE EMPTY DATAFRAME (self.finalDF)
+        # CREATE EMPTY MERGED SERIES (becomes self.finalDF)
         self.log.Wrap("")
         self.log.Wrap('Creating an empty dataframe from {} to {} to populate with weather station data...'.format(self.dates.normal_period_data_start_date, self.dates.actual_data_end_date))
-        index = pandas.date_range(start=self.dates.normal_period_data_start_date,
-                                  end=self.dates.actual_data_end_date,
-                                  freq='D')
-        self.finalDF = pandas.Series(index=index,
-                                     dtype="object",
-                                     name='value')
-
-        # FILL self.finalDF
+        merge = station_merge.MergeEngine(start_date=self.dates.normal_period_data_start_date,
+                                          end_date=self.dates.actual_data_end_date,
+                                          windows={'normal': (self.dates.normal_period_data_start_date,
+                                                              self.dates.normal_period_end_date),
+                                                   'antecedent': (self.dates.antecedent_period_start_date,
+                                                                  self.dates.observation_date)})
+
+        # FILL merged series
         # Fill in NaN using top station
         n = 0
         num_stations_used = 0
@@ -1007,10 +921,10 @@ class Main(object):
         else: # In AK, where stations are very rare
             maxSearchDistance = 300
         maxNumberOfStations = 15    # Maximum number of stations to use to complete record
-        while self.finalDF.isnull().sum().sum() > 0 and num_stations_used < maxNumberOfStations and self.searchDistance <= maxSearchDistance:
+        while merge.total_missing > 0 and num_stations_used < maxNumberOfStations and self.searchDistance <= maxSearchDistance:
             n += 1
             if n == 1:
-                self.log.Wrap(str(self.finalDF.isnull().sum().sum()) + ' null values.')
+                self.log.Wrap(str(merge.total_missing) + ' null values.')
             if self.searchDistance > 60:
                 need_primary = False
             best_station = self.getBest(need_primary=need_primary)
@@ -1018,22 +932,17 @@ class Main(object):
                 # Note that the primary station has been found
                 if need_primary is True:
                     need_primary = False
-                # Get baseline null value count
-                missing_before_normal = self.finalDF[self.dates.normal_period_data_start_date:self.dates.normal_period_end_date].isnull().sum().sum()
-                missing_before_antecedent = self.finalDF[self.dates.antecedent_period_start_date:self.dates.observation_date].isnull().sum().sum()
                 values = best_station.Values
                 self.log.Wrap('Attempting to replace null values with values from {}...'.format(best_station.name))
                 # Fill
                 try:
-                    self.finalDF.fillna(values, inplace=True)
+                    filled = merge.fill(values)
                 except ValueError:
                     self.log.Wrap('ERROR: No values found for {}. Station will be skipped.'.format(best_station.name))
-                missingAfter = self.finalDF.isnull().sum().sum()
-                self.log.Wrap(str(missingAfter) + ' null values remaining.')
-                missing_after_normal = self.finalDF[self.dates.normal_period_data_start_date:self.dates.normal_period_end_date].isnull().sum().sum()
-                missing_after_antecedent = self.finalDF[self.dates.antecedent_period_start_date:self.dates.observation_date].isnull().sum().sum()
-                num_rows_normal = missing_before_normal-missing_after_normal
-                num_rows_antecedent = missing_before_antecedent-missing_after_antecedent
+                    filled = {'normal': 0, 'antecedent': 0}
+                self.log.Wrap(str(merge.total_missing) + ' null values remaining.')
+                num_rows_normal = filled['normal']
+                num_rows_antecedent = filled['antecedent']
                 num_rows = num_rows_normal + num_rows_antecedent
                 if num_rows > 0:
                     num_stations_used += 1
@@ -1062,45 +971,26 @@ class Main(object):
             else:
                 self.log.Wrap("")
                 self.log.Wrap("No suitable station available to replace null values.")
+                previous_search_distance = self.searchDistance
                 if float(self.site_lat) < 50:
                     self.searchDistance += 10 # Search distance increase interval
                 else:
                     self.searchDistance += 30 # In alaska it will probably go even higher.
-                if self.finalDF.isnull().sum().sum() > 5:
+                if merge.total_missing > 5:
                     if self.searchDistance <= maxSearchDistance:
-                        # Clearing previous table data
-                        station_table_values = []
-                        # Clearing previous dataFrame in case a better fit is found.
-                        self.log.Wrap('Creating an empty dataset to populate with weather data...')
-                        self.log.Wrap("")
-                        index = pandas.date_range(start=self.dates.normal_period_data_start_date,
-                                                  end=self.dates.actual_data_end_date,
-                                                  freq='D')
-                        self.finalDF = pandas.Series(index=index,
-                                                     dtype="object",
-                                                     name='value')
+                        # Add only the stations between the previous and new search distance;
+                        #  stations already merged stay merged and the merge picks up where it left off
                         self.log.Wrap("Widening search...")
-                        num_stations_used = 0
-                        self.getStations()
+                        self.getStations(min_distance=previous_search_distance)
         self.searchDistance = 30 # Resetting this so future runs of the tool do not skip the above step.
         # Fill NaN using linear interpolation
-        if self.finalDF.isnull().sum().sum() > 0:
-            #df.update(secondDF)
+        if merge.total_missing > 0:
             self.log.Wrap("")
             self.log.Wrap('Attempting linear interpolation to fill null values...')
-            missing_before_normal = self.finalDF[self.dates.normal_period_data_start_date:self.dates.normal_period_end_date].isnull().sum().sum()
-            missing_before_antecedent = self.finalDF[self.dates.antecedent_period_start_date:self.dates.observation_date].isnull().sum().sum()
-            interp = self.finalDF.astype(float)
-            try:
-                interp.interpolate(method="time", inplace=True)
-            except Exception:
-                interp.interpolate(inplace=True)
-            self.finalDF.fillna(interp, inplace=True)
-            self.log.Wrap(str(self.finalDF.isnull().sum().sum()) + " null values remaining.")
-            missing_after_normal = self.finalDF[self.dates.normal_period_data_start_date:self.dates.normal_period_end_date].isnull().sum().sum()
-            missing_after_antecedent = self.finalDF[self.dates.antecedent_period_start_date:self.dates.observation_date].isnull().sum().sum()
-            num_rows_normal = missing_before_normal - missing_after_normal
-            num_rows_antecedent = missing_before_antecedent - missing_after_antecedent
+            filled = merge.interpolate()
+            self.log.Wrap(str(merge.total_missing) + " null values remaining.")
+            num_rows_normal = filled['normal']
+            num_rows_antecedent = filled['antecedent']
             num_rows = num_rows_normal + num_rows_antecedent
             if num_rows > 0:
                 num_stations_used += 1
@@ -1115,6 +1005,7 @@ class Main(object):
                 vals.append(num_rows_normal)
                 vals.append(num_rows_antecedent)
                 station_table_values.append(vals)
+        self.finalDF = merge.to_series()
 
         if self.finalDF.isnull().sum().sum() < 1:
             self.log.Wrap('No null values within self.finalDF')
@@ -1172,45 +1063,63 @@ class Main(object):
                     pass
         self.log.print_separator_line()
 
-        # Calculate rolling 30 day sum for the DataFrame
+        # Check for Normals already calculated for this site, Normal Period and set of stations
+        contributing_stations = [row[0] for row in station_table_values if row[0] != "Weather Station Name"]
+        normals_key = normals.NormalsCache.make_key(site=self.site_loc,
+                                                    data_type=self.data_type,
+                                                    normal_period_start_date=self.dates.normal_period_start_date,
+                                                    normal_period_end_date=self.dates.normal_period_end_date,
+                                                    station_names=contributing_stations)
+        day_percentiles = self.normals_cache.get(normals_key)
+
+        # Calculate rolling 30 day sum for the DataFrame (only around the graph when the Normals are cached)
         self.log.Wrap('calculating 30-day rolling totals...')
+        if day_percentiles is None:
+            rolling_source = self.finalDF
+        else:
+            # The 29 days before the graph are all the first graphed total needs
+            rolling_start_date = pandas.Timestamp(self.dates.graph_start_date) - pandas.Timedelta(days=29)
+            rolling_source = self.finalDF[rolling_start_date:self.dates.graph_end_date]
         try:
-            longRolling30day = self.finalDF.rolling(window=30, center=False).sum()
+            longRolling30day = rolling_source.rolling(window=30, center=False).sum()
         except Exception:
-            longRolling30day = pandas.rolling_sum(arg=self.finalDF, window=30, center=False)
+            longRolling30day = pandas.rolling_sum(arg=rolling_source, window=30, center=False)
         if self.data_type == 'SNWD':
-            longRolling30day = self.finalDF
-        # Create version for calculating daily statistics
-        statsRolling30day = longRolling30day[self.dates.normal_period_start_date:self.dates.normal_period_end_date]
+            longRolling30day = rolling_source
         # Create version for graphing current water year
         rolling30day = longRolling30day[self.dates.graph_start_date:self.dates.graph_end_date]
         # get the max value
         rolling_30_day_max = rolling30day.max()
 
-        #---Convert Normal Period 30-Day Rolling Totals to a 365x30 array---#
-        # Create a list of dates encompassing the 30-water-year Normal Period
-        normal_period_dates = pandas.date_range(self.dates.normal_period_start_date, self.dates.normal_period_end_date)
-        # Convert to 365x30 table
-        allDays = value_list_to_water_year_table(dates=normal_period_dates, values=statsRolling30day)
+        if day_percentiles is None:
+            # Create version for calculating daily statistics
+            statsRolling30day = longRolling30day[self.dates.normal_period_start_date:self.dates.normal_period_end_date]
+            #---Convert Normal Period 30-Day Rolling Totals to a 365x30 array---#
+            # Create a list of dates encompassing the 30-water-year Normal Period
+            normal_period_dates = pandas.date_range(self.dates.normal_period_start_date, self.dates.normal_period_end_date)
+            # Convert to 365x30 table
+            allDays = value_list_to_water_year_table(dates=normal_period_dates, values=statsRolling30day)
+            self.log.Wrap('Calculating Normal High and Normal Low values for each day of the year...')
+            day_percentiles = normals.day_of_year_percentiles(allDays)
+            self.normals_cache.put(normals_key, day_percentiles)
+        else:
+            self.log.Wrap('Reusing Normal High and Normal Low values calculated for this Normal Period...')
 
 # Get current-year Normals (And those same normals replicated over the previous and following years for graphing)
-        self.log.Wrap('Calculating Normal High and Normal Low values for each day of the year...')
-        # Create a list of dates in the selected range
-        current_water_year_dates = pandas.date_range(self.dates.current_water_year_start_date, self.dates.current_water_year_end_date)
-        # Get all days Upper and Lower Normal values for the current water year
-        current_normal_low_series, current_normal_high_series = calc_normal_values(dates=current_water_year_dates, values=allDays)
-        # Create a list of dates for the prior water year
+        # Create lists of dates for the prior, current, and following water years
         prior_water_year_dates = pandas.date_range(self.dates.prior_water_year_start_date, self.dates.prior_water_year_end_date)
-        # Get all days Upper and Lower Normal values for the current water year
-        prior_normal_low_series, prior_normal_high_series = calc_normal_values(dates=prior_water_year_dates, values=allDays)
-        # Create a list of dates for the following water year
+        current_water_year_dates = pandas.date_range(self.dates.current_water_year_start_date, self.dates.current_water_year_end_date)
         following_water_year_dates = pandas.date_range(self.dates.following_water_year_start_date, self.dates.following_water_year_end_date)
-        # Get all days Upper and Lower Normal values for the current water year
-        following_normal_low_series, following_normal_high_series = calc_normal_values(dates=following_water_year_dates, values=allDays)
-        
-        # Append current year to prior year to create final output
-        normal_low_series = prior_normal_low_series.append(current_normal_low_series).append(following_normal_low_series)
-        normal_high_series = prior_normal_high_series.append(current_normal_high_series.append(following_normal_high_series))
+        # Get all days Upper and Lower Normal values for all three water years (once per water year)
+        normal_series_key = normals_key + (self.dates.current_water_year_start_date,)
+        normal_series = self.normals_cache.get(normal_series_key)
+        if normal_series is None:
+            normal_series = normals.normal_series_from_percentiles(day_percentiles=day_percentiles,
+                                                                   dates_list=[prior_water_year_dates,
+                                                                               current_water_year_dates,
+                                                                               following_water_year_dates])
+            self.normals_cache.put(normal_series_key, normal_series)
+        normal_low_series, normal_high_series = normal_series
 
         # CREATE ANNOTATIONS
         first_point_y_rolling_total = None
@@ -1439,39 +1348,29 @@ class Main(object):
                         self.log.Wrap(traceback.format_exc())
                     self.log.Wrap('')
 
+        if self.data_type == 'PRCP':
+            # Collect the PDSI, WebWIMP and elevation results queried during the station downloads
+            ancillary = self.join_ancillary_queries()
+
         # Get Palmer Drought Seveity Index
         if self.data_type == 'PRCP':
-            try:
-                palmer_value, palmer_class, palmer_color, self.pdsidv_file = query_climdiv.get_pdsidv(lat=float(self.site_lat),
-                                                                                                      lon=float(self.site_long),
-                                                                                                      year=self.dates.observation_year,
-                                                                                                      month=self.dates.observation_month,
-                                                                                                      pdsidv_file=self.pdsidv_file)
+            if ancillary['pdsi'] is not None:
+                palmer_value, palmer_class, palmer_color = ancillary['pdsi'][:3]
                 description_table_values.append(["Drought Index (PDSI)", palmer_class])
                 description_table_colors.append([light_grey, palmer_color])
-            except Exception:
+            else:
                 palmer_class = 'Error'
                 palmer_value = -99.99
-                self.log.Wrap(traceback.format_exc())
 
         # Get WebWIMP Wet/Dry Season Determination
         if self.data_type == 'PRCP':
-            try:
-                # Querying WebWIMP to collect Wet / Dry season info...'
-                wet_dry_season_result = self.wimp_scraper.get_season(lat=float(self.site_lat),
-                                                                     lon=float(self.site_long),
-                                                                     month=int(self.dates.observation_month),
-                                                                     output_folder=self.folderPath,
-                                                                     watershed_analysis=self.watershed_analysis)
-                if not wet_dry_season_result == 'ERROR':
-                    description_table_values.append([r"WebWIMP H$_2$O Balance", wet_dry_season_result])
-                    if wet_dry_season_result == 'Wet Season':
-                        description_table_colors.append([light_grey, white])
-                    if wet_dry_season_result == 'Dry Season':
-                        description_table_colors.append([light_grey, light_red])
-            except Exception:
-                wet_dry_season_result = 'Error'
-                self.log.Wrap(traceback.format_exc())
+            wet_dry_season_result = ancillary['season']
+            if wet_dry_season_result == 'Wet Season':
+                description_table_values.append([r"WebWIMP H$_2$O Balance", wet_dry_season_result])
+                description_table_colors.append([light_grey, white])
+            if wet_dry_season_result == 'Dry Season':
+                description_table_values.append([r"WebWIMP H$_2$O Balance", wet_dry_season_result])
+                description_table_colors.append([light_grey, light_red])
 
         # Pickle values for graph_test if in Dev environment
         if sys.executable == r'D:\Code\Python\WinPythonARC\WinPythonZero32\python-3.6.5\python.exe':
@@ -0,0 +1,856 @@
+#  This software was developed by United States Army Corps of Engineers (USACE)
+#  employees in the course of their official duties.  USACE used copyrighted,
+#  open source code to develop this software, as such this software 
+#  (per 17 USC § 101) is considered "joint work."  Pursuant to 17 USC § 105,
+#  portions of the software developed by USACE employees in the course of their
+#  official duties are not subject to copyright protection and are in the public
+#  domain.
+#  
+#  USACE assumes no responsibility whatsoever for the use of this software by
+#  other parties, and makes no guarantees, expressed or implied, about its
+#  quality, reliability, or any other characteristic. 
+#  
+#  The software is provided "as is," without warranty of any kind, express or
+#  implied, including but not limited to the warranties of merchantability,
+#  fitness for a particular purpose, and noninfringement.  In no event shall the
+#  authors or U.S. Government be liable for any claim, damages or other
+#  liability, whether in an action of contract, tort or otherwise, arising from,
+#  out of or in connection with the software or the use or other dealings in the
+#  software.
+#  
+#  Public domain portions of this software can be redistributed and/or modified
+#  freely, provided that any derivative works bear some notice that they are
+#  derived from it, and any modified versions bear some notice that they have
+#  been modified. 
+#  
+#  Copyrighted portions of the software are annotated within the source code.
+#  Open Source Licenses, included in the source code, apply to the applicable
+#  copyrighted portions.  Copyrighted portions of the software are not in the
+#  public domain.
+
+
+
+######################################
+##  ------------------------------- ##
+##         batch_engine.py          ##
+##  ------------------------------- ##
+##     Written by: Jason Deters     ##
+##  ------------------------------- ##
+##    Last Edited on: 2026-10-18    ##
+##  ------------------------------- ##
+######################################
+
+"""
+Runs Antecedent Precipitation Tool analyses without a display.
+
+A JobSpec describes the work (points x dates, data type and watershed scale)
+and BatchEngine runs it: input validation, watershed sampling, the
+anteProcess runs, the batch CSV, PDF merging and the fixed-yMax re-run.
+ant_GUI collects its inputs and hands them to the same engine.
+
+Command line use (figures are drawn with matplotlib's Agg backend):
+    python batch_engine.py -p 38.5,-121.5 --start-date 2020-01-01 --end-date 2020-12-31 -o Outputs
+"""
+
+# Import Standard Libraries
+import os
+import sys
+import csv
+import argparse
+import datetime
+import time
+import subprocess
+import multiprocessing
+
+# Import 3rd Party Libraries
+import matplotlib
+if __name__ == '__main__':
+    # Headless run - draw figures without a display (before pyplot is imported)
+    matplotlib.use('Agg')
+import PyPDF2
+
+# Find module path
+MODULE_PATH = os.path.dirname(os.path.realpath(__file__))
+# Find ROOT folder
+ROOT = os.path.split(MODULE_PATH)[0]
+
+# Import Custom Libraries
+try:
+    from . import huc_query
+    from . import custom_watershed_query
+    from . import check_usa
+    from . import watershed_summary
+    from . import get_all
+    from .utilities import JLog
+except Exception:
+    # Old unfrozen version backwards compatibility step
+    import huc_query
+    import custom_watershed_query
+    import check_usa
+    import watershed_summary
+    import get_all
+    # Add utilities folder to path directly
+    PYTHON_SCRIPTS_FOLDER = os.path.join(ROOT, 'Python Scripts')
+    TEST = os.path.exists(PYTHON_SCRIPTS_FOLDER)
+    if TEST:
+        sys.path.append(PYTHON_SCRIPTS_FOLDER)
+        UTILITIES_FOLDER = os.path.join(PYTHON_SCRIPTS_FOLDER, 'utilities')
+        sys.path.append(UTILITIES_FOLDER)
+    else:
+        ARC_FOLDER = os.path.join(ROOT, 'arc')
+        sys.path.append(ARC_FOLDER)
+        UTILITIES_FOLDER = os.path.join(ARC_FOLDER, 'utilities')
+        sys.path.append(UTILITIES_FOLDER)
+    import JLog
+
+# Version stuff
+get_all.ensure_version_file()
+VERSION_FILES_FOLDER = os.path.join(ROOT, 'v')
+VERSION_FILE_PATH = os.path.join(VERSION_FILES_FOLDER, 'main_ex')
+with open(VERSION_FILE_PATH, 'r') as VERSION_FILE:
+    for line in VERSION_FILE:
+        VERSION_STRING = line.replace('\n','')
+        VERSION_LIST = VERSION_STRING.split('.')
+        VERSION_FOR_PATHS = 'v{}_{}_{}'.format(VERSION_LIST[0], VERSION_LIST[1], VERSION_LIST[2])
+        break
+
+DATA_VARIABLES = {'Rain': 'PRCP',
+                  'Snow': 'SNOW',
+                  'Snow Depth': 'SNWD'}
+RADIO_NAMES = dict((data_variable, radio) for radio, data_variable in DATA_VARIABLES.items())
+WATERSHED_SCALES = ['Single Point', 'HUC12', 'HUC10', 'HUC8', 'Custom Polygon']
+DEFAULT_OUTPUT_FOLDER = os.path.join(ROOT, 'Outputs')
+MAX_PDFS_BEFORE_PART_MERGE = 365  # Merge to a temp file beyond this to avoid crashing the final merge
+DEFAULT_DATE_WORKERS = multiprocessing.cpu_count()
+MIN_PARALLEL_DATES = 4  # Fewer dates than this are not worth starting worker processes for
+CSV_HEADER = 'Latitude,Longitude,Date,PDSI Value,PDSI Class,Season,ARC Score,Antecedent Precip Condition'
+
+
+def validate_inputs(latitude, longitude, observation_year, observation_month, observation_day,
+                    watershed_scale, custom_watershed_file, log=None, in_usa=None):
+    """
+    Tests whether or not all parameters are valid (reasons are logged)
+
+    in_usa is the result of testing the point against the USA boundary, if
+    already known (see check_usa.batch); otherwise it is tested here.
+
+    Returns None if they are not, otherwise the rectified
+    [latitude, longitude, observation_year, observation_month, observation_day]
+    (year as an int, month and day as zero-padded strings, the date moved
+    back to two days ago if it is later than that)
+    """
+    if log is None:
+        log = JLog.PrintLog()
+    # Remove Spaces and Line Breaks from numeric fields (They were showing up when copying from Excel for some reason)
+    latitude = str(latitude).replace(' ', '').replace('\n', '')
+    longitude = str(longitude).replace(' ', '').replace('\n', '')
+    observation_year = str(observation_year).replace(' ', '').replace('\n', '')
+    observation_month = str(observation_month).replace(' ', '').replace('\n', '')
+    observation_day = str(observation_day).replace(' ', '').replace('\n', '')
+    parameters_valid = True
+    try:
+        float(latitude)
+    except Exception:
+        log.Wrap('Latitude must be in decimal degree format!')
+        parameters_valid = False
+    try:
+        float(longitude)
+    except Exception:
+        log.Wrap('Longitude must be in decimal degree format!')
+        parameters_valid = False
+    # Ensure location is within USA boundary
+    if in_usa is None:
+        in_usa = check_usa.main(latitude, longitude)
+    if not in_usa:
+        log.Wrap('Coordinates must be within the United States!')
+        parameters_valid = False
+    try:
+        observation_year = int(observation_year)
+        if observation_year < 1900:
+            if str(observation_year) != '50' and str(observation_year) != '30':
+                log.Wrap('Year must be greater than 1900!')
+                parameters_valid = False
+    except Exception:
+        log.Wrap('Year must be a number!')
+        parameters_valid = False
+    try:
+        observation_month = int(observation_month)
+        if observation_month > 12:
+            log.Wrap('Month cannot exceed 12!')
+            parameters_valid = False
+        if observation_month < 1:
+            log.Wrap('Month cannot be less than 1!')
+            parameters_valid = False
+    except Exception:
+        log.Wrap('Month must be a number!')
+        parameters_valid = False
+    try:
+        observation_day = int(observation_day)
+        if observation_day > 31:
+            log.Wrap('Day cannot exceed 31')
+            parameters_valid = False
+        if observation_day < 1:
+            log.Wrap('Day cannot be less than 1!')
+    except Exception:
+        log.Wrap('Day must be a number!')
+        parameters_valid = False
+    # Test if shapefile exists
+    if custom_watershed_file:
+        watershed_file_exists = os.path.exists(custom_watershed_file)
+        if not watershed_file_exists:
+            log.Wrap('SUPPLIED CUSTOM WATERSHED FILE NOT FOUND!')
+            parameters_valid = False
+        watershed_extension = os.path.splitext(custom_watershed_file)[1]
+        if watershed_extension.lower() == '.shp':
+            prj_file = custom_watershed_file[:-4] + '.prj'
+            prj_exists = os.path.exists(prj_file)
+            if not prj_exists:
+                log.Wrap('SUPPLIED CUSTOM WATERSHED FILE LACKS REQUIRED PROJECTION (.prj) FILE!')
+                parameters_valid = False
+    else:
+        if watershed_scale == 'Custom Polygon':
+            log.Wrap('"CUSTOM POLYGON" SELECTED BY NOT PROVIDED!')
+            parameters_valid = False
+    # Test for actual date
+    if parameters_valid:
+        try:
+            # RECTIFY INPUTS
+            if len(str(observation_day)) == 1:
+                observation_day = '0'+str(observation_day)
+            else:
+                observation_day = str(observation_day)
+            if len(str(observation_month)) == 1:
+                observation_month = '0'+str(observation_month)
+            else:
+                observation_month = str(observation_month)
+            observation_date = str(observation_year)+'-'+observation_month+'-'+observation_day
+            observation_datetime = datetime.datetime.strptime(observation_date, '%Y-%m-%d')
+        except Exception as error:
+            log.Wrap('')
+            log.Wrap('{}!'.format(str(error).upper()))
+            parameters_valid = False
+    # Ensure date is no later than 2 days prior to current date
+    if parameters_valid:
+        two_days_prior_datetime = datetime.datetime.today()- datetime.timedelta(days=2)
+        if observation_datetime > two_days_prior_datetime:
+            observation_date = two_days_prior_datetime.strftime('%Y-%m-%d')
+            log.Wrap('Date cannot exceed two days ago due to data availability')
+            log.Wrap('  Observation date updated to: {}'.format(observation_date))
+            observation_day = two_days_prior_datetime.strftime('%d')
+            observation_month = two_days_prior_datetime.strftime('%m')
+            observation_year = int(two_days_prior_datetime.strftime('%Y'))
+    if not parameters_valid:
+        return None
+    return [latitude, longitude, observation_year, observation_month, observation_day]
+
+def dates_in_range(start_date, end_date):
+    """Returns a (year, month, day) string tuple for every day from start_date to end_date (inclusive)"""
+    dates = []
+    test_datetime = start_date
+    while test_datetime <= end_date:
+        dates.append((test_datetime.strftime('%Y'), test_datetime.strftime('%m'), test_datetime.strftime('%d')))
+        # Advance 1 day
+        test_datetime = test_datetime + datetime.timedelta(days=1)
+    return dates
+
+def announce_run(log, title, message):
+    """Logs the heading of one setInputs run"""
+    if title is not None:
+        log.print_title(title)
+    log.Wrap('')
+    log.Wrap(message)
+    log.Wrap('')
+
+# anteProcess.Main instance of a date worker process (see run_date)
+DATE_WORKER_INSTANCE = None
+
+def init_date_worker(epqs_variant, point_state, use_station_cache):
+    """Date worker process initializer: takes over the station data loaded by the parent process
+
+    Workers are spawned, so point_state arrives pickled and the worker
+    starts without any of the parent's threads or open connections.  The
+    station cache is opened read-only; stations the worker downloads are
+    handed back to the parent process to save (see run_date).
+    """
+    global DATE_WORKER_INSTANCE
+    # Workers only draw figures to files
+    matplotlib.use('Agg')
+    try:
+        from . import anteProcess
+        from . import station_cache
+    except Exception:
+        import anteProcess
+        import station_cache
+    DATE_WORKER_INSTANCE = anteProcess.Main(epqs_variant=epqs_variant)
+    DATE_WORKER_INSTANCE.restore_point_state(point_state)
+    if use_station_cache:
+        DATE_WORKER_INSTANCE.station_cache = station_cache.StationCache(read_only=True)
+
+def run_date(run):
+    """
+    Runs one (title, message, input_list) in a date worker process
+
+    Returns the setInputs results and the (key, station) records to be saved
+    to the station cache by the parent process.
+    """
+    title, message, input_list = run
+    announce_run(JLog.PrintLog(), title, message)
+    result = DATE_WORKER_INSTANCE.setInputs(input_list, watershed_analysis=False, all_sampling_coordinates=None)
+    new_records = []
+    if DATE_WORKER_INSTANCE.station_cache is not None:
+        new_records = DATE_WORKER_INSTANCE.station_cache.take_pending()
+    return result, new_records
+
+def merge_pdfs(pdf_list, output_path):
+    """Merges the PDFs in pdf_list (in order) into output_path"""
+    merger = PyPDF2.PdfFileMerger()
+    for doc in pdf_list:
+        merger.append(PyPDF2.PdfFileReader(doc), "rb")
+    merger.write(output_path)
+    del merger
+
+
+class JobSpec(object):
+    """
+    Describes a batch of analyses: every date at every point
+
+    points are (latitude, longitude) pairs and dates are (year, month, day)
+    triples.  data_type is 'Rain', 'Snow' or 'Snow Depth' (or PRCP, SNOW or
+    SNWD).  At the 'Single Point' watershed scale each point is one batch
+    over all of the dates; at any other scale every point and date is its
+    own watershed analysis.
+    """
+    def __init__(self,
+                 points,
+                 dates,
+                 data_type='Rain',
+                 watershed_scale='Single Point',
+                 save_folder=DEFAULT_OUTPUT_FOLDER,
+                 image_name=None,
+                 image_source=None,
+                 custom_watershed_name=None,
+                 custom_watershed_file=None,
+                 fixed_y_max=False,
+                 forecast_enabled=False,
+                 seed=None):
+        self.points = list(points)
+        self.dates = list(dates)
+        data_type = RADIO_NAMES.get(data_type, data_type)
+        if data_type not in DATA_VARIABLES:
+            raise ValueError('Unknown data type: {}'.format(data_type))
+        if watershed_scale not in WATERSHED_SCALES:
+            raise ValueError('Unknown watershed scale: {}'.format(watershed_scale))
+        if watershed_scale != 'Single Point' and data_type != 'Rain':
+            raise ValueError('Watershed scales are only available for Rain')
+        self.data_type = data_type
+        self.watershed_scale = watershed_scale
+        self.save_folder = save_folder
+        self.image_name = image_name
+        self.image_source = image_source
+        self.custom_watershed_name = custom_watershed_name
+        self.custom_watershed_file = custom_watershed_file
+        self.fixed_y_max = fixed_y_max
+        self.forecast_enabled = forecast_enabled
+        self.seed = seed
+
+
+class BatchEngine(object):
+    """
+    Runs batches of Antecedent Precipitation Tool analyses
+
+    One anteProcess.Main instance is kept per data type, so stations and
+    other downloads are reused from batch to batch.  With open_results,
+    finished PDFs, CSVs and output folders are opened for the user (as
+    the GUI does); headless runs leave it False.  With date_workers above
+    1, the dates of a single point batch are run in that many processes.
+    """
+    def __init__(self, open_results=False, seed=None, date_workers=1):
+        self.open_results = open_results
+        self.seed = seed
+        self.date_workers = date_workers
+        self.instances = {}
+        self.log = JLog.PrintLog()
+
+    def get_instance(self, radio):
+        """Returns the anteProcess.Main instance for the data type, creating it on first use"""
+        data_variable = DATA_VARIABLES[radio]
+        if data_variable not in self.instances:
+            # Import anteProcess
+            try:
+                from . import anteProcess
+            except Exception:
+                import anteProcess
+            self.log.Wrap("Creating {} anteProcess.Main() instance...".format(radio))
+            self.instances[data_variable] = anteProcess.Main()
+        return self.instances[data_variable]
+
+    def shutdown(self):
+        """Stops the download and query threads of every anteProcess.Main instance"""
+        for ante_instance in self.instances.values():
+            ante_instance.shutdown()
+
+    def open_file(self, path, description):
+        """Opens a finished output in a new process (only if open_results)"""
+        if self.open_results:
+            self.log.Wrap('Opening {} in a new process...'.format(description))
+            subprocess.Popen(path, shell=True)
+
+    def open_folder(self, folder):
+        """Opens the folder containing outputs (only if open_results)"""
+        if self.open_results:
+            subprocess.Popen('explorer "{}"'.format(folder))
+
+    def run_all(self, ante_instance, runs, watershed_analysis=False, sampling_points=None):
+        """
+        Yields the setInputs results of each (title, message, input_list) run, in order
+
+        The dates of a single point batch are independent once its stations
+        are loaded, so with date_workers above 1 the first run is made here
+        (loading the stations) and the rest are spread over a process pool
+        that starts from this instance's point state.
+        """
+        if watershed_analysis or self.date_workers < 2 or len(runs) < MIN_PARALLEL_DATES:
+            for title, message, input_list in runs:
+                announce_run(self.log, title, message)
+                yield ante_instance.setInputs(input_list, watershed_analysis=watershed_analysis, all_sampling_coordinates=sampling_points)
+            return
+        title, message, input_list = runs[0]
+        announce_run(self.log, title, message)
+        yield ante_instance.setInputs(input_list, watershed_analysis=False, all_sampling_coordinates=None)
+        num_workers = min(self.date_workers, len(runs) - 1)
+        self.log.Wrap('Running the remaining {} dates in {} processes...'.format(len(runs) - 1, num_workers))
+        # Stop this instance's download and query threads (they restart when next needed)
+        ante_instance.shutdown()
+        # Spawn rather than fork, so no threads, held locks, GDAL handles or
+        # SQLite connections of this process are copied into the workers
+        context = multiprocessing.get_context('spawn')
+        pool = context.Pool(processes=num_workers,
+                            initializer=init_date_worker,
+                            initargs=(ante_instance.epqs_variant,
+                                      ante_instance.get_point_state(),
+                                      ante_instance.station_cache is not None))
+        try:
+            # imap hands the results back in submission order
+            for result, new_records in pool.imap(run_date, runs[1:]):
+                if new_records:
+                    # Only this process writes to the station cache
+                    ante_instance.station_cache.put_many(new_records)
+                yield result
+        finally:
+            # All results are in (or no longer wanted)
+            pool.terminate()
+            pool.join()
+    # End of run_all method
+
+    def run_job(self, spec):
+        """
+        Runs every analysis described by a JobSpec
+
+        Returns a list with the result of each batch (see run_inputs)
+        """
+        results = []
+        # Test every point against the USA boundary in one pass, not once per point and date
+        try:
+            in_usa_list = check_usa.batch(spec.points)
+        except Exception:
+            # Coordinates that aren't numbers - validate_inputs reports those
+            in_usa_list = [None] * len(spec.points)
+        for (latitude, longitude), in_usa in zip(spec.points, in_usa_list):
+            input_list_list = []
+            for observation_year, observation_month, observation_day in spec.dates:
+                inputs = validate_inputs(latitude,
+                                         longitude,
+                                         observation_year,
+                                         observation_month,
+                                         observation_day,
+                                         spec.watershed_scale,
+                                         spec.custom_watershed_file,
+                                         log=self.log,
+                                         in_usa=in_usa)
+                if inputs is None:
+                    self.log.Wrap('Skipping invalid inputs: {}'.format([latitude, longitude, observation_year, observation_month, observation_day]))
+                    continue
+                input_list = [DATA_VARIABLES[spec.data_type]] + inputs + [spec.image_name, spec.image_source]
+                if spec.watershed_scale == 'Single Point':
+                    if input_list not in input_list_list:
+                        input_list_list.append(input_list)
+                else:
+                    results.append(self.run_inputs(input_list,
+                                                   [],
+                                                   spec.save_folder,
+                                                   spec.watershed_scale,
+                                                   spec.custom_watershed_name,
+                                                   spec.custom_watershed_file,
+                                                   spec.fixed_y_max,
+                                                   spec.forecast_enabled,
+                                                   seed=spec.seed))
+            if len(input_list_list) == 1:
+                results.append(self.run_inputs(input_list_list[0],
+                                               [],
+                                               spec.save_folder,
+                                               fixed_y_max=spec.fixed_y_max,
+                                               forecast_enabled=spec.forecast_enabled))
+            elif input_list_list:
+                results.append(self.run_inputs(input_list_list[-1],
+                                               input_list_list,
+                                               spec.save_folder,
+                                               fixed_y_max=spec.fixed_y_max,
+                                               forecast_enabled=spec.forecast_enabled))
+        return results
+
+    def run_inputs(self,
+                   input_list,
+                   input_list_list,
+                   save_folder,
+                   watershed_scale='Single Point',
+                   custom_watershed_name=None,
+                   custom_watershed_file=None,
+                   fixed_y_max=False,
+                   forecast_enabled=False,
+                   seed=None):
+        """
+        Executes main business logic of the Antecedent Precipitation Tool
+
+        input_list is the current (validated) input list:
+            [data_variable, latitude, longitude, observation_year,
+             observation_month, observation_day, image_name, image_source]
+        and input_list_list the batch it belongs to (empty for a single run).
+        Watershed scales other than 'Single Point' replace the batch with the
+        watershed's sampling points.
+
+        Returns (PDF path, CSV path); the CSV path is None for a single run
+        and the PDF path is None if no PDF was created.
+        """
+        if seed is None:
+            seed = self.seed
+        data_variable = input_list[0]
+        latitude = input_list[1]
+        longitude = input_list[2]
+        observation_year = input_list[3]
+        observation_month = input_list[4]
+        observation_day = input_list[5]
+        image_name = input_list[6]
+        observation_date = '{}-{}-{}'.format(observation_year, observation_month, observation_day)
+        radio = RADIO_NAMES[data_variable]
+        if not custom_watershed_file:
+            custom_watershed_file = None
+        elif not custom_watershed_name:
+            custom_watershed_name = os.path.splitext(os.path.split(custom_watershed_file)[1])[0]
+        ante_instance = self.get_instance(radio)
+        sampling_points = None
+#-WATERSHED START
+        if radio == 'Rain':
+            # WATERSHED PROCESSING SECTION
+            if watershed_scale != 'Single Point':
+                # Announce Watershed Processing
+                self.log.print_title('WATERSHED IDENTIFICATION AND RANDOM SAMPLING')
+                # Clear the Batch Queue (If necessary) [We currently don't support batch watershed runs]
+                if len(input_list_list) > 1:
+                    # Let user know the batch processes are being cleared
+                    self.log.Wrap('Manual batch processing lists are not supported for Watershed Scales other than "Single Point"')
+                    self.log.Wrap('  Clearing Batch Process Queue to prepare for Watershed Random Sampling Points...')
+                input_list_list = []
+                self.log.Wrap('Selected Watershed Scale: {}'.format(watershed_scale))
+                self.log.Wrap('Identifying and sampling watershed...')
+                if watershed_scale != 'Custom Polygon':
+                    # Get HUC & Random Sampling Points
+                    huc, sampling_points, huc_square_miles = huc_query.id_and_sample(lat=latitude,
+                                                                                     lon=longitude,
+                                                                                     watershed_scale=watershed_scale,
+                                                                                     seed=seed)
+                else:
+                    # Get Random Sampling points and square miles
+                    sampling_points, huc_square_miles = custom_watershed_query.shapefile_sample(lat=latitude,
+                                                                                                lon=longitude,
+                                                                                                shapefile=custom_watershed_file,
+                                                                                                seed=seed)
+                # Add each sampling point to batch process
+                self.log.print_section('Batch Process Queueing')
+                self.log.Wrap('Adding Random Sampling Points for the watershed to the Batch Process Queue...')
+                if watershed_scale != 'Custom Polygon':
+                    self.log.Wrap('{} ({}) - Watershed Sampling Points:'.format(watershed_scale, huc))
+                else:
+                    self.log.Wrap('{} ({}) - Watershed Sampling Points:'.format(watershed_scale, custom_watershed_name))
+                for sampling_point in sampling_points:
+                    # Create input list for sampling point
+                    sampling_input_list = [data_variable,
+                                           sampling_point[0],
+                                           sampling_point[1],
+                                           observation_year,
+                                           observation_month,
+                                           observation_day,
+                                           image_name,
+                                           input_list[7]]
+                    # Add sampling point to input_list_list
+                    input_list_list.append(sampling_input_list)
+                    # Announce the addition of this sampling point
+                    self.log.Wrap(' Sampling Point {} - {}'.format(str(len(input_list_list)),
+                                                                   str(sampling_input_list)))
+                self.log.print_separator_line()
+#-WATERSHED END
+        ### - INDIVIDUAL PROCESS OR BATCH ITERATION - ###
+        current_input_list_list = list(input_list_list)
+        if not len(input_list_list) > 1:
+            self.log.print_title("SINGLE POINT ANALYSIS")
+            run_list = input_list + [save_folder, forecast_enabled]
+            self.log.Wrap('Running: '+str(run_list))
+            result_pdf, run_y_max, condition, ante_score, wet_dry_season, palmer_value, palmer_class = ante_instance.setInputs(run_list, watershed_analysis=False, all_sampling_coordinates=None)
+            if result_pdf is not None:
+                # Open folder containing outputs
+                version_folder = os.path.join(save_folder, VERSION_FOR_PATHS)
+                coord_string = '{}, {}'.format(input_list[1], input_list[2])
+                self.open_folder(os.path.join(version_folder, coord_string))
+                # Open PDF in new process
+                self.open_file(result_pdf, 'PDF')
+            return result_pdf, None
+        pdf_list = []
+        highest_y_max = 0
+        # Ensure batches are saved to a folder (Force Desktop if empty)
+        if save_folder is None:
+            save_folder = DEFAULT_OUTPUT_FOLDER
+            self.log.Wrap('Setting Output Folder to default location: {}...'.format(save_folder))
+        # Calculate output_folder
+        version_folder = os.path.join(save_folder, VERSION_FOR_PATHS)
+        watershed_analysis = False
+        if radio == 'Rain' and watershed_scale != 'Single Point':
+            watershed_analysis = True
+            if watershed_scale == 'Custom Polygon':
+                huc = custom_watershed_name
+            general_watershed_folder = os.path.join(version_folder, '~Watershed')
+            watershed_scale_folder = os.path.join(general_watershed_folder, watershed_scale)
+            output_folder = os.path.join(watershed_scale_folder, huc)
+            # Define PDF Outputs
+            final_path_variable = os.path.join(output_folder, '{} - {} - Batch Result.pdf'.format(observation_date, huc))
+            watershed_summary_path = os.path.join(output_folder, '{} - {} - Summary Page.pdf'.format(observation_date, huc))
+            final_path_fixed = os.path.join(output_folder, '{} - {} - Batch Result - Fixed Scale.pdf'.format(observation_date, huc))
+            # Define CSV Output
+            csv_path = os.path.join(output_folder, '{} - {} - Sampling Results.csv'.format(observation_date, huc))
+        else:
+            coord_string = '{}, {}'.format(input_list[1], input_list[2])
+            if radio == 'Rain':
+                output_folder = os.path.join(version_folder, coord_string)
+            elif radio == 'Snow':
+                output_folder = os.path.join(version_folder, 'Snowfall', coord_string)
+            elif radio == 'Snow Depth':
+                output_folder = os.path.join(version_folder, 'Snow Depth', coord_string)
+            # Define PDF Outputs
+            final_path_variable = os.path.join(output_folder, '({}, {}) Batch Result.pdf'.format(latitude, longitude))
+            final_path_fixed = os.path.join(output_folder, '({}, {}) Batch Result - Fixed.pdf'.format(latitude, longitude))
+            # Define CSV Output
+            csv_path = os.path.join(output_folder, '({}, {}) Batch Result.csv'.format(latitude, longitude))
+        # Add save_folder and Forecast setting to input lists
+        for count, specific_input_list in enumerate(current_input_list_list):
+            current_input_list_list[count] = specific_input_list + [save_folder, forecast_enabled]
+        # Create csv_writer
+        csv_writer = JLog.PrintLog(Delete=True,
+                                   Log=csv_path,
+                                   Indent=0,
+                                   Width=400,
+                                   LogOnly=True)
+        # Write first line of CSV
+        csv_writer.Wrap(CSV_HEADER)
+        # Create watershed_summary results_list
+        watershed_results_list = []
+        # Set PDF Counter and Part Counter to 0
+        pdf_count = 0
+        part_count = 0
+        parts_2_delete = []
+        total_pdfs = len(current_input_list_list)
+        runs = []
+        for run_count, current_input_list in enumerate(current_input_list_list, 1):
+            if watershed_scale == 'Single Point':
+                title = "Single Point Batch Analysis - Date {} of {}".format(run_count, total_pdfs)
+            else:
+                title = "{} WATERSHED ANALYSIS - SAMPLING POINT {} of {}".format(watershed_scale, run_count, total_pdfs)
+            runs.append((title, 'Running: '+str(current_input_list), current_input_list))
+        results = self.run_all(ante_instance, runs, watershed_analysis=watershed_analysis, sampling_points=sampling_points)
+        for result, current_input_list in zip(results, current_input_list_list):
+            result_pdf, run_y_max, condition, ante_score, wet_dry_season, palmer_value, palmer_class = result
+            if run_y_max > highest_y_max:
+                highest_y_max = run_y_max
+            if result_pdf is not None:
+                pdf_list.append(result_pdf)
+                # CHECK TO SEE IF INCREMENTAL MERGING IS NECESSARY
+                pdf_count += 1
+                if len(pdf_list) > MAX_PDFS_BEFORE_PART_MERGE:
+                    if (total_pdfs - pdf_count) > 25:
+                        part_count += 1
+                        # Merging current PDFs to avoid crash when too many PDFs are merged at once
+                        self.log.Wrap('')
+                        self.log.Wrap('Merging PDFs to temp file to avoid crash at the end from merging too many files at once...')
+                        self.log.Wrap('')
+                        # Determine available temp file name
+                        final_path_variable_part = '{} - Part {}.pdf'.format(final_path_variable[:-4],
+                                                                             part_count)
+                        # Merge current PDFs, then add the merged PDF to the newly cleared PDF list
+                        merge_pdfs(pdf_list, final_path_variable_part)
+                        pdf_list = [final_path_variable_part]
+                        # Remember to delete these partial files later
+                        parts_2_delete.append(final_path_variable_part)
+                if watershed_analysis:
+                    watershed_results_list.append((ante_score, condition, wet_dry_season, palmer_class))
+                # Write results to CSV
+                csv_writer.Wrap('{},{},{}-{}-{},{},{},{},{},{}'.format(current_input_list[1], # Latitude
+                                                                       current_input_list[2], # Longitude
+                                                                       current_input_list[3], # Observation Year
+                                                                       current_input_list[4], # Observation Month
+                                                                       current_input_list[5], # Observation Day
+                                                                       palmer_value, # PDSI Value
+                                                                       palmer_class, # PDSI Class
+                                                                       wet_dry_season, # Season
+                                                                       ante_score, # ARC Score
+                                                                       condition)) # Antecedent Precip Condition
+        if watershed_analysis:
+            generated = watershed_summary.create_summary(site_lat=latitude,
+                                                         site_long=longitude,
+                                                         observation_date=observation_date,
+                                                         geographic_scope=watershed_scale,
+                                                         huc=huc,
+                                                         huc_size=huc_square_miles,
+                                                         results_list=watershed_results_list,
+                                                         watershed_summary_path=watershed_summary_path)
+            if generated:
+                pdf_list = [watershed_summary_path] + pdf_list
+                parts_2_delete.append(watershed_summary_path)
+        if not pdf_list: # Testing list for content
+            return None, csv_path
+        merge_pdfs(pdf_list, final_path_variable)
+        # Open Excel Results
+        self.open_file(csv_path, 'Batch Results CSV')
+        # Open finalPDF
+        self.open_file(final_path_variable, 'finalPDF')
+        # Open folder containing outputs
+        self.open_folder(output_folder)
+        if fixed_y_max is True:
+            # Re-run batch with fixed yMax value
+            ante_instance.set_yMax(highest_y_max)
+            # Set PDF Counter and Part Counter to 0
+            pdf_count = 0
+            part_count = 0
+            # Clear pdf_list
+            pdf_list = []
+            runs = [(None, 'Re-running with fixed yMax value: '+str(current_input_list), current_input_list)
+                    for current_input_list in current_input_list_list]
+            for result in self.run_all(ante_instance, runs, watershed_analysis=watershed_analysis, sampling_points=sampling_points):
+                result_pdf = result[0]
+                pdf_list.append(result_pdf)
+                # CHECK TO SEE IF INCREMENTAL MERGING IS NECESSARY
+                pdf_count += 1
+                if len(pdf_list) > MAX_PDFS_BEFORE_PART_MERGE:
+                    if (total_pdfs - pdf_count) > 25:
+                        part_count += 1
+                        # Merging current PDFs to avoid crash when too many PDFs are merged at once
+                        self.log.Wrap('')
+                        self.log.Wrap('Merging PDFs to temp file to avoid crash at the end from merging too many files at once...')
+                        self.log.Wrap('')
+                        # Determine available temp file name
+                        final_path_fixed_part = '{} - Part {}.pdf'.format(final_path_fixed[:-4],
+                                                                          part_count)
+                        # Merge current PDFs, then add the temp file to the newly cleared PDF list
+                        merge_pdfs(pdf_list, final_path_fixed_part)
+                        pdf_list = [final_path_fixed_part]
+                        # Remember to delete these partial files later
+                        parts_2_delete.append(final_path_fixed_part)
+            ante_instance.set_yMax(None)
+            if pdf_list:
+                merge_pdfs(pdf_list, final_path_fixed)
+                # Open finalPDF
+                self.open_file(final_path_fixed, 'finalPDF')
+        # Attempt to delete partial files
+        self.log.Wrap('Attempting to delete temporary files...')
+        for part in parts_2_delete:
+            try:
+                os.remove(part)
+            except Exception:
+                pass
+        return final_path_variable, csv_path
+    # End of run_inputs method
+
+
+def read_csv_rows(csv_path):
+    """Returns the rows of a CSV file after its header line"""
+    with open(csv_path, 'r') as csv_file:
+        rows = [row for row in csv.reader(csv_file) if row]
+    return rows[1:]
+
+def parse_date(date_string):
+    """Reads a YYYY-MM-DD argument"""
+    return datetime.datetime.strptime(date_string, '%Y-%m-%d')
+
+def parse_args(argv=None):
+    """Reads the number of date workers and a JobSpec from command line arguments"""
+    parser = argparse.ArgumentParser(description='Runs Antecedent Precipitation Tool analyses without the graphical user interface.')
+    parser.add_argument('-p', '--point', action='append', default=[], metavar='LAT,LON',
+                        help='Point to analyze (repeatable)')
+    parser.add_argument('--points-csv', help='CSV of points to analyze (header line, then Latitude,Longitude lines)')
+    parser.add_argument('-d', '--date', action='append', default=[], type=parse_date, metavar='YYYY-MM-DD',
+                        help='Observation date (repeatable)')
+    parser.add_argument('--start-date', type=parse_date, metavar='YYYY-MM-DD', help='First date of a daily date range')
+    parser.add_argument('--end-date', type=parse_date, metavar='YYYY-MM-DD', help='Last date of a daily date range')
+    parser.add_argument('--dates-csv', help='CSV of observation dates (header line, then Year,Month,Day lines, as in the GUI)')
+    parser.add_argument('-t', '--data-type', default='Rain', choices=['Rain', 'Snow', 'Snow Depth'])
+    parser.add_argument('-w', '--watershed-scale', default='Single Point', choices=WATERSHED_SCALES)
+    parser.add_argument('--custom-watershed-file', help='Shapefile for the Custom Polygon watershed scale')
+    parser.add_argument('--custom-watershed-name', help='Name of the custom watershed (default: the file name)')
+    parser.add_argument('-o', '--output-folder', default=DEFAULT_OUTPUT_FOLDER)
+    parser.add_argument('--image-name')
+    parser.add_argument('--image-source')
+    parser.add_argument('--fixed-y-max', action='store_true', help='Also create batch PDFs with a common y-axis scale')
+    parser.add_argument('--forecast', action='store_true', help='Include the 7-day forecast')
+    parser.add_argument('--seed', type=int, help='Seed for reproducible watershed sampling points')
+    parser.add_argument('--date-workers', type=int, default=DEFAULT_DATE_WORKERS,
+                        help='Processes to run the dates of a single point batch in (default: one per CPU)')
+    args = parser.parse_args(argv)
+    points = [point.split(',') for point in args.point]
+    if args.points_csv:
+        points.extend(row[:2] for row in read_csv_rows(args.points_csv))
+    dates = [(date.strftime('%Y'), date.strftime('%m'), date.strftime('%d')) for date in args.date]
+    if args.start_date or args.end_date:
+        if not (args.start_date and args.end_date):
+            parser.error('--start-date and --end-date must be given together')
+        dates.extend(dates_in_range(args.start_date, args.end_date))
+    if args.dates_csv:
+        dates.extend(tuple(row[:3]) for row in read_csv_rows(args.dates_csv))
+    if not points:
+        parser.error('No points given')
+    if not dates:
+        parser.error('No dates given')
+    spec = JobSpec(points=[(latitude.strip(), longitude.strip()) for latitude, longitude in points],
+                   dates=dates,
+                   data_type=args.data_type,
+                   watershed_scale=args.watershed_scale,
+                   save_folder=args.output_folder,
+                   image_name=args.image_name,
+                   image_source=args.image_source,
+                   custom_watershed_name=args.custom_watershed_name,
+                   custom_watershed_file=args.custom_watershed_file,
+                   fixed_y_max=args.fixed_y_max,
+                   forecast_enabled=args.forecast,
+                   seed=args.seed)
+    return args.date_workers, spec
+
+def main(argv=None):
+    """Command line entry point"""
+    start_time = time.time()
+    date_workers, spec = parse_args(argv)
+    # Headless runs don't go through the GUI's startup downloads
+    get_all.ensure_WIMP()
+    engine = BatchEngine(open_results=False, date_workers=date_workers)
+    try:
+        results = engine.run_job(spec)
+    finally:
+        engine.shutdown()
+    log = JLog.PrintLog()
+    for pdf_path, csv_path in results:
+        if pdf_path is not None:
+            log.Wrap('Created: {}'.format(pdf_path))
+        if csv_path is not None:
+            log.Wrap('Created: {}'.format(csv_path))
+    log.Time(StartTime=start_time,
+             Task="All tasks")
+    return results
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    main()
@@ -34,7 +34,7 @@
 ##  ------------------------------- ##
 ##     Copyright: Jason Deters      ##
 ##  ------------------------------- ##
-##    Last Edited on: 2020-05-27    ##
+##    Last Edited on: 2026-10-18    ##
 ##  ------------------------------- ##
 ######################################
 
@@ -44,17 +44,16 @@
 import os
 import sys
 import random
-
-# Import 3rd Party Libraries
-import ogr
-ogr.UseExceptions()
+import functools
 
 # Import Custom Libraries
 MODULE_PATH = os.path.dirname(os.path.realpath(__file__))
 ROOT = os.path.split(MODULE_PATH)[0]
 try:
+    from . import query_shapefile_at_point
     from .utilities import JLog
 except Exception:
+    import query_shapefile_at_point
     # Reverse compatibility step - Add utilities folder to path directly
     PYTHON_SCRIPTS_FOLDER = os.path.join(ROOT, 'Python Scripts')
     TEST = os.path.exists(PYTHON_SCRIPTS_FOLDER)
@@ -68,54 +67,29 @@ except Exception:
     import JLog
 
 
+# USA Boundary Shapefile
+USA_SHAPEFILE_PATH = os.path.join(ROOT, 'GIS', 'us_shp', 'cb_2018_us_nation_5m.shp')
+COORDINATE_DECIMALS = 6     # Coordinates are rounded to ~0.1 m before testing and caching
+
+
 def main(lat, lon):
     """Tests latitude and longitude against a shapefile of the USA boundary"""
-    lat = float(lat)
-    lon = float(lon)
-    in_usa = False
-    # Find module path
-    module_folder = os.path.dirname(os.path.realpath(__file__))
-    # Find ROOT folder
-    root_folder = os.path.split(module_folder)[0]
-    # Find USA Boundary Shapefile
-    gis_folder = os.path.join(root_folder, 'GIS')
-    usa_shapefile_folder = os.path.join(gis_folder, 'us_shp')
-    usa_shapefile_path = os.path.join(usa_shapefile_folder, 'cb_2018_us_nation_5m.shp')
-
-    # Get the contents of the USA Boundary Shapefile
-    ds_in = ogr.Open(usa_shapefile_path)
-    # Get the shapefile's first layer
-    lyr_in = ds_in.GetLayer()
+    return in_usa(round(float(lat), COORDINATE_DECIMALS), round(float(lon), COORDINATE_DECIMALS))
 
-    #If the latitude/longitude we're going to use is not in the projection
-    #of the shapefile, then we will get erroneous results.
-    #The following assumes that the latitude longitude is in WGS84
-    #This is identified by the number "4326", as in "EPSG:4326"
-    #We will create a transformation between this and the shapefile's
-    #project, whatever it may be
-    geo_ref = lyr_in.GetSpatialRef()
-    point_ref = ogr.osr.SpatialReference()
-    point_ref.ImportFromEPSG(4326)
-    ctran = ogr.osr.CoordinateTransformation(point_ref, geo_ref)
-    rtran = ogr.osr.CoordinateTransformation(geo_ref, point_ref)
 
-    #Transform incoming longitude/latitude to the shapefile's projection
-    [t_lon, t_lat, z] = ctran.TransformPoint(lon, lat)
+@functools.lru_cache(maxsize=4096)
+def in_usa(lat, lon):
+    """Point-in-boundary test behind main(), cached by rounded coordinates"""
+    usa_index = query_shapefile_at_point.get_index(USA_SHAPEFILE_PATH)
+    return usa_index.find(lon, lat, predicate='Contains') is not None
 
-    # Create a point
-    pt = ogr.Geometry(ogr.wkbPoint)
-    pt.SetPoint_2D(0, t_lon, t_lat)
 
-    # Check if point is within boundary
-    for feat_in in lyr_in:
-        feat_in_geom = feat_in.geometry()
-        contains_point = feat_in_geom.Contains(pt)
-        if contains_point:
-            in_usa = True
-            return in_usa
-    
-    # Return result if not caught above
-    return in_usa 
+def batch(coordinates):
+    """Tests a list of [lat, lon] pairs against the USA boundary in one pass; returns a list of booleans"""
+    usa_index = query_shapefile_at_point.get_index(USA_SHAPEFILE_PATH)
+    points = [(round(float(lon), COORDINATE_DECIMALS), round(float(lat), COORDINATE_DECIMALS)) for lat, lon in coordinates]
+    matches = usa_index.lookup(points, predicate='Contains')
+    return [match is not None for match in matches]
 
 
 if __name__ == '__main__':
@@ -34,7 +34,7 @@
 ##  ------------------------------- ##
 ##      Copyright: Jason Deters     ##
 ##  ------------------------------- ##
-##    Last Edited on: 2020-05-27    ##
+##    Last Edited on: 2026-10-18    ##
 ##  ------------------------------- ##
 ######################################
 
@@ -42,7 +42,6 @@
 # Import Standard Libraries
 import os
 import sys
-import random
 
 # Import 3rd Party Libraries
 import ogr
@@ -52,8 +51,12 @@ ogr.UseExceptions()
 MODULE_PATH = os.path.dirname(os.path.realpath(__file__))
 ROOT = os.path.split(MODULE_PATH)[0]
 try:
+    from . import sampling
+    from . import sampling_cache
     from .utilities import JLog
 except Exception:
+    import sampling
+    import sampling_cache
     # Reverse compatibility step - Add utilities folder to path directly
     PYTHON_SCRIPTS_FOLDER = os.path.join(ROOT, 'Python Scripts')
     TEST = os.path.exists(PYTHON_SCRIPTS_FOLDER)
@@ -67,6 +70,9 @@ except Exception:
     import JLog
 
 
+# Random points tested for room before custom watershed sampling is complete
+CUSTOM_SEED_ATTEMPTS = 3000
+
 # Function Definitions
 
 def ensure_dir(folder):
@@ -90,10 +96,11 @@ def findHorizontalUnits(csString):
     finalString = csString[midLoc:endLoc]
     return finalString
 
-def shapefile_sample(lat, lon, shapefile):
+def shapefile_sample(lat, lon, shapefile, seed=None):
     """
     Identify the HUC of a given huc_digits in which the supplied coordinates lie.
     If selected, generate random sampling points (# and minimum spacing determined by HUC Digits) 
+    (seed makes the sampling points reproducible)
     """
     # Shapefile Query Adapted from
     # https://stackoverflow.com/questions/7861196/check-if-a-geopoint-with-latitude-and-longitude-is-within-a-shapefile/13433127#13433127
@@ -107,8 +114,7 @@ def shapefile_sample(lat, lon, shapefile):
     # Find ROOT folder
     root_folder = os.path.split(module_folder)[0]
 
-    # Create list to store exploded points
-    previously_selected_points = []
+    # Create list to store sampling points
     coordinates_within_polygon = []
 
     # Open shapefile
@@ -156,8 +162,9 @@ def shapefile_sample(lat, lon, shapefile):
     # Get Area of selected HUC
     supported_units = ['meter', 'meters' 'foot', 'feet', 'us feet', 'us foot', 'us_foot', 'foot_us']
     if not horizontal_units.lower() in supported_units:
-        # Transform geometry to Albers
+        # Transform geometry (and the observation point) to Albers
         selected_feature_geometry.Transform(transform_source_to_albers)
+        pt.Transform(transform_source_to_albers)
         transform_back = transform_albers_to_wgs
         # Update horizontal units
         geo_ref = selected_feature_geometry.GetSpatialReference()
@@ -188,84 +195,51 @@ def shapefile_sample(lat, lon, shapefile):
     # Calculate the Envelope (bounding box) of the selected HUC
     x_min, x_max, y_min, y_max = selected_feature_geometry.GetEnvelope()
 
-    # Announce Sampling Points
-    log.print_section('Random Sampling Point Generation Section')
-    log.Wrap('Sampling Protocol:')
-    log.Wrap(' -Latitudes and Longitudes will be randomly generated watershed polygon extremes:')
-    log.Wrap('   -Custom Watershed Coordinate Extremes (Converted to Meters for testing):')
-    log.Wrap('      -Maximum Latitude:  {}'.format(y_max))
-    log.Wrap('      -Minimum Latitude:  {}'.format(y_min))
-    log.Wrap('      -Maximum Longitude: {}'.format(x_max))
-    log.Wrap('      -MInimum Longitude: {}'.format(x_min))
-    log.Wrap(' -An OGR point geometry will be created to test each random Latitude and Longitude.')
-    log.Wrap('   -The point must fall Within the Custom Watershed provided')
-    log.Wrap('   -The point must also be at least {} mile(s) from any previously selected sampling points.'.format(sampling_point_spacing_miles))
-    log.Wrap(' -If both criteria are met, the point will be added to the list of sampling points.')
-    log.Wrap(' -When 3000 consecutive random test points fail these tests, the sampling procedure will be complete.')
-
-    # Announce protocol commencement
-    log.Wrap('')
-    log.Wrap('Generating potential sampling points and testing the above conditions...')
-    
-    # Add initially selected coordinates as the first sampling point
-    previously_selected_points.append(pt)
-    coordinates_within_polygon.append([lat, lon])
-    points_selected = 1 # Starting with observation point
-    points_tested = 1 # Starting with observation point
-    points_tested_since_last_success = 0
+    # Reuse the points stored for this watershed, spacing and seed (if any)
+    cache_key = sampling_cache.polygon_key(selected_feature_geometry)
+    initial_spacing_miles = sampling_point_spacing_miles
+    stored = sampling_cache.load_points(cache_key, initial_spacing_miles, seed)
+    if stored is not None:
+        stored_points, sampling_point_spacing_miles = stored
+        log.Wrap('Reusing {} stored sampling points (minimum spacing {} mile(s))'.format(len(stored_points), sampling_point_spacing_miles))
+        coordinates_within_polygon = sampling_cache.with_observation_point(lat, lon, stored_points, sampling_point_spacing_miles)
+    else:
+        # Announce Sampling Points
+        log.print_section('Random Sampling Point Generation Section')
+        log.Wrap('Sampling Protocol:')
+        log.Wrap(' -Points will be generated within the watershed polygon extremes:')
+        log.Wrap('   -Custom Watershed Coordinate Extremes (Converted to Meters for testing):')
+        log.Wrap('      -Maximum Latitude:  {}'.format(y_max))
+        log.Wrap('      -Minimum Latitude:  {}'.format(y_min))
+        log.Wrap('      -Maximum Longitude: {}'.format(x_max))
+        log.Wrap('      -MInimum Longitude: {}'.format(x_min))
+        log.Wrap(' -Starting from the selected coordinates, Poisson-disk sampling will add points')
+        log.Wrap('   -The point must fall Within the Custom Watershed provided')
+        log.Wrap('   -The point must also be at least {} mile(s) from any previously selected sampling points.'.format(sampling_point_spacing_miles))
+        log.Wrap(' -When {} consecutive random test points find no room for another point, the sampling procedure will be complete.'.format(CUSTOM_SEED_ATTEMPTS))
+        log.Wrap(' -If fewer than 3 points are selected, the minimum spacing will be lowered by 0.5 mile and sampling will continue.')
 
-    # Setting this to use existing structure since it is now based on 1500-attempt timeout
-    num_points = 999
-    num_points -= 1 # Subtracting for adding observation point
+        # Announce protocol commencement
+        log.Wrap('')
+        log.Wrap('Generating sampling points...')
 
-    while num_points > 0:
-        # Create a random X coordinate within the Envelope
-        test_x = random.uniform(x_min, x_max)
-        # Create a random Y coordinate within the Envelope
-        test_y = random.uniform(y_min, y_max)
-        points_tested += 1
-        points_tested_since_last_success += 1
-        test_x_round = round(test_x, 6)
-        test_y_round = round(test_y, 6)
-        if points_tested_since_last_success > 3000:
-            if num_points < 997: 
-                log.Wrap('Sampling complete (3000 consecutive points tested since the last suitable one was found).')
-                break
-            else:
-                log.Wrap('  {} points selected of {} test candidates generated.'.format(points_selected, points_tested))
-                points_tested_since_last_success = 0
-                log.Wrap('3000 points tested since the last suitable one was found.  Lowering minimum spacing by 0.5 mile.')
-                sampling_point_spacing_miles = round((sampling_point_spacing_miles - 0.5), 2)
-                if horizontal_units.lower() in ['meter', 'meters']:
-                    sampling_point_spacing = sampling_point_spacing_miles * 1609.34 # 1609.34 Meters = 1 Mi
-                elif horizontal_units.lower() in ['foot', 'feet', 'us feet', 'us foot', 'foot_us', 'us_foot']:
-                    sampling_point_spacing = sampling_point_spacing_miles * 5280 # 5280 Feet = 1 Mi
-                log.Wrap(' -Now each point must be at least {} miles(s) from all other sampling points'.format(sampling_point_spacing_miles))
-        log.print_status_message('  {} points selected of {} test candidates generated. Testing ({}, {})'.format(points_selected, points_tested, test_y_round, test_x_round))
-        # Create a blank Test Point (OGR Geometry of the type ogr.wkbPoint)
-        test_pt = ogr.Geometry(ogr.wkbPoint)
-        # Set the Test Point to the random X and Y coordinates
-        test_pt.SetPoint_2D(0, test_x, test_y)
-        # Test whether the within-envolope point is actually within the polygon
-        inside = selected_feature_geometry.Contains(test_pt)
-        if inside:
-            properly_spaced = True
-            # Test against every previously selected point for optimal spacing
-            for previous_point in previously_selected_points:
-                distance = test_pt.Distance(previous_point)
-                if distance < sampling_point_spacing:
-                    properly_spaced = False
-            # Test passed, add to all lists and reduce num_points needed
-            if properly_spaced:
-                points_tested_since_last_success = 0
-                num_points -= 1
-                points_selected += 1
-                previously_selected_points.append(test_pt)
-                [wgs_lon, wgs_lat, z] = transform_back.TransformPoint(test_x, test_y)
-                wgs_lat = round(wgs_lat, 6)
-                wgs_lon = round(wgs_lon, 6)
-                coordinates_within_polygon.append([wgs_lat, wgs_lon])
-    log.Wrap('{} sampling points selected from {} randomly generated candidates'.format(points_selected, points_tested))
+        # Initially selected coordinates are the first sampling point
+        step_down = sampling_point_spacing / sampling_point_spacing_miles * 0.5
+        sampled_points, used_spacing = sampling.sample_polygon(selected_feature_geometry,
+                                                               first_point=(pt.GetX(), pt.GetY()),
+                                                               spacing=sampling_point_spacing,
+                                                               step_down=step_down,
+                                                               seed=seed,
+                                                               seed_attempts=CUSTOM_SEED_ATTEMPTS)
+        if used_spacing < sampling_point_spacing:
+            sampling_point_spacing_miles = round(sampling_point_spacing_miles * used_spacing / sampling_point_spacing, 2)
+            log.Wrap('Too few suitable points found. Minimum spacing lowered to {} mile(s).'.format(sampling_point_spacing_miles))
+        coordinates_within_polygon.append([lat, lon])
+        if len(sampled_points) > 1:
+            for wgs_lon, wgs_lat, z in transform_back.TransformPoints(sampled_points[1:].tolist()):
+                coordinates_within_polygon.append([round(wgs_lat, 6), round(wgs_lon, 6)])
+        sampling_cache.save_points(cache_key, initial_spacing_miles, seed, coordinates_within_polygon[1:], sampling_point_spacing_miles)
+    log.Wrap('{} sampling points selected'.format(len(coordinates_within_polygon)))
     log.print_separator_line()
     return coordinates_within_polygon, huc_square_miles
 
@@ -0,0 +1,220 @@
+#  This software was developed by United States Army Corps of Engineers (USACE)
+#  employees in the course of their official duties.  USACE used copyrighted,
+#  open source code to develop this software, as such this software 
+#  (per 17 USC § 101) is considered "joint work."  Pursuant to 17 USC § 105,
+#  portions of the software developed by USACE employees in the course of their
+#  official duties are not subject to copyright protection and are in the public
+#  domain.
+#  
+#  USACE assumes no responsibility whatsoever for the use of this software by
+#  other parties, and makes no guarantees, expressed or implied, about its
+#  quality, reliability, or any other characteristic. 
+#  
+#  The software is provided "as is," without warranty of any kind, express or
+#  implied, including but not limited to the warranties of merchantability,
+#  fitness for a particular purpose, and noninfringement.  In no event shall the
+#  authors or U.S. Government be liable for any claim, damages or other
+#  liability, whether in an action of contract, tort or otherwise, arising from,
+#  out of or in connection with the software or the use or other dealings in the
+#  software.
+#  
+#  Public domain portions of this software can be redistributed and/or modified
+#  freely, provided that any derivative works bear some notice that they are
+#  derived from it, and any modified versions bear some notice that they have
+#  been modified. 
+#  
+#  Copyrighted portions of the software are annotated within the source code.
+#  Open Source Licenses, included in the source code, apply to the applicable
+#  copyrighted portions.  Copyrighted portions of the software are not in the
+#  public domain.
+
+
+
+
+######################################
+##  ------------------------------- ##
+##         dem_elevation.py         ##
+##  ------------------------------- ##
+##     Written by: Jason Deters     ##
+##  ------------------------------- ##
+##    Last Edited on: 2026-10-18    ##
+##  ------------------------------- ##
+######################################
+
+"""
+Offline elevations from local DEM GeoTIFF tiles (e.g. USGS 3DEP / NED tiles)
+placed in GIS/DEM.  Tile extents are read once into an index; points are
+grouped by tile, the smallest window covering each group is read with GDAL
+and every pixel value is picked out of it with numpy.  getElev tries this
+before the USGS Elevation Point Query Service.
+"""
+
+# Import Standard Libraries
+import os
+import glob
+import threading
+
+# Import 3rd Party Libraries
+import numpy
+import ogr
+ogr.UseExceptions()
+try:
+    import gdal
+    gdal.UseExceptions()
+except ImportError:
+    gdal = None
+
+# Find module path
+MODULE_PATH = os.path.dirname(os.path.realpath(__file__))
+# Find ROOT folder
+ROOT = os.path.split(MODULE_PATH)[0]
+
+# Import Custom Libraries
+try:
+    from . import geodesy
+except Exception:
+    import geodesy
+
+DEM_FOLDER = os.path.join(ROOT, 'GIS', 'DEM')
+TILE_PATTERNS = ['*.tif', '*.tiff', '*.TIF', '*.TIFF']
+# DEM values are meters
+UNIT_FACTORS = {'Feet': geodesy.FEET_PER_METER, 'Meters': 1.0}
+
+# Tile indexes already built in this process, by folder
+TILE_INDEXES = {}
+TILE_INDEXES_LOCK = threading.Lock()
+
+
+class DemTile(object):
+    """One GeoTIFF tile: its geotransform, no-data value and WGS84 -> tile transformation"""
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.dataset = gdal.Open(path, gdal.GA_ReadOnly)
+        self.band = self.dataset.GetRasterBand(1)
+        self.nodata = self.band.GetNoDataValue()
+        self.columns = self.dataset.RasterXSize
+        self.rows = self.dataset.RasterYSize
+        self.origin_x, self.pixel_width, rotation_x, self.origin_y, rotation_y, self.pixel_height = self.dataset.GetGeoTransform()
+        # Points only need transforming when the tile is not in geographic coordinates
+        self.ctran = None
+        tile_ref = ogr.osr.SpatialReference()
+        projection = self.dataset.GetProjection()
+        if projection:
+            tile_ref.ImportFromWkt(projection)
+            if not tile_ref.IsGeographic():
+                point_ref = ogr.osr.SpatialReference()
+                point_ref.ImportFromEPSG(4326)
+                self.ctran = ogr.osr.CoordinateTransformation(point_ref, tile_ref)
+        # WGS84 extent used to assign points to tiles
+        corners_x = [self.origin_x, self.origin_x + self.columns * self.pixel_width]
+        corners_y = [self.origin_y, self.origin_y + self.rows * self.pixel_height]
+        if self.ctran is None:
+            self.bounds = (min(corners_x), max(corners_x), min(corners_y), max(corners_y))
+        else:
+            rtran = ogr.osr.CoordinateTransformation(tile_ref, point_ref)
+            corners = rtran.TransformPoints([(x, y) for x in corners_x for y in corners_y])
+            lons = [corner[0] for corner in corners]
+            lats = [corner[1] for corner in corners]
+            self.bounds = (min(lons), max(lons), min(lats), max(lats))
+
+    def covers(self, lats, lons):
+        """Boolean array, True for points inside the tile's extent"""
+        min_lon, max_lon, min_lat, max_lat = self.bounds
+        return (lons >= min_lon) & (lons <= max_lon) & (lats >= min_lat) & (lats <= max_lat)
+
+    def pixels(self, lats, lons):
+        """Returns (rows, columns) of the pixels holding WGS84 points"""
+        if self.ctran is None:
+            xs, ys = lons, lats
+        else:
+            transformed = numpy.array(self.ctran.TransformPoints(list(zip(lons.tolist(), lats.tolist()))), dtype=float)
+            xs, ys = transformed[:, 0], transformed[:, 1]
+        columns = numpy.floor((xs - self.origin_x) / self.pixel_width).astype(numpy.int64)
+        rows = numpy.floor((ys - self.origin_y) / self.pixel_height).astype(numpy.int64)
+        return rows, columns
+
+    def read(self, lats, lons):
+        """Returns elevations (meters) for points in this tile, NaN for no-data"""
+        elevations = numpy.full(len(lats), numpy.nan)
+        rows, columns = self.pixels(lats, lons)
+        inside = (rows >= 0) & (rows < self.rows) & (columns >= 0) & (columns < self.columns)
+        if not inside.any():
+            return elevations
+        # Read only the window spanning these points
+        row_min, row_max = int(rows[inside].min()), int(rows[inside].max())
+        column_min, column_max = int(columns[inside].min()), int(columns[inside].max())
+        with self.lock:
+            window = self.band.ReadAsArray(column_min, row_min,
+                                           column_max - column_min + 1,
+                                           row_max - row_min + 1)
+        values = window[rows[inside] - row_min, columns[inside] - column_min].astype(float)
+        if self.nodata is not None:
+            values[values == self.nodata] = numpy.nan
+        elevations[inside] = values
+        return elevations
+
+
+class DemTileIndex(object):
+    """Every DEM tile in a folder, with their WGS84 extents held in numpy arrays"""
+    def __init__(self, folder=DEM_FOLDER):
+        self.folder = folder
+        paths = []
+        for pattern in TILE_PATTERNS:
+            paths.extend(glob.glob(os.path.join(folder, '**', pattern), recursive=True))
+        self.tiles = []
+        for path in sorted(set(paths)):
+            try:
+                self.tiles.append(DemTile(path))
+            except Exception:
+                # Unreadable tile, skip it
+                pass
+        self.bounds = numpy.array([tile.bounds for tile in self.tiles], dtype=float).reshape(-1, 4)  # min_lon, max_lon, min_lat, max_lat
+
+    def elevations(self, lats, lons, units='Feet'):
+        """Returns an array of elevations for WGS84 points (NaN where no tile has a value)"""
+        lats = numpy.atleast_1d(numpy.asarray(lats, dtype=float))
+        lons = numpy.atleast_1d(numpy.asarray(lons, dtype=float))
+        elevations = numpy.full(len(lats), numpy.nan)
+        if not len(lats):
+            return elevations
+        # Only tiles overlapping the points' extent
+        bounds = self.bounds
+        overlapping = numpy.flatnonzero((bounds[:, 0] <= lons.max()) & (bounds[:, 1] >= lons.min()) &
+                                        (bounds[:, 2] <= lats.max()) & (bounds[:, 3] >= lats.min()))
+        for position in overlapping:
+            tile = self.tiles[position]
+            remaining = numpy.isnan(elevations)
+            if not remaining.any():
+                break
+            todo = numpy.flatnonzero(remaining & tile.covers(lats, lons))
+            if len(todo):
+                elevations[todo] = tile.read(lats[todo], lons[todo])
+        return elevations * UNIT_FACTORS.get(units, 1.0)
+
+
+def get_tile_index(folder=DEM_FOLDER):
+    """Returns the process-wide DemTileIndex for a folder, or None if GDAL or the tiles are missing"""
+    if gdal is None or not os.path.isdir(folder):
+        return None
+    with TILE_INDEXES_LOCK:
+        index = TILE_INDEXES.get(folder)
+        if index is None:
+            index = DemTileIndex(folder)
+            TILE_INDEXES[folder] = index
+    if not index.tiles:
+        return None
+    return index
+
+
+def elevations(coordinates, units='Feet', folder=DEM_FOLDER):
+    """Returns elevations for [lat, lon] pairs from local DEM tiles (None where unavailable)
+
+    Returns None altogether when there are no usable tiles.
+    """
+    index = get_tile_index(folder)
+    if index is None or not len(coordinates):
+        return None
+    coordinates = numpy.asarray(coordinates, dtype=float).reshape(-1, 2)
+    values = index.elevations(coordinates[:, 0], coordinates[:, 1], units=units)
+    return [None if numpy.isnan(value) else round(float(value), 3) for value in values]
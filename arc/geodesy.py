@@ -0,0 +1,110 @@
+#  This software was developed by United States Army Corps of Engineers (USACE)
+#  employees in the course of their official duties.  USACE used copyrighted,
+#  open source code to develop this software, as such this software 
+#  (per 17 USC § 101) is considered "joint work."  Pursuant to 17 USC § 105,
+#  portions of the software developed by USACE employees in the course of their
+#  official duties are not subject to copyright protection and are in the public
+#  domain.
+#  
+#  USACE assumes no responsibility whatsoever for the use of this software by
+#  other parties, and makes no guarantees, expressed or implied, about its
+#  quality, reliability, or any other characteristic. 
+#  
+#  The software is provided "as is," without warranty of any kind, express or
+#  implied, including but not limited to the warranties of merchantability,
+#  fitness for a particular purpose, and noninfringement.  In no event shall the
+#  authors or U.S. Government be liable for any claim, damages or other
+#  liability, whether in an action of contract, tort or otherwise, arising from,
+#  out of or in connection with the software or the use or other dealings in the
+#  software.
+#  
+#  Public domain portions of this software can be redistributed and/or modified
+#  freely, provided that any derivative works bear some notice that they are
+#  derived from it, and any modified versions bear some notice that they have
+#  been modified. 
+#  
+#  Copyrighted portions of the software are annotated within the source code.
+#  Open Source Licenses, included in the source code, apply to the applicable
+#  copyrighted portions.  Copyrighted portions of the software are not in the
+#  public domain.
+
+
+
+
+######################################
+##  ------------------------------- ##
+##            geodesy.py            ##
+##  ------------------------------- ##
+##     Written by: Jason Deters     ##
+##  ------------------------------- ##
+##    Last Edited on: 2026-10-18    ##
+##  ------------------------------- ##
+######################################
+
+"""
+Vectorized station / point relationship calculations.
+Distances match geopy.distance.great_circle (same formula and earth radius)
+and rounding is done with Python's round() on each value, so results are
+identical to the previous per-station scalar calculations.
+"""
+
+# Import 3rd Party Libraries
+import numpy
+
+EARTH_RADIUS_KM = 6371.009      # Mean radius used by geopy.distance.great_circle
+KM_PER_MILE = 1.609344
+FEET_PER_METER = 3.28084
+
+
+def great_circle_miles(lat1, lon1, lat2, lon2):
+    """Vectorized equivalent of geopy.distance.great_circle(...).miles (inputs broadcast)"""
+    lat1 = numpy.radians(numpy.asarray(lat1, dtype=float))
+    lon1 = numpy.radians(numpy.asarray(lon1, dtype=float))
+    lat2 = numpy.radians(numpy.asarray(lat2, dtype=float))
+    lon2 = numpy.radians(numpy.asarray(lon2, dtype=float))
+    sin_lat1, cos_lat1 = numpy.sin(lat1), numpy.cos(lat1)
+    sin_lat2, cos_lat2 = numpy.sin(lat2), numpy.cos(lat2)
+    delta_lon = lon2 - lon1
+    cos_delta_lon, sin_delta_lon = numpy.cos(delta_lon), numpy.sin(delta_lon)
+    d = numpy.arctan2(numpy.sqrt((cos_lat2 * sin_delta_lon) ** 2 +
+                                 (cos_lat1 * sin_lat2 - sin_lat1 * cos_lat2 * cos_delta_lon) ** 2),
+                      sin_lat1 * sin_lat2 + cos_lat1 * cos_lat2 * cos_delta_lon)
+    return (EARTH_RADIUS_KM * d) / KM_PER_MILE
+
+
+def distance_matrix(points, station_coords):
+    """Returns an (M points x N stations) array of great-circle distances in miles"""
+    points = numpy.asarray(points, dtype=float).reshape(-1, 2)
+    station_coords = numpy.asarray(station_coords, dtype=float).reshape(-1, 2)
+    return great_circle_miles(points[:, 0][:, None],
+                              points[:, 1][:, None],
+                              station_coords[:, 0][None, :],
+                              station_coords[:, 1][None, :])
+
+
+def elevation_differences(point_elevations, station_elevations):
+    """Returns an (M points x N stations) array of absolute elevation differences"""
+    point_elevations = numpy.asarray(point_elevations, dtype=float).reshape(-1)
+    station_elevations = numpy.asarray(station_elevations, dtype=float).reshape(-1)
+    return numpy.abs(point_elevations[:, None] - station_elevations[None, :])
+
+
+def weighted_difference(distance, elevDiff):
+    """Station ranking metric (works on scalars or arrays)"""
+    return distance * ((elevDiff / 1000) + 0.45)
+
+
+def round_values(values, ndigits=3):
+    """Rounds every element with Python's round() (numpy.round can differ in the last digit)"""
+    values = numpy.asarray(values, dtype=float)
+    rounded = [round(value, ndigits) for value in values.ravel().tolist()]
+    return numpy.array(rounded, dtype=float).reshape(values.shape)
+
+
+if __name__ == '__main__':
+    DISTANCES = round_values(distance_matrix(points=[[38.5, -121.5], [38.6, -121.4]],
+                                             station_coords=[[38.55, -121.45], [39.0, -122.0]]))
+    ELEV_DIFFS = round_values(elevation_differences(point_elevations=[30.0, 45.0],
+                                                    station_elevations=[25.0, 300.0]))
+    print(DISTANCES)
+    print(round_values(weighted_difference(DISTANCES, ELEV_DIFFS)))
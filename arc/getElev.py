@@ -34,7 +34,7 @@
 ##  ------------------------------- ##
 ##     Written by: Jason Deters     ##
 ##  ------------------------------- ##
-## Last Edited on:  11-Apr-2018     ##
+## Last Edited on:  18-Oct-2026     ##
 ##  ------------------------------- ##
 ######################################
 
@@ -43,11 +43,14 @@ import time
 import os
 import sys
 import traceback
+import threading
+import concurrent.futures
 
 # Import 3rd Party Libraries
 import json
 import urllib3
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 
 # Find module path
@@ -57,8 +60,9 @@ ROOT = os.path.split(MODULE_PATH)[0]
 
 # Import Custom Libraries
 try:
+    from . import dem_elevation
     from .utilities import JLog
-    from .utilities import selenium_operations
+    from .utilities import key_value_store
 except Exception:
     # Reverse compatibility step - Add utilities folder to path directly
     PYTHON_SCRIPTS_FOLDER = os.path.join(ROOT, 'Python Scripts')
@@ -71,10 +75,53 @@ except Exception:
         UTILITIES_FOLDER = os.path.join(ARC_FOLDER, 'utilities')
         sys.path.append(UTILITIES_FOLDER)
     import JLog
-    import selenium_operations
+    import key_value_store
+    import dem_elevation
+# Web-browser automation fallback (needs selenium and win32api)
+try:
+    from .utilities import selenium_operations
+except Exception:
+    try:
+        import selenium_operations
+    except Exception:
+        selenium_operations = None
 
 L = JLog.PrintLog()
 
+# Permanent elevation cache (elevations don't change, so entries never expire)
+ELEVATION_CACHE_PATH = os.path.join(ROOT, 'cached', 'elevations.sqlite')
+COORDINATE_DECIMALS = 5     # ~1 m
+ELEVATION_WORKERS = 8       # Concurrent EPQS requests in batch()
+FAILED_ELEVATION = "-1000000"   # USGS Server's fail code
+
+# Pooled connections shared by the batch worker threads
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=ELEVATION_WORKERS, pool_maxsize=ELEVATION_WORKERS))
+ELEVATION_STORE = None
+ELEVATION_STORE_LOCK = threading.Lock()
+
+
+def get_elevation_store():
+    """Returns the process-wide elevation cache, opening it on first use"""
+    global ELEVATION_STORE
+    with ELEVATION_STORE_LOCK:
+        if ELEVATION_STORE is None:
+            ELEVATION_STORE = key_value_store.KeyValueStore(ELEVATION_CACHE_PATH, table='elevations')
+        return ELEVATION_STORE
+
+
+def cache_key(lat, lon, units='Feet'):
+    """Elevation cache key for rounded coordinates"""
+    return '{},{},{}'.format(round(float(lat), COORDINATE_DECIMALS), round(float(lon), COORDINATE_DECIMALS), units)
+
+
+def is_valid(elevation):
+    """False for missing elevations and the USGS fail code"""
+    try:
+        return float(elevation) > float(FAILED_ELEVATION)
+    except (TypeError, ValueError):
+        return False
+
 def get_json_multiple_ways(url):
     """Tries to pull JSON data from a URL using urllib3 first and then requests"""
     log = JLog.PrintLog()
@@ -89,16 +136,14 @@ def get_json_multiple_ways(url):
     # Try Requests module
     try:
         log.print_status_message('Querying {}...'.format(base_url))
-        content = requests.get(url, timeout=15)
-        time.sleep(.5)
+        content = SESSION.get(url, timeout=15)
         while temp_unavailable_message in content.text:
             del content
             unavailable_error_count += 1
             log.Write('     USGS SERVER:  "{}"'.format(temp_unavailable_message))
             log.print_status_message('     Retrying query of {}...'.format(base_url))
             time.sleep(unavailable_error_count)
-            content = requests.get(url)
-            time.sleep(unavailable_error_count)
+            content = SESSION.get(url, timeout=15)
             if unavailable_error_count > 4:
                 unavailable_error_count = 0
                 break
@@ -110,7 +155,6 @@ def get_json_multiple_ways(url):
         log.print_status_message('Querying {}...'.format(base_url))
         http = urllib3.PoolManager(cert_reqs='CERT_REQUIRED')
         response = http.request('GET', url)
-        time.sleep(1)
         string_data = str(response.data, 'utf-8')
         while temp_unavailable_message in string_data:
             del response
@@ -151,49 +195,21 @@ def checkUSA(lat, lon):
         inUSA = False
     return inUSA
 
-def elevUSGS_nationalmap(lat, lon, units='Feet', batch=False):
-    url = u'https://nationalmap.gov/epqs/pqs.php?x={}&y={}&output=json&units={}'.format(lon, lat, units)
-    # Pre-set Elevation to USGS Server's fail code
-    elevation = "-1000000"
-    # Get JSON format text from url Body
-    if not batch:
-        L.Wrap('Request URL: {}'.format(url))
-    # Attempting to use standard requests style OR urllib2 module
-    for x in range(3):
-        seconds = ((x+1)*3)
-        try:
-            json_result = get_json_multiple_ways(url)
-            service = json_result['USGS_Elevation_Point_Query_Service']
-            query = service['Elevation_Query']
-            elevation = query['Elevation']
-            return elevation
-        except Exception:
-            if x < 2:
-                L.Wrap('  Attempt {} failed, trying again in 1 second...'.format((x+1)))
-                time.sleep(1)
-            else:
-                L.Wrap('  Attempt {} failed.'.format((x+1)))
-    # Try Selenium Requests Method if Requests fails
-    L.Wrap('---Urllib3 and Requests Modules Failed----')
-    L.Wrap('Attempting to collect the data through web-browser automation...')
-    instance = selenium_operations.getJSON(url)
-    json_result = instance()
-    # Switch to manual entry if web requests are not working
-    service = json_result['USGS_Elevation_Point_Query_Service']
-    query = service['Elevation_Query']
-    elevation = query['Elevation']
-    return elevation
+def epqs_url(lat, lon, units='Feet', epqs_variant='nationalmap'):
+    """Builds the USGS Elevation Point Query Service URL for a point"""
+    if epqs_variant == 'ned':
+        return u'https://ned.usgs.gov/epqs/pqs.php?x={}&y={}&units={}&output=json'.format(lon, lat, units)
+    return u'https://nationalmap.gov/epqs/pqs.php?x={}&y={}&output=json&units={}'.format(lon, lat, units)
 
-def elevUSGS_ned(lat, lon, units='Feet', batch=False):
-    url = u'https://ned.usgs.gov/epqs/pqs.php?x={}&y={}&units={}&output=json'.format(lon, lat, units)
+def query_epqs(url, batch=False, browser_fallback=True):
+    """Queries an EPQS URL (3 attempts), then through web-browser automation if browser_fallback"""
     # Pre-set Elevation to USGS Server's fail code
-    elevation = "-1000000"
+    elevation = FAILED_ELEVATION
     # Get JSON format text from url Body
     if not batch:
         L.Wrap('Request URL: {}'.format(url))
     # Attempting to use standard requests style OR urllib2 module
     for x in range(3):
-        seconds = ((x+1)*3)
         try:
             json_result = get_json_multiple_ways(url)
             service = json_result['USGS_Elevation_Point_Query_Service']
@@ -206,9 +222,21 @@ def elevUSGS_ned(lat, lon, units='Feet', batch=False):
                 time.sleep(1)
             else:
                 L.Wrap('  Attempt {} failed.'.format((x+1)))
+    if not browser_fallback:
+        return elevation
+    return query_epqs_browser(url)
+
+def require_browser_automation():
+    """Raises if the web-browser automation fallback can't be used on this system"""
+    if selenium_operations is None:
+        raise RuntimeError('Web-browser automation (selenium_operations) is not available on this system')
+
+def query_epqs_browser(url):
+    """Collects EPQS JSON through web-browser automation (not thread-safe)"""
     # Try Selenium Requests Method if Requests fails
     L.Wrap('---Urllib3 and Requests Modules Failed----')
     L.Wrap('Attempting to collect the data through web-browser automation...')
+    require_browser_automation()
     instance = selenium_operations.getJSON(url)
     json_result = instance()
     # Switch to manual entry if web requests are not working
@@ -217,38 +245,110 @@ def elevUSGS_ned(lat, lon, units='Feet', batch=False):
     elevation = query['Elevation']
     return elevation
 
-def main(lat, lon, units='Feet', epqs_variant='nationalmap'):
+def elevUSGS_nationalmap(lat, lon, units='Feet', batch=False, browser_fallback=True):
+    url = epqs_url(lat, lon, units=units, epqs_variant='nationalmap')
+    return query_epqs(url, batch=batch, browser_fallback=browser_fallback)
+
+def elevUSGS_ned(lat, lon, units='Feet', batch=False, browser_fallback=True):
+    url = epqs_url(lat, lon, units=units, epqs_variant='ned')
+    return query_epqs(url, batch=batch, browser_fallback=browser_fallback)
+
+def main(lat, lon, units='Feet', epqs_variant='nationalmap', use_dem=True):
     L.Wrap('Querying Elevation at Observation Point ({}, {})...'.format(lat, lon))
 #    in_usa = checkUSA(lat, lon)
 #    if in_usa is True:
 #        L.Wrap('Point is within USA boundary. Using USGS Elevation Query Service...')
-    if epqs_variant == 'nationalmap':
-        elevation = elevUSGS_nationalmap(lat, lon)
-    elif epqs_variant == 'ned':
-        elevation = elevUSGS_ned(lat, lon)
-    if elevation == "-1000000":
-        L.Wrap('USGS Elevation Querry Failed. Using https://www.freemaptools.com/elevation-finder.htm...')
-        elevation = selenium_operations.global_elev_query(lat, lon)
+    store = get_elevation_store()
+    key = cache_key(lat, lon, units)
+    elevation = store.get(key)
+    if elevation is not None:
+        L.Wrap('Elevation found in local cache')
+    elif use_dem:
+        dem_elevations = dem_elevation.elevations([[lat, lon]], units=units)
+        if dem_elevations is not None and dem_elevations[0] is not None:
+            elevation = dem_elevations[0]
+            L.Wrap('Elevation read from local DEM tiles')
+    if elevation is None:
+        # USGS Elevation Point Query Service, then web-browser automation
+        if epqs_variant == 'nationalmap':
+            elevation = elevUSGS_nationalmap(lat, lon, units=units)
+        elif epqs_variant == 'ned':
+            elevation = elevUSGS_ned(lat, lon, units=units)
+        if elevation == FAILED_ELEVATION:
+            L.Wrap('USGS Elevation Querry Failed. Using https://www.freemaptools.com/elevation-finder.htm...')
+            require_browser_automation()
+            elevation = selenium_operations.global_elev_query(lat, lon)
+        if is_valid(elevation):
+            store.put(key, float(elevation))
     L.Wrap('-------------------------------')
     L.Wrap('Elevation = {} {}'.format(elevation, units))
     L.Wrap('-------------------------------')
     return float(elevation)
 
-def batch(list_of_coords, units='Feet', epqs_variant='nationalmap'):
+def batch(list_of_coords, units='Feet', epqs_variant='nationalmap', workers=ELEVATION_WORKERS, use_dem=True):
+    """Returns {'lat,lon': elevation} for each coordinate pair
+
+    Cached elevations are used without any network access, then local DEM
+    tiles (if any) are read for the rest, the remainder is queried from EPQS
+    by a pool of worker threads, and points the service could not answer
+    fall back to browser automation one at a time.
+    """
     sampling_point_elevations = dict()
     L.print_section('Querying USGS Elevation Service for each Watershed Sampling Point')
+    store = get_elevation_store()
+    keys = [cache_key(coords[0], coords[1], units) for coords in list_of_coords]
+    elevations = store.get_many(set(keys))
+    # Query each uncached point once
+    to_query = {}
+    for key, coords in zip(keys, list_of_coords):
+        if key not in elevations and key not in to_query:
+            to_query[key] = coords
+    if to_query and use_dem:
+        dem_elevations = dem_elevation.elevations(list(to_query.values()), units=units)
+        if dem_elevations is not None:
+            from_dem = {key: elevation for key, elevation in zip(list(to_query), dem_elevations) if elevation is not None}
+            if from_dem:
+                L.Wrap('{} elevations read from local DEM tiles'.format(len(from_dem)))
+            elevations.update(from_dem)
+            for key in from_dem:
+                del to_query[key]
+    if to_query:
+        num_points = len(set(keys))
+        L.Wrap('{} of {} elevations found locally. Querying the rest from EPQS ({} workers)...'.format(num_points - len(to_query), num_points, workers))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+            for key, coords in to_query.items():
+                url = epqs_url(coords[0], coords[1], units=units, epqs_variant=epqs_variant)
+                futures[key] = executor.submit(query_epqs, url, True, False)
+            queried = {}
+            for key, future in futures.items():
+                try:
+                    queried[key] = future.result()
+                except Exception:
+                    queried[key] = FAILED_ELEVATION
+        # Browser automation can't be shared between threads
+        for key, elevation in queried.items():
+            if is_valid(elevation):
+                continue
+            lat, lon = to_query[key][0], to_query[key][1]
+            url = epqs_url(lat, lon, units=units, epqs_variant=epqs_variant)
+            try:
+                elevation = query_epqs_browser(url)
+            except Exception:
+                elevation = FAILED_ELEVATION
+            if elevation == FAILED_ELEVATION:
+                L.Wrap('USGS Elevation Querry Failed. Using https://www.freemaptools.com/elevation-finder.htm...')
+                require_browser_automation()
+                elevation = selenium_operations.global_elev_query(lat, lon)
+            queried[key] = elevation
+        store.put_many({key: float(elevation) for key, elevation in queried.items() if is_valid(elevation)})
+        elevations.update(queried)
     sp_num = 0
-    for coords in list_of_coords:
+    for key, coords in zip(keys, list_of_coords):
         sp_num += 1
         lat = coords[0]
         lon = coords[1]
-        if epqs_variant == 'nationalmap':
-            elevation = elevUSGS_nationalmap(lat, lon, batch=True)
-        elif epqs_variant == 'ned':
-            elevation = elevUSGS_ned(lat, lon, batch=True)
-        if elevation == "-1000000":
-            L.Wrap('USGS Elevation Querry Failed. Using https://www.freemaptools.com/elevation-finder.htm...')
-            elevation = selenium_operations.global_elev_query(lat, lon)
+        elevation = elevations[key]
         L.Wrap('Watershed Sampling Point {} - ({}, {}) - Elevation = {} {}'.format(sp_num, lat, lon, elevation, units))
         dict_key = '{},{}'.format(lat, lon)
         sampling_point_elevations[dict_key] = elevation
@@ -35,11 +35,12 @@
 ##  ------------------------------- ##
 ##     Written by: Jason Deters     ##
 ##  ------------------------------- ##
-##    Last Edited on: 2020-06-22    ##
+##    Last Edited on: 2026-10-18    ##
 ##  ------------------------------- ##
 ######################################
 
 import os
+import sqlite3
 
 try:
     from . import get_files
@@ -150,10 +151,27 @@ def ensure_climdiv_folder():
                                     local_file_path=local_file_path,
                                     extract_path=gis_folder)
 
+def wimp_store_has_rows(wimp_store_path):
+    """Returns True if the WebWIMP store exists and holds at least one result"""
+    if not os.path.exists(wimp_store_path):
+        return False
+    try:
+        connection = sqlite3.connect(wimp_store_path, timeout=30)
+        try:
+            row = connection.execute('SELECT 1 FROM wimp LIMIT 1').fetchone()
+        finally:
+            connection.close()
+    except Exception:
+        return False
+    return row is not None
+
 def ensure_WIMP():
     wimp_folder = os.path.join(ROOT_FOLDER, 'cached')
     wimp_path = os.path.join(wimp_folder, 'wimp_dict.pickle')
-    wimp_path_exists = os.path.exists(wimp_path)
+    # The pickle is moved into wimp.sqlite the first time WimpScraper runs
+    # (which creates the store empty if there is no pickle to move)
+    wimp_store_path = os.path.join(wimp_folder, 'wimp.sqlite')
+    wimp_path_exists = os.path.exists(wimp_path) or wimp_store_has_rows(wimp_store_path)
     if not wimp_path_exists:
         local_file_path = os.path.join(wimp_folder, 'WebWimpcache.zip')
         try:
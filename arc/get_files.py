@@ -156,7 +156,7 @@ def ensure_file_exists(file_url, local_file_path, local_check_file=None,
             os.makedirs(download_dir)
         except Exception:
             pass
-        dl_start = time.clock()
+        dl_start = time.time()
         # Streaming with requests module
         num_bytes = 0
         count = 0
@@ -239,7 +239,7 @@ def get_only_newer_version(file_url, local_file_path, local_check_file=None,
             os.makedirs(download_dir)
         except Exception:
             pass
-        dl_start = time.clock()
+        dl_start = time.time()
         # Streaming with requests module
         num_bytes = 0
         count = 0
@@ -0,0 +1,304 @@
+#  This software was developed by United States Army Corps of Engineers (USACE)
+#  employees in the course of their official duties.  USACE used copyrighted,
+#  open source code to develop this software, as such this software 
+#  (per 17 USC § 101) is considered "joint work."  Pursuant to 17 USC § 105,
+#  portions of the software developed by USACE employees in the course of their
+#  official duties are not subject to copyright protection and are in the public
+#  domain.
+#  
+#  USACE assumes no responsibility whatsoever for the use of this software by
+#  other parties, and makes no guarantees, expressed or implied, about its
+#  quality, reliability, or any other characteristic. 
+#  
+#  The software is provided "as is," without warranty of any kind, express or
+#  implied, including but not limited to the warranties of merchantability,
+#  fitness for a particular purpose, and noninfringement.  In no event shall the
+#  authors or U.S. Government be liable for any claim, damages or other
+#  liability, whether in an action of contract, tort or otherwise, arising from,
+#  out of or in connection with the software or the use or other dealings in the
+#  software.
+#  
+#  Public domain portions of this software can be redistributed and/or modified
+#  freely, provided that any derivative works bear some notice that they are
+#  derived from it, and any modified versions bear some notice that they have
+#  been modified. 
+#  
+#  Copyrighted portions of the software are annotated within the source code.
+#  Open Source Licenses, included in the source code, apply to the applicable
+#  copyrighted portions.  Copyrighted portions of the software are not in the
+#  public domain.
+
+
+
+######################################
+##  ------------------------------- ##
+##          ghcn_store.py           ##
+##  ------------------------------- ##
+##     Written by: Jason Deters     ##
+##  ------------------------------- ##
+##    Last Edited on: 2026-10-18    ##
+##  ------------------------------- ##
+######################################
+
+"""
+Local columnar store of NOAA GHCN-Daily station records.
+Each station's fixed-width ".dly" file is parsed once into date-indexed
+float32 arrays (one per element) plus a flags column and saved as a binary
+file in the cached folder.  Later refreshes only re-parse the most recent
+months of the ".dly" source, and loads involve no text parsing at all.
+"""
+
+# Import Standard Libraries
+import os
+import sys
+import json
+import time
+
+# Import 3rd Party Libraries
+import numpy
+import pandas
+import requests
+
+# Find module path
+MODULE_PATH = os.path.dirname(os.path.realpath(__file__))
+# Find ROOT folder
+ROOT = os.path.split(MODULE_PATH)[0]
+
+# Import Custom Libraries
+try:
+    from .utilities import JLog
+except Exception:
+    # Reverse compatibility step - Add utilities folder to path directly
+    PYTHON_SCRIPTS_FOLDER = os.path.join(ROOT, 'Python Scripts')
+    TEST = os.path.exists(PYTHON_SCRIPTS_FOLDER)
+    if TEST:
+        UTILITIES_FOLDER = os.path.join(PYTHON_SCRIPTS_FOLDER, 'utilities')
+        sys.path.append(UTILITIES_FOLDER)
+    else:
+        ARC_FOLDER = os.path.join(ROOT, 'arc')
+        UTILITIES_FOLDER = os.path.join(ARC_FOLDER, 'utilities')
+        sys.path.append(UTILITIES_FOLDER)
+    import JLog
+
+# Store settings
+STORE_FOLDER = os.path.join(ROOT, 'cached', 'ghcn_store')
+STORE_VERSION = 1
+BASE_URL = 'https://www1.ncdc.noaa.gov/pub/data/ghcn/daily/all'
+ELEMENTS = ['PRCP', 'SNOW', 'SNWD']
+MISSING_VALUE = -9999
+REFRESH_HOURS = 12      # Skip the server entirely if checked more recently than this
+OVERLAP_MONTHS = 3      # Recent months re-parsed on each refresh (NOAA revises recent data)
+FULL_PARSE_DAYS = 90    # Re-parse the whole file periodically to catch historical QC changes
+
+# Fixed-width layout of a GHCN-Daily ".dly" line (see readme.txt on NOAA's server)
+DLY_LINE_LENGTH = 269
+DLY_DTYPE = numpy.dtype([('id', 'S11'),
+                         ('year', 'S4'),
+                         ('month', 'S2'),
+                         ('element', 'S4'),
+                         ('days', [('value', 'S5'), ('flags', 'S3')], (31,))])
+
+
+def ensure_dir(folder):
+    """Ensures entire directory structure given exists"""
+    try:
+        os.makedirs(folder)
+    except Exception:
+        pass
+# End of ensure_dir function
+
+def store_path(station_id):
+    """Returns the path of the columnar store file for a given station"""
+    return os.path.join(STORE_FOLDER, '{}.npz'.format(station_id))
+
+def parse_dly(dly_bytes, elements=None, since_month=None):
+    """
+    Parses the contents of a GHCN-Daily ".dly" file into columnar arrays.
+    Only lines for the selected elements (and, if since_month (YYYYMM int) is
+    given, only lines for that month or later) are converted; the others are
+    skipped by their YEAR/MONTH/ELEMENT columns before any field is decoded.
+    Returns {element: (start_date (datetime64[D]), values (float32), flags (S3))}
+    """
+    # YEAR and MONTH (bytes 11-17) compare in date order as "YYYYMM" bytes
+    since_bytes = None if since_month is None else '{:06d}'.format(int(since_month)).encode()
+    element_bytes = None if elements is None else set(element.encode() for element in elements)
+    lines = [line.ljust(DLY_LINE_LENGTH)[:DLY_LINE_LENGTH] for line in dly_bytes.splitlines()
+             if (since_bytes is None or line[11:17] >= since_bytes)
+             and (element_bytes is None or line[17:21] in element_bytes)
+             and line.strip()]
+    if not lines:
+        return {}
+    records = numpy.frombuffer(b''.join(lines), dtype=DLY_DTYPE)
+    parsed = {}
+    for element in numpy.unique(records['element']):
+        element_name = element.decode()
+        element_records = records[records['element'] == element]
+        # Calculate the first day of each record's month
+        month_strings = numpy.char.add(numpy.char.add(element_records['year'], b'-'), element_records['month'])
+        month_starts = month_strings.astype(str).astype('datetime64[M]')
+        first_days = month_starts.astype('datetime64[D]')
+        days_in_month = ((month_starts + 1).astype('datetime64[D]') - first_days).astype(numpy.int64)
+        start_date = first_days.min()
+        end_date = (month_starts.max() + 1).astype('datetime64[D]')
+        # Scatter every valid day into a contiguous daily array
+        num_days = int((end_date - start_date).astype(numpy.int64))
+        values = numpy.full(num_days, numpy.nan, dtype=numpy.float32)
+        flags = numpy.full(num_days, b'   ', dtype='S3')
+        day_numbers = numpy.arange(31)
+        valid_days = day_numbers[numpy.newaxis, :] < days_in_month[:, numpy.newaxis]
+        positions = (first_days - start_date).astype(numpy.int64)[:, numpy.newaxis] + day_numbers[numpy.newaxis, :]
+        raw_values = element_records['days']['value'].astype(numpy.int32)
+        raw_values = numpy.where(raw_values == MISSING_VALUE, numpy.nan, raw_values).astype(numpy.float32)
+        values[positions[valid_days]] = raw_values[valid_days]
+        flags[positions[valid_days]] = element_records['days']['flags'][valid_days]
+        parsed[element_name] = (start_date, values, flags)
+    return parsed
+
+def splice_columns(old_column, new_column):
+    """Overwrites the tail of an existing column with a newer partial column"""
+    old_start, old_values, old_flags = old_column
+    new_start, new_values, new_flags = new_column
+    start_date = min(old_start, new_start)
+    old_end = old_start + len(old_values)
+    new_end = new_start + len(new_values)
+    end_date = max(old_end, new_end)
+    num_days = int((end_date - start_date).astype(numpy.int64))
+    values = numpy.full(num_days, numpy.nan, dtype=numpy.float32)
+    flags = numpy.full(num_days, b'   ', dtype='S3')
+    offset = int((old_start - start_date).astype(numpy.int64))
+    values[offset:offset + len(old_values)] = old_values
+    flags[offset:offset + len(old_flags)] = old_flags
+    offset = int((new_start - start_date).astype(numpy.int64))
+    # Everything from the start of the new column on is authoritative
+    values[offset:] = numpy.nan
+    flags[offset:] = b'   '
+    values[offset:offset + len(new_values)] = new_values
+    flags[offset:offset + len(new_flags)] = new_flags
+    return start_date, values, flags
+
+def read_store(station_id):
+    """Loads a station's columnar store. Returns (meta, columns) or (None, {})"""
+    path = store_path(station_id)
+    if not os.path.exists(path):
+        return None, {}
+    try:
+        with numpy.load(path) as store:
+            meta = json.loads(str(store['meta']))
+            if meta.get('version') != STORE_VERSION:
+                return None, {}
+            columns = {}
+            for element in meta['elements']:
+                columns[element] = (numpy.datetime64(str(store['{}_start'.format(element)]), 'D'),
+                                    store['{}_values'.format(element)],
+                                    store['{}_flags'.format(element)])
+        return meta, columns
+    except Exception:
+        return None, {}
+
+def write_store(station_id, meta, columns):
+    """Atomically saves a station's columnar store"""
+    ensure_dir(STORE_FOLDER)
+    meta = dict(meta)
+    meta['version'] = STORE_VERSION
+    meta['elements'] = sorted(columns)
+    arrays = {'meta': numpy.array(json.dumps(meta))}
+    for element, (start_date, values, flags) in columns.items():
+        arrays['{}_start'.format(element)] = numpy.array(str(start_date))
+        arrays['{}_values'.format(element)] = values
+        arrays['{}_flags'.format(element)] = flags
+    path = store_path(station_id)
+    temp_path = '{}.{}.tmp'.format(path, os.getpid())
+    with open(temp_path, 'wb') as handle:
+        numpy.savez(handle, **arrays)
+    os.replace(temp_path, path)
+
+def refresh_station(station_id, meta, columns, session=None):
+    """
+    Conditionally downloads a station's ".dly" file and folds any new data into
+    its columns.  Only months at or after the last stored month (minus a short
+    overlap) are parsed, unless a full parse is due.
+    """
+    log = JLog.PrintLog()
+    http = requests if session is None else session
+    url = '{}/{}.dly'.format(BASE_URL, station_id)
+    headers = {}
+    if meta is not None and meta.get('last_modified') is not None:
+        headers['If-Modified-Since'] = meta['last_modified']
+    response = http.get(url, headers=headers, timeout=60)
+    now = time.time()
+    if response.status_code == 304:
+        # Unchanged - record the check so the next refresh waits refresh_hours again
+        meta['checked'] = now
+        write_store(station_id, meta, columns)
+        return meta, columns
+    response.raise_for_status()
+    full_parse = meta is None or not columns
+    if not full_parse:
+        full_parse = (now - meta.get('full_parse', 0)) > (FULL_PARSE_DAYS * 86400)
+    if full_parse:
+        columns = parse_dly(response.content, elements=ELEMENTS)
+        meta = {'full_parse': now}
+    else:
+        last_month = max(start + len(values) for start, values, flags in columns.values())
+        last_month = (last_month - 1).astype('datetime64[M]') - OVERLAP_MONTHS
+        since_month = int(str(last_month).replace('-', ''))
+        new_columns = parse_dly(response.content, elements=ELEMENTS, since_month=since_month)
+        for element, new_column in new_columns.items():
+            if element in columns:
+                columns[element] = splice_columns(columns[element], new_column)
+            else:
+                # First data for this element - needs the whole history
+                columns[element] = parse_dly(response.content, elements=[element])[element]
+        log.Write('  {} - Parsed records since {}'.format(station_id, last_month))
+    meta['last_modified'] = response.headers.get('Last-Modified')
+    meta['checked'] = now
+    write_store(station_id, meta, columns)
+    return meta, columns
+
+def get_station_columns(station_id, refresh_hours=REFRESH_HOURS, session=None):
+    """
+    Returns {element: (start_date, values, flags)} for a station, refreshing
+    the local store from NOAA's server only when it is older than refresh_hours.
+    """
+    meta, columns = read_store(station_id)
+    if meta is not None and (time.time() - meta.get('checked', 0)) < (refresh_hours * 3600):
+        return columns
+    try:
+        meta, columns = refresh_station(station_id, meta, columns, session=session)
+    except Exception:
+        # Fall back to the previously stored data if the server is unavailable
+        if not columns:
+            raise
+    return columns
+
+def column_to_dataframe(column):
+    """Converts a stored column into a DataFrame with a daily DatetimeIndex"""
+    start_date, values, flags = column
+    index = pandas.date_range(start=str(start_date), periods=len(values), freq='D')
+    return pandas.DataFrame({'value': values.astype(numpy.float64),
+                             'flags': flags.astype(str)},
+                            index=index)
+
+def get_data(station_id, elements=None, refresh_hours=REFRESH_HOURS, session=None):
+    """
+    Drop-in replacement for ulmo.ncdc.ghcn_daily.get_data(as_dataframe=True).
+    Returns {element: DataFrame(value, flags)} for the selected elements.
+    """
+    if isinstance(elements, str):
+        elements = [elements]
+    columns = get_station_columns(station_id, refresh_hours=refresh_hours, session=session)
+    data = {}
+    for element, column in columns.items():
+        if elements is None or element in elements:
+            data[element] = column_to_dataframe(column)
+    return data
+
+
+if __name__ == '__main__':
+    START_TIME = time.time()
+    DATA = get_data('USC00044484', elements='PRCP')
+    print(DATA['PRCP'].tail())
+    print('First load took {} seconds'.format(round(time.time() - START_TIME, 3)))
+    START_TIME = time.time()
+    DATA = get_data('USC00044484', elements='PRCP')
+    print('Second load took {} seconds'.format(round(time.time() - START_TIME, 3)))
@@ -34,7 +34,7 @@
 ##  ------------------------------- ##
 ##      Writen by: Jason Deters     ##
 ##  ------------------------------- ##
-##    Last Edited on: 2020-05-27    ##
+##    Last Edited on: 2026-10-18    ##
 ##  ------------------------------- ##
 ######################################
 
@@ -46,7 +46,6 @@ If selected, generate random sampling points (# and minimum spacing determined b
 # Import Standard Libraries
 import os
 import sys
-import random
 
 # Import 3rd Party Libraries
 import ogr
@@ -57,6 +56,9 @@ MODULE_PATH = os.path.dirname(os.path.realpath(__file__))
 ROOT = os.path.split(MODULE_PATH)[0]
 try:
     from . import get_files
+    from . import query_shapefile_at_point
+    from . import sampling
+    from . import sampling_cache
     from .utilities import JLog
 except Exception:
     # Reverse compatibility step - Add utilities folder to path directly
@@ -71,6 +73,9 @@ except Exception:
         sys.path.append(UTILITIES_FOLDER)
     import JLog
     import get_files
+    import query_shapefile_at_point
+    import sampling
+    import sampling_cache
 
 
 # Function Definitions
@@ -96,10 +101,11 @@ def findHorizontalUnits(csString):
     finalString = csString[midLoc:endLoc]
     return finalString
 
-def huc_id_and_sample(lat, lon, huc_digits, sample=False, base_huc=None):
+def huc_id_and_sample(lat, lon, huc_digits, sample=False, base_huc=None, seed=None):
     """
     Identify the HUC of a given huc_digits in which the supplied coordinates lie.
     If selected, generate random sampling points (# and minimum spacing determined by HUC Digits) 
+    (seed makes the sampling points reproducible)
     """
     # Shapefile Query Adapted from
     # https://stackoverflow.com/questions/7861196/check-if-a-geopoint-with-latitude-and-longitude-is-within-a-shapefile/13433127#13433127
@@ -107,7 +113,7 @@ def huc_id_and_sample(lat, lon, huc_digits, sample=False, base_huc=None):
     lat = float(lat)
     lon = float(lon)
     log.Wrap("Identifying HUC{} Watershed".format(huc_digits))
-    attribute_filter = None
+    huc_prefix = None
     # Find module path
     module_folder = os.path.dirname(os.path.realpath(__file__))
     # Find ROOT folder
@@ -132,16 +138,16 @@ def huc_id_and_sample(lat, lon, huc_digits, sample=False, base_huc=None):
         shape_folder = os.path.join(base_huc_folder, "Shape")
         shapefile = os.path.join(shape_folder, 'WBDHU{}.shp'.format(huc_digits))
         field_name = "HUC{}".format(huc_digits)
-        # Get attribute filter
-        attribute_filter = "HUC10 LIKE '{}%'".format(base_huc)
+        # Only HUC10s within the base HUC8
+        huc_prefix = str(base_huc)
     elif huc_digits == 12:
         # Find Selected WBD_Shapefile and 
         base_huc_folder = os.path.join(wbd_folder, str(base_huc)[:2])
         shape_folder = os.path.join(base_huc_folder, "Shape")
         shapefile = os.path.join(shape_folder, 'WBDHU{}.shp'.format(huc_digits))
         field_name = "HUC{}".format(huc_digits)
-        # Get attrigbute filter
-        attribute_filter = "HUC12 LIKE '{}%'".format(base_huc)
+        # Only HUC12s within the base HUC10
+        huc_prefix = str(base_huc)
     
     # Test for Shapefile
     log.Wrap('Checking for existing Watershed Boundary Data...')
@@ -151,17 +157,13 @@ def huc_id_and_sample(lat, lon, huc_digits, sample=False, base_huc=None):
     else:
         get_huc2_package(str(base_huc)[:2])
 
-    # Create list to store exploded points
-    previously_selected_points = []
+    # Create list to store sampling points
     coordinates_within_polygon = []
 
-    # Open shapefile
+    # Open shapefile (kept open and indexed for the life of the process)
     log.Wrap(' -Reading local HUC{} dataset'.format(huc_digits))
-    ds_in = ogr.Open(shapefile)    #Get the contents of the shape file
-    lyr_in = ds_in.GetLayer()    #Get the shape file's first layer
-
-    # Put the title of the field you are interested in here
-    idx_reg = lyr_in.GetLayerDefn().GetFieldIndex(field_name)
+    huc_index = query_shapefile_at_point.get_index(shapefile, index_fields=[field_name])
+    lyr_in = huc_index.layer
 
     #If the latitude/longitude we're going to use is not in the projection
     #of the shapefile, then we will get erroneous results.
@@ -174,8 +176,6 @@ def huc_id_and_sample(lat, lon, huc_digits, sample=False, base_huc=None):
     horizontal_units = findHorizontalUnits(str(geo_ref))
     point_ref = ogr.osr.SpatialReference()
     point_ref.ImportFromEPSG(4326)
-    ctran = ogr.osr.CoordinateTransformation(point_ref, geo_ref)
-    rtran = ogr.osr.CoordinateTransformation(geo_ref, point_ref)
 
     # North_America_Albers_Equal_Area_Conic
     albers_ref = ogr.osr.SpatialReference()
@@ -184,42 +184,33 @@ def huc_id_and_sample(lat, lon, huc_digits, sample=False, base_huc=None):
     transform_albers_to_WGS = ogr.osr.CoordinateTransformation(albers_ref, point_ref)
 
     #Transform incoming longitude/latitude to the shapefile's projection
-    [t_lon, t_lat, z] = ctran.TransformPoint(lon, lat)
+    t_lon, t_lat = huc_index.transform_point(lon, lat)
 
     # Create a point
     pt = ogr.Geometry(ogr.wkbPoint)
     pt.SetPoint_2D(0, t_lon, t_lat)
 
-    # For efficiency, filter by HUC8 First (If applicable)
-    if attribute_filter is not None:
-        log.Wrap(' -Filtering {} features by HUC{} ({})...'.format(field_name, len(base_huc), base_huc))
-        lyr_in.SetAttributeFilter(attribute_filter)
+    # Envelope lookup followed by an exact test of the few overlapping features
+    if huc_prefix is not None:
+        # Only features within the base HUC, which must contain the point (as the old attribute filter did)
+        log.Wrap(' -Filtering {} features by HUC{} ({})...'.format(field_name, len(huc_prefix), huc_prefix))
+        within_base_huc = huc_index.positions_with_prefix(field_name, huc_prefix)
         log.Wrap(' -Testing remaining {} features against selected coordinates...'.format(field_name))
-        for feat_in in lyr_in:
-            feat_in_geom = feat_in.geometry()
-            contains_point = feat_in_geom.Contains(pt)
-            if contains_point:
-                selected_huc = feat_in
-                selected_huc_geom = feat_in_geom
-                break    
-
-    # Pure SpatialFilter method, incredibly slow for HUC10 and HUC12 (Hangs)
+        position = huc_index.match(t_lon, t_lat, predicate='Contains', positions=within_base_huc)
     else:
-        # Set up a spatial filter such that the only features we see when we
-        # loop through "lyr_in" are those which overlap the point defined above
+        # Same result as a layer SpatialFilter on the point
         log.Wrap(' -Filtering HUC{} features by spatial overlap with selected coordinates...'.format(huc_digits))
-        lyr_in.SetSpatialFilter(pt)
-        # Loop through the overlapped features and display the field of interest
-        for feat_in in lyr_in:
-            selected_huc = feat_in
-            selected_huc_geom = selected_huc.geometry()
-            break
+        position = huc_index.match(t_lon, t_lat)
+    huc_string = huc_index.values(field_name)[position]
+    # Clone, as the cached geometry may be transformed in place below
+    selected_huc_geom = huc_index.geometry(position).Clone()
 
     # Get Area of selected HUC
     supported_units = ['meter', 'meters' 'foot', 'feet', 'us feet', 'us foot', 'us_foot', 'foot_us']
     if not horizontal_units.lower() in supported_units:
-        # Transform geometry to Albers
+        # Transform geometry (and the observation point) to Albers
         selected_huc_geom.Transform(transform_source_to_albers)
+        pt.Transform(transform_source_to_albers)
         # Update horizontal units
         geo_ref = selected_huc_geom.GetSpatialReference()
         horizontal_units = findHorizontalUnits(str(geo_ref))
@@ -253,8 +244,7 @@ def huc_id_and_sample(lat, lon, huc_digits, sample=False, base_huc=None):
     elif horizontal_units.lower() in ['foot', 'feet', 'us feet', 'us foot', 'foot_us', 'us_foot']:
         sampling_point_spacing = sampling_point_spacing_miles * 5280 # 5280 Feet = 1 Mi
 
-    # Get the HUC Value of the selected watershed
-    huc_string = selected_huc.GetFieldAsString(idx_reg)
+    # Report the HUC Value of the selected watershed
     log.Wrap(' {}: {}'.format(field_name, huc_string))
     log.Wrap('Area: {} square miles'.format(huc_square_miles))
     log.Wrap('')
@@ -266,87 +256,53 @@ def huc_id_and_sample(lat, lon, huc_digits, sample=False, base_huc=None):
         # Calculate the Envelope (bounding box) of the selected HUC
         x_min, x_max, y_min, y_max = selected_huc_geom.GetEnvelope()
 
-        # Announce Sampling Points
-        log.print_section('Random Sampling Point Generation Section')
-        log.Wrap('Sampling Protocol:')
-        log.Wrap(' -Latitudes and Longitudes will be randomly generated watershed polygon extremes:')
-        log.Wrap('    HUC{} ({}) Coordinate Extremes (Converted to Meters for testing):'.format(huc_digits, huc_string))
-        log.Wrap('    Maximum Latitude:  {}'.format(y_max))
-        log.Wrap('    Minimum Latitude:  {}'.format(y_min))
-        log.Wrap('    Maximum Longitude: {}'.format(x_max))
-        log.Wrap('    MInimum Longitude: {}'.format(x_min))
-        log.Wrap(' -A point feature will be created for each random Latitude and Longitude.')
-        log.Wrap(' -The point will be tested to see if it falls within the HUC{} ({})'.format(huc_digits, huc_string))
-        log.Wrap(' -The point will be must also be at least {} mile(s) from any previously selected sampling points.'.format(sampling_point_spacing_miles))
-        log.Wrap(' -If all criteria are met, the point will be added to the list of sampling points.')
-        log.Wrap(' -When 1500 consecutive random test points fail these tests, the sampling procedure will be complete.')
-
-        # Announce protocol commencement
-        log.Wrap('')
-        log.Wrap('Generating potential sampling points and testing the above conditions...')
-        
-        # Add initially selected coordinates as the first sampling point
-        previously_selected_points.append(pt)
-        coordinates_within_polygon.append([lat, lon])
-        points_selected = 1 # Starting with observation point
-        points_tested = 1 # Starting with observation point
-        points_tested_since_last_success = 0
-
-        # Setting this to use existing structure since it is now based on 1500-attempt timeout
-        num_points = 999
-
-        while num_points > 0:
-            # Create a random X coordinate within the Envelope
-            test_x = random.uniform(x_min, x_max)
-            # Create a random Y coordinate within the Envelope
-            test_y = random.uniform(y_min, y_max)
-            points_tested += 1
-            points_tested_since_last_success += 1
-            test_x_round = round(test_x, 6)
-            test_y_round = round(test_y, 6)
-            if points_tested_since_last_success > 1500:
-                if num_points < 998:
-                    log.Wrap('Sampling complete (1500 consecutive points tested since the last suitable one was found. Sampling complete).')
-                    break
-                else:
-                    log.Wrap('  {} points selected of {} test candidates generated.'.format(points_selected, points_tested))
-                    points_tested_since_last_success = 0
-                    log.Wrap('1500 points tested since the last suitable one was found.  Lowering minimum spacing by 0.5 mile.')
-                    sampling_point_spacing_miles = round((sampling_point_spacing_miles - 0.5), 2)
-                    if horizontal_units.lower() in ['meter', 'meters']:
-                        sampling_point_spacing = sampling_point_spacing_miles * 1609.34 # 1609.34 Meters = 1 Mi
-                    elif horizontal_units.lower() in ['foot', 'feet', 'us feet', 'us foot', 'foot_us', 'us_foot']:
-                        sampling_point_spacing = sampling_point_spacing_miles * 5280 # 5280 Feet = 1 Mi
-                    log.Wrap(' -Now each point must be at least {} miles(s) from all other sampling points'.format(sampling_point_spacing_miles))
-            log.print_status_message('  {} points selected of {} test candidates generated. Testing ({}, {})'.format(points_selected, points_tested, test_y_round, test_x_round))
-            # Create a blank Test Point (OGR Geometry of the type ogr.wkbPoint)
-            test_pt = ogr.Geometry(ogr.wkbPoint)
-            # Set the Test Point to the random X and Y coordinates
-            test_pt.SetPoint_2D(0, test_x, test_y)
-            # Test whether the within-envolope point is actually within the polygon
-            inside = selected_huc_geom.Contains(test_pt)
-            if inside:
-                properly_spaced = True
-                # Test against every previously selected point for optimal spacing
-                for previous_point in previously_selected_points:
-                    distance = test_pt.Distance(previous_point)
-                    if distance < sampling_point_spacing:
-                        properly_spaced = False
-                # Test passed, add to all lists and reduce num_points needed
-                if properly_spaced:
-                    points_tested_since_last_success = 0
-                    num_points -= 1
-                    points_selected += 1
-                    previously_selected_points.append(test_pt)
-                    [wgs_lon, wgs_lat, z] = transform_albers_to_WGS.TransformPoint(test_x, test_y)
-                    wgs_lat = round(wgs_lat, 6)
-                    wgs_lon = round(wgs_lon, 6)
-                    coordinates_within_polygon.append([wgs_lat, wgs_lon])
-        log.Wrap('{} sampling points selected from {} randomly generated candidates'.format(points_selected, points_tested))
+        # Reuse the points stored for this watershed, spacing and seed (if any)
+        cache_key = sampling_cache.huc_key(huc_digits, huc_string)
+        initial_spacing_miles = sampling_point_spacing_miles
+        stored = sampling_cache.load_points(cache_key, initial_spacing_miles, seed)
+        if stored is not None:
+            stored_points, sampling_point_spacing_miles = stored
+            log.Wrap('Reusing {} stored sampling points (minimum spacing {} mile(s))'.format(len(stored_points), sampling_point_spacing_miles))
+            coordinates_within_polygon = sampling_cache.with_observation_point(lat, lon, stored_points, sampling_point_spacing_miles)
+        else:
+            # Announce Sampling Points
+            log.print_section('Random Sampling Point Generation Section')
+            log.Wrap('Sampling Protocol:')
+            log.Wrap(' -Points will be generated within the watershed polygon extremes:')
+            log.Wrap('    HUC{} ({}) Coordinate Extremes (Converted to Meters for testing):'.format(huc_digits, huc_string))
+            log.Wrap('    Maximum Latitude:  {}'.format(y_max))
+            log.Wrap('    Minimum Latitude:  {}'.format(y_min))
+            log.Wrap('    Maximum Longitude: {}'.format(x_max))
+            log.Wrap('    MInimum Longitude: {}'.format(x_min))
+            log.Wrap(' -Starting from the selected coordinates, Poisson-disk sampling will add points within the HUC{} ({})'.format(huc_digits, huc_string))
+            log.Wrap('   that are at least {} mile(s) from any previously selected sampling points.'.format(sampling_point_spacing_miles))
+            log.Wrap(' -When {} consecutive random test points find no room for another point, the sampling procedure will be complete.'.format(sampling.SEED_ATTEMPTS))
+            log.Wrap(' -If fewer than 3 points are selected, the minimum spacing will be lowered by 0.5 mile and sampling will continue.')
+
+            # Announce protocol commencement
+            log.Wrap('')
+            log.Wrap('Generating sampling points...')
+
+            # Initially selected coordinates are the first sampling point
+            step_down = sampling_point_spacing / sampling_point_spacing_miles * 0.5
+            sampled_points, used_spacing = sampling.sample_polygon(selected_huc_geom,
+                                                                   first_point=(pt.GetX(), pt.GetY()),
+                                                                   spacing=sampling_point_spacing,
+                                                                   step_down=step_down,
+                                                                   seed=seed)
+            if used_spacing < sampling_point_spacing:
+                sampling_point_spacing_miles = round(sampling_point_spacing_miles * used_spacing / sampling_point_spacing, 2)
+                log.Wrap('Too few suitable points found. Minimum spacing lowered to {} mile(s).'.format(sampling_point_spacing_miles))
+            coordinates_within_polygon.append([lat, lon])
+            if len(sampled_points) > 1:
+                for wgs_lon, wgs_lat, z in transform_albers_to_WGS.TransformPoints(sampled_points[1:].tolist()):
+                    coordinates_within_polygon.append([round(wgs_lat, 6), round(wgs_lon, 6)])
+            sampling_cache.save_points(cache_key, initial_spacing_miles, seed, coordinates_within_polygon[1:], sampling_point_spacing_miles)
+        log.Wrap('{} sampling points selected'.format(len(coordinates_within_polygon)))
         log.print_separator_line()
     return huc_string, coordinates_within_polygon, huc_square_miles
 
-def huc8_id_and_sample(lat, lon):
+def huc8_id_and_sample(lat, lon, seed=None):
     """Identifies the HUC8 within which the coordinates fall.
     Creates random sampling points within the selected HUC8 polygon"""
     # First Identify HUC2 (So we can download the relavent datasets)
@@ -360,10 +316,11 @@ def huc8_id_and_sample(lat, lon):
                                                                lon=lon,
                                                                huc_digits=8,
                                                                sample=True,
-                                                               base_huc=huc)
+                                                               base_huc=huc,
+                                                               seed=seed)
     return huc, sampling_points, huc_square_miles
 
-def huc10_id_and_sample(lat, lon):
+def huc10_id_and_sample(lat, lon, seed=None):
     """Identifies the HUC10 within which the coordinates fall.
     Creates random sampling points within the selected HUC10 polygon"""
     # First Identify HUC2 (So we can download the relavent datasets)
@@ -383,10 +340,11 @@ def huc10_id_and_sample(lat, lon):
                                                                lon=lon,
                                                                huc_digits=10,
                                                                sample=True,
-                                                               base_huc=huc)
+                                                               base_huc=huc,
+                                                               seed=seed)
     return huc, sampling_points, huc_square_miles
 
-def huc12_id_and_sample(lat, lon):
+def huc12_id_and_sample(lat, lon, seed=None):
     """Identifies the HUC12 within which the coordinates fall.
     Creates random sampling points within the selected HUC12 polygon"""
     # First Identify HUC2 (So we can download the relavent datasets)
@@ -412,22 +370,23 @@ def huc12_id_and_sample(lat, lon):
                                                                lon=lon,
                                                                huc_digits=12,
                                                                sample=True,
-                                                               base_huc=huc)
+                                                               base_huc=huc,
+                                                               seed=seed)
     return huc, sampling_points, huc_square_miles
 
-def id_and_sample(lat, lon, watershed_scale):
+def id_and_sample(lat, lon, watershed_scale, seed=None):
     """Runs the correct function to identify and randomly sample the HUC of the selected watershed_scale"""
     log = JLog.PrintLog(Delete=False)
     log.print_section('Watershed ({}) Identification Section'.format(watershed_scale))
     if watershed_scale == "HUC8":
         # Get HUC & Random Sampling Points
-        huc, sampling_points, huc_square_miles = huc8_id_and_sample(lat=lat, lon=lon)
+        huc, sampling_points, huc_square_miles = huc8_id_and_sample(lat=lat, lon=lon, seed=seed)
     elif watershed_scale == "HUC10":
         # Get HUC & Random Sampling Points
-        huc, sampling_points, huc_square_miles = huc10_id_and_sample(lat=lat, lon=lon)
+        huc, sampling_points, huc_square_miles = huc10_id_and_sample(lat=lat, lon=lon, seed=seed)
     elif watershed_scale == "HUC12":
         # Get HUC & Random Sampling Points
-        huc, sampling_points, huc_square_miles = huc12_id_and_sample(lat=lat, lon=lon)
+        huc, sampling_points, huc_square_miles = huc12_id_and_sample(lat=lat, lon=lon, seed=seed)
     return huc, sampling_points, huc_square_miles
 
 def get_huc2_package(huc2):
@@ -443,6 +402,12 @@ def get_huc2_package(huc2):
     get_files.ensure_file_exists(file_url=file_url,
                                  local_file_path=local_file_path,
                                  extract_path=extract_path)
+    # Build the envelope/code sidecars once, so HUC lookups never scan these shapefiles
+    shape_folder = os.path.join(extract_path, 'Shape')
+    for huc_digits in [8, 10, 12]:
+        shapefile = os.path.join(shape_folder, 'WBDHU{}.shp'.format(huc_digits))
+        if os.path.exists(shapefile):
+            query_shapefile_at_point.get_index(shapefile, index_fields=['HUC{}'.format(huc_digits)])
 
 
 
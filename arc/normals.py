@@ -0,0 +1,177 @@
+#  This software was developed by United States Army Corps of Engineers (USACE)
+#  employees in the course of their official duties.  USACE used copyrighted,
+#  open source code to develop this software, as such this software 
+#  (per 17 USC § 101) is considered "joint work."  Pursuant to 17 USC § 105,
+#  portions of the software developed by USACE employees in the course of their
+#  official duties are not subject to copyright protection and are in the public
+#  domain.
+#  
+#  USACE assumes no responsibility whatsoever for the use of this software by
+#  other parties, and makes no guarantees, expressed or implied, about its
+#  quality, reliability, or any other characteristic. 
+#  
+#  The software is provided "as is," without warranty of any kind, express or
+#  implied, including but not limited to the warranties of merchantability,
+#  fitness for a particular purpose, and noninfringement.  In no event shall the
+#  authors or U.S. Government be liable for any claim, damages or other
+#  liability, whether in an action of contract, tort or otherwise, arising from,
+#  out of or in connection with the software or the use or other dealings in the
+#  software.
+#  
+#  Public domain portions of this software can be redistributed and/or modified
+#  freely, provided that any derivative works bear some notice that they are
+#  derived from it, and any modified versions bear some notice that they have
+#  been modified. 
+#  
+#  Copyrighted portions of the software are annotated within the source code.
+#  Open Source Licenses, included in the source code, apply to the applicable
+#  copyrighted portions.  Copyrighted portions of the software are not in the
+#  public domain.
+
+
+
+
+######################################
+##  ------------------------------- ##
+##            normals.py            ##
+##  ------------------------------- ##
+##     Written by: Jason Deters     ##
+##  ------------------------------- ##
+##    Last Edited on: 2026-10-18    ##
+##  ------------------------------- ##
+######################################
+
+"""
+Normal range (30th / 70th percentile) calculations for 30-day rolling totals.
+The Normal Period is reshaped into a (water years x 365) array once, both
+percentiles are computed for every day of the year in a single numpy call,
+and the prior, current and following water-year series are all built from
+that one result.  NormalsCache keeps recently used results so dates that
+share a site, Normal Period and contributing stations skip the Normal
+Period rolling totals and the calculation.
+"""
+
+# Import Standard Libraries
+import collections
+
+# Import 3rd Party Libraries
+import numpy
+import pandas
+
+# Water year day indices (Oct 1 = 0) of Feb 28 and Mar 1 with Feb 29 removed
+FEB_28_INDEX = 150
+MAR_1_INDEX = 151
+PERCENTILES = [30, 70]
+
+
+def water_year_table(dates, values):
+    """Converts a daily series into a (water years x 365) numpy array
+
+    Feb 29 values are dropped and each row runs Oct 1 - Sep 30.  As before,
+    rows only run from the first Oct 1 up to (not including) the last Oct 1,
+    so days after the final Oct 1 in dates are not part of the table.
+    """
+    dates = pandas.DatetimeIndex(dates)
+    values = numpy.asarray(values, dtype=float)[:len(dates)]
+    dates = dates[:len(values)]
+    keep = ~((dates.month == 2) & (dates.day == 29))
+    dates = dates[keep]
+    values = values[keep]
+    oct_1_positions = numpy.flatnonzero((dates.month == 10) & (dates.day == 1))
+    if len(oct_1_positions) < 2:
+        return numpy.empty((0, 365))
+    table = values[oct_1_positions[0]:oct_1_positions[-1]]
+    return table.reshape(-1, 365)
+
+
+def day_of_year_percentiles(table):
+    """Returns the 30th and 70th percentile of each column as two 365-day arrays"""
+    low, high = numpy.percentile(table, PERCENTILES, axis=0)
+    return low, high
+
+
+def expand_to_water_year(day_values, dates):
+    """Maps 365 day-of-water-year values onto a 365 or 366 day water year
+
+    In leap years, Feb 29 is estimated by averaging the Feb 28 and Mar 1 values.
+    """
+    if len(dates) == 366:
+        leap_day = (day_values[FEB_28_INDEX] + day_values[MAR_1_INDEX]) / 2
+        day_values = numpy.insert(day_values, MAR_1_INDEX, leap_day)
+    return pandas.Series(day_values, dates)
+
+
+def normal_series(table, dates_list):
+    """Calculates Normal Low and Normal High series for one or more water years
+
+    Arguments:
+        table -- (water years x 365) array from water_year_table()
+        dates_list -- list of daily DatetimeIndexes, one per water year
+
+    Returns (normal_low_series, normal_high_series), each spanning every
+    water year in dates_list, in order.
+    """
+    return normal_series_from_percentiles(day_of_year_percentiles(table), dates_list)
+
+
+def normal_series_from_percentiles(day_percentiles, dates_list):
+    """Builds Normal Low and Normal High series from day_of_year_percentiles() output"""
+    low, high = day_percentiles
+    low_series = [expand_to_water_year(low, dates) for dates in dates_list]
+    high_series = [expand_to_water_year(high, dates) for dates in dates_list]
+    return pandas.concat(low_series), pandas.concat(high_series)
+
+
+class NormalsCache(object):
+    """Least-recently-used cache of day-of-year percentiles (and the series built from them)
+
+    Entries are keyed by site, data type, Normal Period and the contributing
+    stations, in the order they were merged.  Those fix the merged Normal
+    Period series, so the key can be checked before any rolling totals are
+    calculated.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self.entries = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(site, data_type, normal_period_start_date, normal_period_end_date, station_names):
+        """Returns a hashable key for one site, Normal Period and set of contributing stations"""
+        return (tuple(site), data_type, normal_period_start_date, normal_period_end_date,
+                tuple(str(station_name) for station_name in station_names))
+
+    def get(self, key):
+        """Returns the cached (low, high) value for key, or None"""
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Stores a (low, high) value for key, evicting the least recently used entry if full"""
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """Removes all entries"""
+        self.entries.clear()
+
+
+if __name__ == '__main__':
+    TEST_DATES = pandas.date_range('1985-10-01', '2016-09-30')
+    TEST_VALUES = numpy.random.random(len(TEST_DATES))
+    TEST_TABLE = water_year_table(TEST_DATES, TEST_VALUES)
+    print(TEST_TABLE.shape)
+    LOW, HIGH = normal_series(TEST_TABLE,
+                              [pandas.date_range('2015-10-01', '2016-09-30'),
+                               pandas.date_range('2016-10-01', '2017-09-30')])
+    print(LOW.head())
+    print(len(LOW), len(HIGH))
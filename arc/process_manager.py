@@ -35,19 +35,25 @@
 ##  ------------------------------- ##
 ##     Written by: Jason Deters     ##
 ##  ------------------------------- ##
-##    Last Edited on: 2020-05-27    ##
+##    Last Edited on: 2026-10-18    ##
 ##  ------------------------------- ##
 ######################################
 
-""" This code provides the subprocess minions for the Antecedent Precipitation Tool """
+""" This code provides the download thread pool for the Antecedent Precipitation Tool """
 
 import os
 import sys
-import multiprocessing
 import traceback
 import time
-import warnings
-multiprocessing.freeze_support()
+import threading
+import concurrent.futures
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
 
 # Find module path
 MODULE_PATH = os.path.dirname(os.path.realpath(__file__))
@@ -70,50 +76,77 @@ except Exception:
         sys.path.append(UTILITIES_FOLDER)
     import JLog
 
-class Minion(multiprocessing.Process):
-    """Multiprocessing worker class"""
-    def __init__(self, task_queue, result_queue):
-        multiprocessing.Process.__init__(self)
-        self.task_queue = task_queue
-        self.result_queue = result_queue
-        self.proc_name = None
-        self.log = None
-    def start_log(self):
-        """Instantiates Logging class"""
-        # Create PrintLog
+
+DEFAULT_DOWNLOAD_WORKERS = 4   # > 4 resulted in many failed NOAA downloads
+DEFAULT_HOST_INTERVAL = 0.1  # Minimum seconds between request starts to the same host
+
+
+class HostRateLimiter(object):
+    """Spaces out request start times per host (shared by all threads)"""
+    def __init__(self, min_interval=DEFAULT_HOST_INTERVAL):
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.next_allowed = {}
+
+    def wait(self, url):
+        """Blocks until a request to the host of url may start"""
+        if not self.min_interval:
+            return
+        host = urlparse(url).netloc
+        with self.lock:
+            now = time.time()
+            start_time = max(now, self.next_allowed.get(host, now))
+            self.next_allowed[host] = start_time + self.min_interval
+        delay = start_time - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class RateLimitedSession(requests.Session):
+    """requests.Session with pooled connections and per-host rate limiting"""
+    def __init__(self, rate_limiter=None, pool_size=DEFAULT_DOWNLOAD_WORKERS):
+        requests.Session.__init__(self)
+        self.rate_limiter = rate_limiter
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait(url)
+        return requests.Session.request(self, method, url, *args, **kwargs)
+
+
+class DownloadPool(object):
+    """Long-lived thread pool for I/O-bound station downloads
+
+    Tasks are callables accepting a "session" keyword argument (such as
+    station_manager.Constructor) and their return values are handed back
+    directly, without pickling.
+    """
+    def __init__(self, num_workers=DEFAULT_DOWNLOAD_WORKERS, min_host_interval=DEFAULT_HOST_INTERVAL):
+        self.num_workers = num_workers
+        self.rate_limiter = HostRateLimiter(min_host_interval)
+        self.session = RateLimitedSession(rate_limiter=self.rate_limiter, pool_size=num_workers)
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=num_workers)
         self.log = JLog.PrintLog()
-        self.proc_name = self.name
-    def run(self):
-        warnings.filterwarnings("ignore")
-#        f = open(os.devnull, 'w')
-#        sys.stderr = f
-        num_jobs = 0
-        max_jobs = 100  # Max jobs before terminating
-        sleep_time = 1
-        while True:
-            try:
-                next_task = self.task_queue.get()
-                sleep_time = 1
-            except Exception:
-                time.sleep(sleep_time)
-                if sleep_time < 10:
-                    sleep_time += .5
-            if next_task is None:
-                # Poison pill means shutdown
-                break
-            try:
-                result = next_task()
-            except Exception:
-#                sys.stderr = sys.__stderr__
-                self.start_log()
-                self.log.Wrap('------------------------------------------')
-                self.log.Wrap("EXCEPTION:")
-                self.log.Wrap(traceback.format_exc())
-                self.log.Wrap('------------------------------------------')
-            self.result_queue.put(result)
-            num_jobs += 1
-            if num_jobs > max_jobs:
-                self.result_queue.put("Maxed")
-                break
-        return
-# End of Minion
+
+    def _run_task(self, task):
+        try:
+            return task(session=self.session)
+        except Exception:
+            self.log.Wrap('------------------------------------------')
+            self.log.Wrap("EXCEPTION:")
+            self.log.Wrap(traceback.format_exc())
+            self.log.Wrap('------------------------------------------')
+            return None
+
+    def submit(self, task):
+        """Schedules task and returns its Future (which resolves to None on failure)"""
+        return self.executor.submit(self._run_task, task)
+
+    def shutdown(self):
+        """Stops the worker threads and closes pooled connections"""
+        self.executor.shutdown(wait=True)
+        self.session.close()
+# End of DownloadPool
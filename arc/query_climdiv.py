@@ -35,7 +35,7 @@
 ##  ------------------------------- ##
 ##     Written by: Jason Deters     ##
 ##  ------------------------------- ##
-##    Last Edited on: 2020-05-27    ##
+##    Last Edited on: 2026-10-18    ##
 ##  ------------------------------- ##
 ######################################
 
@@ -52,7 +52,10 @@ import stat
 import time
 import datetime
 import traceback
+import threading
+import functools
 import requests
+import numpy
 
 # Find module path
 MODULE_PATH = os.path.dirname(os.path.realpath(__file__))
@@ -88,6 +91,11 @@ ROOT_FOLDER = os.path.split(MODULE_FOLDER)[0]
 GIS_FOLDER = os.path.join(ROOT_FOLDER, 'GIS')
 CLIM_DIV_FOLDER = os.path.join(GIS_FOLDER, 'climdiv')
 
+# Parsed PDSI tables already loaded in this process, by pdsidv file path
+PDSI_TABLES = {}
+PDSI_TABLES_LOCK = threading.Lock()
+SIDECAR_SUFFIXES = ['.divisions.npy', '.years.npy', '.values.npy']
+
 
 def delete_read_only(file_path):
     """Ensures Windows Read-Only status does not interrupt os.remove function"""
@@ -194,8 +202,100 @@ def ensure_current_pdsidv_file():
                         delete_read_only(delete_path)
     return current_file_path
 
+def sidecar_paths(pdsidv_file):
+    """Returns the paths of the binary sidecar files for a pdsidv file"""
+    return [pdsidv_file + suffix for suffix in SIDECAR_SUFFIXES]
+
+def parse_pdsidv_file(pdsidv_file):
+    """Parses a pdsidv text file into (divisions, years, values)
+
+    values has shape (divisions x years x 12 months); rows absent from the
+    file are NaN.  Each line holds a 4 character climate division, the
+    element code ("05"), a 4 digit year and twelve fixed-width monthly values.
+    """
+    rows = {}
+    with open(pdsidv_file) as text_file:
+        for line in text_file:
+            if len(line) < 94 or line[4:6] != '05':
+                continue
+            try:
+                key = (int(line[0:4]), int(line[6:10]))
+                rows[key] = [float(line[start:start + 6].replace(" ", "")) for start in range(11, 95, 7)]
+            except ValueError:
+                continue
+    divisions = numpy.array(sorted(set(key[0] for key in rows)), dtype=numpy.int32)
+    years = numpy.arange(min(key[1] for key in rows), max(key[1] for key in rows) + 1, dtype=numpy.int32)
+    values = numpy.full((len(divisions), len(years), 12), numpy.nan)
+    division_positions = numpy.searchsorted(divisions, [key[0] for key in rows])
+    year_positions = numpy.array([key[1] for key in rows]) - years[0]
+    values[division_positions, year_positions] = numpy.array(list(rows.values()))
+    return divisions, years, values
+
+def delete_pdsidv_sidecars(pdsidv_file):
+    """Deletes the binary sidecars of a pdsidv file and forgets any loaded copy"""
+    with PDSI_TABLES_LOCK:
+        PDSI_TABLES.pop(pdsidv_file, None)
+    for path in sidecar_paths(pdsidv_file):
+        if os.path.exists(path):
+            delete_read_only(path)
+
+def load_pdsidv_table(pdsidv_file):
+    """Returns the parsed (divisions, years, values) table for a pdsidv file
+
+    The table is parsed once after download, saved as memory-mappable .npy
+    sidecars beside the text file, and kept in memory for the life of the process.
+    """
+    with PDSI_TABLES_LOCK:
+        table = PDSI_TABLES.get(pdsidv_file)
+        if table is not None:
+            return table
+        paths = sidecar_paths(pdsidv_file)
+        table = None
+        sidecars_current = all(os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(pdsidv_file)
+                               for path in paths)
+        if sidecars_current:
+            try:
+                table = tuple(numpy.load(path, mmap_mode='r') for path in paths)
+            except Exception:
+                table = None
+        if table is None:
+            log.Wrap('  Indexing PDSI file...')
+            table = parse_pdsidv_file(pdsidv_file)
+            for path, array in zip(paths, table):
+                # Unique per process, so two runs indexing the same file don't share a temp file
+                temp_path = '{}.{}.tmp.npy'.format(path, os.getpid())
+                try:
+                    numpy.save(temp_path, array)
+                    os.replace(temp_path, path)
+                except Exception:
+                    pass
+        division_index = dict((int(division), position) for position, division in enumerate(table[0]))
+        table = (division_index, int(table[1][0]), table[2])
+        PDSI_TABLES[pdsidv_file] = table
+        return table
+
+def lookup_monthly_values(pdsidv_file, clim_div, year):
+    """Returns the twelve monthly PDSI values for a climate division and year, or None if not in the file"""
+    division_index, first_year, values = load_pdsidv_table(pdsidv_file)
+    division_position = division_index.get(int(clim_div))
+    year_position = int(year) - first_year
+    if division_position is None or year_position < 0 or year_position >= values.shape[1]:
+        return None
+    monthly_values = values[division_position, year_position]
+    if numpy.isnan(monthly_values).all():
+        return None
+    return [float(value) for value in monthly_values]
+
+CLIM_DIV_DECIMALS = 6     # Coordinates are rounded to ~0.1 m before lookup and caching
+
 def get_clim_div(lat, lon):
     """Finds the NOAA Climate Division associated with a given Lat and Lon"""
+    return get_clim_div_rounded(round(float(lat), CLIM_DIV_DECIMALS),
+                                round(float(lon), CLIM_DIV_DECIMALS))
+
+@functools.lru_cache(maxsize=4096)
+def get_clim_div_rounded(lat, lon):
+    """Climate Division lookup behind get_clim_div, cached by rounded coordinates"""
     clim_div_shapefile = os.path.join(CLIM_DIV_FOLDER, 'GIS.OFFICIAL_CLIM_DIVISIONS.shp')
     feature_attribute_to_query = "CLIMDIV"
     clim_div = query_shapefile_at_point.check(lat=lat,
@@ -210,7 +310,7 @@ def get_pdsidv(lat, lon, year, month, pdsidv_file):
     """Queries downloaded Palmer Drought Severity Index value for given lat, lon, year, and month"""
     log.print_section('PDSI - Palmer Drought Severity Index')
     log.Wrap('Querying the Palmer Drought Severity Index...')
-    monthly_values = []
+    monthly_values = None
     values_with_classes = []
     lightgrn = (0.5, 0.8, 0.5)
     lightblu = (0.4, 0.5, 0.8)
@@ -220,22 +320,8 @@ def get_pdsidv(lat, lon, year, month, pdsidv_file):
         clim_div = get_clim_div(lat, lon)
         if pdsidv_file is None:
             pdsidv_file = ensure_current_pdsidv_file()
-        line_identifier = '{}05{}'.format(clim_div, year)
-        log.Wrap('  Opening PDSI file to collect monthly values...')
-        for line in open(pdsidv_file):
-            if line_identifier in line:
-                monthly_values.append(line[11:17].replace(" ", ""))
-                monthly_values.append(line[18:24].replace(" ", ""))
-                monthly_values.append(line[25:31].replace(" ", ""))
-                monthly_values.append(line[32:38].replace(" ", ""))
-                monthly_values.append(line[39:45].replace(" ", ""))
-                monthly_values.append(line[46:52].replace(" ", ""))
-                monthly_values.append(line[53:59].replace(" ", ""))
-                monthly_values.append(line[60:66].replace(" ", ""))
-                monthly_values.append(line[67:73].replace(" ", ""))
-                monthly_values.append(line[74:80].replace(" ", ""))
-                monthly_values.append(line[81:87].replace(" ", ""))
-                monthly_values.append(line[88:94].replace(" ", ""))
+        log.Wrap('  Looking up monthly values in the PDSI table...')
+        monthly_values = lookup_monthly_values(pdsidv_file, clim_div, year)
         if not monthly_values:
             log.Wrap('    Required monthly values not found in PDSI file.')
             # Test if this year's file is not yet available (Government Shutdown Workaround)
@@ -244,6 +330,7 @@ def get_pdsidv(lat, lon, year, month, pdsidv_file):
                 log.Wrap('      NOAA server has yet to publish the most up-to-date file.  PDSI Unavailable.')
             else:
                 log.Wrap('      PDSI file assumed corrupt.  Deleting...')
+                delete_pdsidv_sidecars(pdsidv_file)
                 delete_read_only(pdsidv_file)
             output = [-99.99, 'Not available', white] + [pdsidv_file]
         else:
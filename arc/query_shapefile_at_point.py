@@ -35,7 +35,7 @@
 ##  ------------------------------- ##
 ##      Written by: Jason Deters     ##
 ##  ------------------------------- ##
-##    Last Edited on: 2020-06-11    ##
+##    Last Edited on: 2026-10-18    ##
 ##  ------------------------------- ##
 ######################################
 
@@ -44,47 +44,226 @@
 
 # Import Standard Libraries
 import os
+import threading
 
 # Import 3rd Party Libraries
+import numpy
 import ogr
 ogr.UseExceptions()
 
+# Shapefiles already loaded in this process, by path
+INDEXES = {}
+INDEXES_LOCK = threading.Lock()
+
+
+class ShapefileIndex(object):
+    """Keeps one shapefile open with its feature envelopes and attribute values in memory
+
+    Shared point-in-polygon service: get one through get_index() and use
+    find() / value_at() for single points or lookup() for many at once.
+
+    The WGS84 -> layer transformation is built once, envelopes are tested
+    for every feature at once with numpy, and feature geometries are only
+    read (and then kept) when a point falls inside their envelope.
+    Envelopes and index_fields values can be persisted in a sidecar .npz.
+    """
+    def __init__(self, shapefile, index_fields=None):
+        self.shapefile = shapefile
+        self.lock = threading.RLock()
+        # Load shapefile driver and get the first layer
+        ogr_shapefile_driver = ogr.GetDriverByName('ESRI Shapefile')
+        self.data_source = ogr_shapefile_driver.Open(shapefile, 0)
+        self.layer = self.data_source.GetLayer(0)
+        self.layer_definition = self.layer.GetLayerDefn()
+        #If the latitude/longitude we're going to use is not in the projection
+        #of the shapefile, then we will get erroneous results.
+        #The following assumes that the latitude longitude is in WGS84
+        #This is identified by the number "4326", as in "EPSG:4326"
+        #We will create a transformation between this and the shapefile's
+        #project, whatever it may be
+        geo_ref = self.layer.GetSpatialRef()
+        point_ref = ogr.osr.SpatialReference()
+        point_ref.ImportFromEPSG(4326)
+        self.ctran = ogr.osr.CoordinateTransformation(point_ref, geo_ref)
+        self.geometries = {}
+        self.field_values = {}
+        # Envelopes (and index_fields) come from the sidecar when it is current
+        index_fields = list(index_fields or [])
+        if index_fields and self.load_sidecar(index_fields):
+            return
+        self.read_envelopes(index_fields)
+        if index_fields:
+            self.save_sidecar(index_fields)
+
+    def read_envelopes(self, index_fields=None):
+        """Reads every feature's FID and envelope (and index_fields values) in one pass over the layer"""
+        fids = []
+        envelopes = []
+        field_indexes = [self.layer_definition.GetFieldIndex(field_name) for field_name in index_fields or []]
+        field_values = [[] for field_index in field_indexes]
+        with self.lock:
+            self.layer.SetSpatialFilter(None)
+            self.layer.ResetReading()
+            for feature in self.layer:
+                geometry = feature.GetGeometryRef()
+                if geometry is None:
+                    continue
+                fids.append(feature.GetFID())
+                envelopes.append(geometry.GetEnvelope())
+                for values, field_index in zip(field_values, field_indexes):
+                    values.append(feature.GetFieldAsString(field_index))
+            self.layer.ResetReading()
+        self.fids = numpy.array(fids, dtype=numpy.int64)
+        self.envelopes = numpy.array(envelopes, dtype=float).reshape(-1, 4)  # min_x, max_x, min_y, max_y
+        for field_name, values in zip(index_fields or [], field_values):
+            self.field_values[field_name] = values
+
+    def save_sidecar(self, index_fields):
+        """Writes FIDs, envelopes and index_fields values next to the shapefile (atomically)"""
+        path = sidecar_path(self.shapefile)
+        temp_path = path + '.tmp.npz'
+        arrays = {'fids': self.fids, 'envelopes': self.envelopes}
+        for field_name in index_fields:
+            arrays['field_' + field_name] = numpy.array(self.values(field_name), dtype=str)
+        try:
+            numpy.savez(temp_path, **arrays)
+            os.replace(temp_path, path)
+        except OSError:
+            # Read-only GIS folder, the in-memory index still works
+            pass
+
+    def load_sidecar(self, index_fields):
+        """Reads the sidecar written by save_sidecar(); returns False if it is missing, stale or lacks a field"""
+        path = sidecar_path(self.shapefile)
+        try:
+            if os.path.getmtime(path) < os.path.getmtime(self.shapefile):
+                return False
+            with numpy.load(path) as arrays:
+                if any('field_' + field_name not in arrays.files for field_name in index_fields):
+                    return False
+                self.fids = arrays['fids']
+                self.envelopes = arrays['envelopes']
+                for field_name in index_fields:
+                    self.field_values[field_name] = arrays['field_' + field_name].tolist()
+        except (OSError, ValueError, KeyError):
+            return False
+        return True
+
+    def transform_point(self, lon, lat):
+        """Transforms a WGS84 longitude/latitude to the shapefile's projection"""
+        with self.lock:
+            [x, y, z] = self.ctran.TransformPoint(float(lon), float(lat))
+        return x, y
+
+    def geometry(self, position):
+        """Returns the (cached) geometry of the feature at a position in self.fids"""
+        geometry = self.geometries.get(position)
+        if geometry is None:
+            with self.lock:
+                feature = self.layer.GetFeature(int(self.fids[position]))
+                geometry = feature.GetGeometryRef().Clone()
+            self.geometries[position] = geometry
+        return geometry
+
+    def positions_with_prefix(self, field_name, prefix):
+        """Returns positions of features whose field_name value starts with prefix (e.g. a parent HUC)"""
+        values = numpy.array(self.values(field_name), dtype=str)
+        return numpy.flatnonzero(numpy.char.startswith(values, str(prefix)))
+
+    def values(self, field_name):
+        """Returns the attribute values of field_name, in the same order as self.fids"""
+        values = self.field_values.get(field_name)
+        if values is None:
+            with self.lock:
+                field_index = self.layer_definition.GetFieldIndex(field_name)
+                values = []
+                for fid in self.fids:
+                    feature = self.layer.GetFeature(int(fid))
+                    values.append(feature.GetFieldAsString(field_index))
+            self.field_values[field_name] = values
+        return values
+
+    def candidates(self, x, y):
+        """Returns positions of features whose envelope contains a projected point"""
+        envelopes = self.envelopes
+        inside = ((envelopes[:, 0] <= x) & (envelopes[:, 1] >= x) &
+                  (envelopes[:, 2] <= y) & (envelopes[:, 3] >= y))
+        return numpy.flatnonzero(inside)
+
+    def match(self, x, y, predicate='Intersects', positions=None):
+        """Returns the position of the first feature (in FID order) matching a projected point, or None
+
+        positions optionally restricts the search to a subset of features.
+        """
+        pt = ogr.Geometry(ogr.wkbPoint)
+        pt.SetPoint_2D(0, x, y)
+        candidates = self.candidates(x, y)
+        if positions is not None:
+            candidates = numpy.intersect1d(candidates, positions)
+        for position in candidates:
+            geometry = self.geometry(position)
+            with self.lock:
+                matches = getattr(geometry, predicate)(pt)
+            if matches:
+                return position
+        return None
+
+    def find(self, lon, lat, predicate='Intersects'):
+        """Returns the position of the first feature (in FID order) matching a WGS84 point, or None
+
+        predicate is the OGR geometry method tested against the point
+        ("Intersects" matches a layer spatial filter, "Contains" excludes edges).
+        """
+        x, y = self.transform_point(lon, lat)
+        return self.match(x, y, predicate=predicate)
+
+    def lookup(self, points, field_name=None, predicate='Intersects'):
+        """Finds the matching feature for many WGS84 (lon, lat) points in one pass
+
+        Returns a list with, for each point, the value of field_name (or the
+        feature position if field_name is None), or None where nothing matches.
+        """
+        points = [(float(lon), float(lat)) for lon, lat in points]
+        if not points:
+            return []
+        with self.lock:
+            projected = self.ctran.TransformPoints(points)
+        results = [self.match(x, y, predicate=predicate) for x, y, z in projected]
+        if field_name is not None:
+            values = self.values(field_name)
+            results = [None if position is None else values[position] for position in results]
+        return results
+
+    def value_at(self, lon, lat, field_name, predicate='Intersects'):
+        """Returns field_name of the feature at a WGS84 point, or None"""
+        position = self.find(lon, lat, predicate=predicate)
+        if position is None:
+            return None
+        return self.values(field_name)[position]
+
+
+def sidecar_path(shapefile):
+    """Returns the path of the envelope/attribute index kept next to a shapefile"""
+    return os.path.splitext(shapefile)[0] + '.index.npz'
+
+
+def get_index(shapefile, index_fields=None):
+    """Returns the process-wide ShapefileIndex for a shapefile, loading it on first use
+
+    index_fields are attribute fields to keep in the on-disk sidecar, so later
+    processes load envelopes and codes without scanning the shapefile.
+    """
+    with INDEXES_LOCK:
+        index = INDEXES.get(shapefile)
+        if index is None:
+            index = ShapefileIndex(shapefile, index_fields=index_fields)
+            INDEXES[shapefile] = index
+        return index
+
+
 def check(lon, lat, shapefile, field_name):
-    # Load shapefile driver
-    ogr_shapefile_driver = ogr.GetDriverByName('ESRI Shapefile')
-    # Get shapefile contents
-    shapefile_contents = ogr_shapefile_driver.Open(shapefile, 0)
-    # Get first layer in shapefile_contents
-    shapefile_layer = shapefile_contents.GetLayer(0)
-    # Get field index value for supplied field_name
-    selected_field_index_value = shapefile_layer.GetLayerDefn().GetFieldIndex(field_name)
-
-    #If the latitude/longitude we're going to use is not in the projection
-    #of the shapefile, then we will get erroneous results.
-    #The following assumes that the latitude longitude is in WGS84
-    #This is identified by the number "4326", as in "EPSG:4326"
-    #We will create a transformation between this and the shapefile's
-    #project, whatever it may be
-    geo_ref = shapefile_layer.GetSpatialRef()
-    point_ref = ogr.osr.SpatialReference()
-    point_ref.ImportFromEPSG(4326)
-    ctran = ogr.osr.CoordinateTransformation(point_ref, geo_ref)
-
-    #Transform incoming longitude/latitude to the shapefile's projection
-    [lon, lat, z] = ctran.TransformPoint(lon, lat)
-
-    #Create a point
-    pt = ogr.Geometry(ogr.wkbPoint)
-    pt.SetPoint_2D(0, lon, lat)
-
-    #Set up a spatial filter such that the only features we see when we
-    #loop through "shapefile_layer" are those which overlap the point defined above
-    shapefile_layer.SetSpatialFilter(pt)
-
-    #Loop through the overlapped features and display the field of interest
-    for feat_in in shapefile_layer:
-        feature_intersecting_point = feat_in.GetFieldAsString(selected_field_index_value)
-        return feature_intersecting_point
+    """Returns field_name of the shapefile feature at a WGS84 point (None if there isn't one)"""
+    return get_index(shapefile).value_at(lon, lat, field_name)
 
 #Take command-line input and do all this
 #check(float(sys.argv[1]),float(sys.argv[2]))
@@ -0,0 +1,242 @@
+#  This software was developed by United States Army Corps of Engineers (USACE)
+#  employees in the course of their official duties.  USACE used copyrighted,
+#  open source code to develop this software, as such this software 
+#  (per 17 USC § 101) is considered "joint work."  Pursuant to 17 USC § 105,
+#  portions of the software developed by USACE employees in the course of their
+#  official duties are not subject to copyright protection and are in the public
+#  domain.
+#  
+#  USACE assumes no responsibility whatsoever for the use of this software by
+#  other parties, and makes no guarantees, expressed or implied, about its
+#  quality, reliability, or any other characteristic. 
+#  
+#  The software is provided "as is," without warranty of any kind, express or
+#  implied, including but not limited to the warranties of merchantability,
+#  fitness for a particular purpose, and noninfringement.  In no event shall the
+#  authors or U.S. Government be liable for any claim, damages or other
+#  liability, whether in an action of contract, tort or otherwise, arising from,
+#  out of or in connection with the software or the use or other dealings in the
+#  software.
+#  
+#  Public domain portions of this software can be redistributed and/or modified
+#  freely, provided that any derivative works bear some notice that they are
+#  derived from it, and any modified versions bear some notice that they have
+#  been modified. 
+#  
+#  Copyrighted portions of the software are annotated within the source code.
+#  Open Source Licenses, included in the source code, apply to the applicable
+#  copyrighted portions.  Copyrighted portions of the software are not in the
+#  public domain.
+
+
+
+
+######################################
+##  ------------------------------- ##
+##           sampling.py            ##
+##  ------------------------------- ##
+##     Written by: Jason Deters     ##
+##  ------------------------------- ##
+##    Last Edited on: 2026-10-18    ##
+##  ------------------------------- ##
+######################################
+
+"""
+Watershed sampling point generation.
+The watershed polygon's rings are read into numpy arrays once so candidate
+points can be tested for containment in batches (even-odd ray casting),
+and minimum spacing is enforced with Bridson's grid-based Poisson-disk
+algorithm instead of testing every candidate against every selected point.
+Point sets are reproducible when a seed is supplied.
+"""
+
+# Import Standard Libraries
+import math
+
+# Import 3rd Party Libraries
+import numpy
+
+# Bridson candidates drawn around each active point
+CANDIDATES_PER_POINT = 30
+# Random points tested across the envelope when looking for a new seed
+# (as before, sampling ends once this many in a row fail)
+SEED_ATTEMPTS = 1500
+# Limits the size of the (points x edges) arrays in contains()
+CONTAINS_BATCH_ELEMENTS = 4000000
+
+
+def geometry_rings(geometry):
+    """Returns the rings of an OGR (Multi)Polygon as a list of (n x 2) numpy arrays"""
+    rings = []
+    if geometry.GetGeometryCount() > 0:
+        for i in range(geometry.GetGeometryCount()):
+            rings.extend(geometry_rings(geometry.GetGeometryRef(i)))
+    elif geometry.GetPointCount() > 0:
+        rings.append(numpy.array(geometry.GetPoints(), dtype=float)[:, :2])
+    return rings
+
+
+class PreparedPolygon(object):
+    """Polygon edges held in numpy arrays for vectorized point-in-polygon tests
+
+    rings are (n x 2) arrays of x, y; holes and multiple parts are handled
+    by the even-odd rule, so rings can simply be listed together.
+    """
+    def __init__(self, rings):
+        starts = []
+        ends = []
+        for ring in rings:
+            ring = numpy.asarray(ring, dtype=float)
+            if len(ring) < 3:
+                continue
+            starts.append(ring)
+            ends.append(numpy.roll(ring, -1, axis=0))
+        starts = numpy.concatenate(starts) if starts else numpy.empty((0, 2))
+        ends = numpy.concatenate(ends) if ends else numpy.empty((0, 2))
+        # Horizontal edges never cross a horizontal ray
+        keep = starts[:, 1] != ends[:, 1]
+        self.x1 = starts[keep, 0]
+        self.y1 = starts[keep, 1]
+        self.x2 = ends[keep, 0]
+        self.y2 = ends[keep, 1]
+        self.slopes = (self.x2 - self.x1) / (self.y2 - self.y1)
+        if len(starts):
+            self.envelope = (starts[:, 0].min(), starts[:, 0].max(), starts[:, 1].min(), starts[:, 1].max())
+        else:
+            self.envelope = (0.0, 0.0, 0.0, 0.0)
+
+    @classmethod
+    def from_geometry(cls, geometry):
+        """Prepares an OGR (Multi)Polygon"""
+        return cls(geometry_rings(geometry))
+
+    def contains(self, xs, ys):
+        """Returns a boolean array, True where (xs, ys) falls inside the polygon"""
+        xs = numpy.atleast_1d(numpy.asarray(xs, dtype=float))
+        ys = numpy.atleast_1d(numpy.asarray(ys, dtype=float))
+        x_min, x_max, y_min, y_max = self.envelope
+        inside = numpy.zeros(len(xs), dtype=bool)
+        candidates = numpy.flatnonzero((xs >= x_min) & (xs <= x_max) & (ys >= y_min) & (ys <= y_max))
+        if not len(candidates) or not len(self.x1):
+            return inside
+        batch_size = max(1, CONTAINS_BATCH_ELEMENTS // len(self.x1))
+        for start in range(0, len(candidates), batch_size):
+            batch = candidates[start:start + batch_size]
+            px = xs[batch][:, numpy.newaxis]
+            py = ys[batch][:, numpy.newaxis]
+            # Edges straddling the point's y whose crossing lies to the right of the point
+            straddles = (self.y1 > py) != (self.y2 > py)
+            crossings = straddles & (px < self.x1 + (py - self.y1) * self.slopes)
+            inside[batch] = (numpy.count_nonzero(crossings, axis=1) % 2) == 1
+        return inside
+
+
+class PoissonDiskGrid(object):
+    """Background grid for Bridson's algorithm (cell size spacing / sqrt(2), so at most one point per cell)"""
+    def __init__(self, envelope, spacing):
+        self.spacing = float(spacing)
+        self.cell_size = self.spacing / math.sqrt(2)
+        self.x_min, x_max, self.y_min, y_max = envelope
+        self.columns = int((x_max - self.x_min) / self.cell_size) + 1
+        self.rows = int((y_max - self.y_min) / self.cell_size) + 1
+        self.cells = numpy.full((self.rows, self.columns), -1, dtype=numpy.int64)
+        self.points = []
+        # Points outside the grid's envelope (e.g. an observation point on the boundary)
+        self.outside = []
+
+    def cell(self, x, y):
+        return int((y - self.y_min) // self.cell_size), int((x - self.x_min) // self.cell_size)
+
+    def in_grid(self, row, column):
+        return 0 <= row < self.rows and 0 <= column < self.columns
+
+    def is_far_enough(self, x, y):
+        """True if no stored point lies within spacing of (x, y)"""
+        row, column = self.cell(x, y)
+        neighbours = self.cells[max(row - 2, 0):max(row + 3, 0), max(column - 2, 0):max(column + 3, 0)]
+        indexes = list(neighbours[neighbours >= 0]) + self.outside
+        for index in indexes:
+            other_x, other_y = self.points[index]
+            if (other_x - x) ** 2 + (other_y - y) ** 2 < self.spacing ** 2:
+                return False
+        return True
+
+    def add(self, x, y):
+        index = len(self.points)
+        self.points.append((x, y))
+        row, column = self.cell(x, y)
+        if self.in_grid(row, column):
+            self.cells[row, column] = index
+        else:
+            self.outside.append(index)
+        return index
+
+
+def poisson_disk_points(polygon, spacing, existing_points, random_state,
+                        candidates_per_point=CANDIDATES_PER_POINT, seed_attempts=SEED_ATTEMPTS):
+    """Returns new points inside polygon, at least spacing from each other and from existing_points
+
+    Bridson's algorithm grows outward from every existing point; when no active
+    point has room left, a batch of seed_attempts random points across the
+    envelope is tried for a new start (covering disconnected parts), and
+    sampling ends when none of them fits.
+    """
+    grid = PoissonDiskGrid(polygon.envelope, spacing)
+    for x, y in existing_points:
+        grid.add(x, y)
+    active = list(range(len(grid.points)))
+    new_points = []
+    x_min, x_max, y_min, y_max = polygon.envelope
+    while True:
+        while active:
+            active_position = random_state.randint(len(active))
+            x, y = grid.points[active[active_position]]
+            # Candidates in the annulus spacing - 2 x spacing around the active point
+            radii = spacing * numpy.sqrt(random_state.uniform(1, 4, candidates_per_point))
+            angles = random_state.uniform(0, 2 * math.pi, candidates_per_point)
+            candidate_xs = x + radii * numpy.cos(angles)
+            candidate_ys = y + radii * numpy.sin(angles)
+            inside = polygon.contains(candidate_xs, candidate_ys)
+            added = False
+            for candidate_x, candidate_y in zip(candidate_xs[inside], candidate_ys[inside]):
+                if grid.is_far_enough(candidate_x, candidate_y):
+                    active.append(grid.add(candidate_x, candidate_y))
+                    new_points.append((candidate_x, candidate_y))
+                    added = True
+                    break
+            if not added:
+                active.pop(active_position)
+        # Look for room the active points could not reach
+        seed_xs = random_state.uniform(x_min, x_max, seed_attempts)
+        seed_ys = random_state.uniform(y_min, y_max, seed_attempts)
+        inside = polygon.contains(seed_xs, seed_ys)
+        for seed_x, seed_y in zip(seed_xs[inside], seed_ys[inside]):
+            if grid.is_far_enough(seed_x, seed_y):
+                active.append(grid.add(seed_x, seed_y))
+                new_points.append((seed_x, seed_y))
+                break
+        if not active:
+            return new_points
+
+
+def sample_polygon(polygon, first_point, spacing, step_down, seed=None, min_points=3,
+                   seed_attempts=SEED_ATTEMPTS):
+    """Generates sampling points within a polygon, starting from first_point
+
+    polygon is a PreparedPolygon (or an OGR geometry), first_point, spacing and
+    step_down are in the polygon's linear units.  As with the original sampler,
+    while fewer than min_points (including first_point) have been selected the
+    spacing is lowered by step_down and sampling continues from the points
+    already selected.  Returns ((n x 2) array of points, first_point first,
+    and the spacing finally used).
+    """
+    if not isinstance(polygon, PreparedPolygon):
+        polygon = PreparedPolygon.from_geometry(polygon)
+    random_state = numpy.random.RandomState(seed)
+    points = [tuple(first_point)]
+    while True:
+        points += poisson_disk_points(polygon, spacing, points, random_state, seed_attempts=seed_attempts)
+        if len(points) >= min_points or spacing - step_down <= 0:
+            break
+        spacing = spacing - step_down
+    return numpy.array(points, dtype=float).reshape(-1, 2), spacing
@@ -0,0 +1,141 @@
+#  This software was developed by United States Army Corps of Engineers (USACE)
+#  employees in the course of their official duties.  USACE used copyrighted,
+#  open source code to develop this software, as such this software 
+#  (per 17 USC § 101) is considered "joint work."  Pursuant to 17 USC § 105,
+#  portions of the software developed by USACE employees in the course of their
+#  official duties are not subject to copyright protection and are in the public
+#  domain.
+#  
+#  USACE assumes no responsibility whatsoever for the use of this software by
+#  other parties, and makes no guarantees, expressed or implied, about its
+#  quality, reliability, or any other characteristic. 
+#  
+#  The software is provided "as is," without warranty of any kind, express or
+#  implied, including but not limited to the warranties of merchantability,
+#  fitness for a particular purpose, and noninfringement.  In no event shall the
+#  authors or U.S. Government be liable for any claim, damages or other
+#  liability, whether in an action of contract, tort or otherwise, arising from,
+#  out of or in connection with the software or the use or other dealings in the
+#  software.
+#  
+#  Public domain portions of this software can be redistributed and/or modified
+#  freely, provided that any derivative works bear some notice that they are
+#  derived from it, and any modified versions bear some notice that they have
+#  been modified. 
+#  
+#  Copyrighted portions of the software are annotated within the source code.
+#  Open Source Licenses, included in the source code, apply to the applicable
+#  copyrighted portions.  Copyrighted portions of the software are not in the
+#  public domain.
+
+
+
+
+######################################
+##  ------------------------------- ##
+##        sampling_cache.py         ##
+##  ------------------------------- ##
+##     Written by: Jason Deters     ##
+##  ------------------------------- ##
+##    Last Edited on: 2026-10-18    ##
+##  ------------------------------- ##
+######################################
+
+"""
+On-disk cache of watershed sampling points.
+Each generated point set is stored as a small JSON file keyed by the HUC code
+(or a hash of a custom watershed polygon), the starting spacing and the seed.
+Later runs on the same watershed reuse the stored points, so they skip
+sampling and hit the per-point WebWIMP, elevation and station caches.
+"""
+
+# Import Standard Libraries
+import os
+import re
+import json
+import hashlib
+
+# Import 3rd Party Libraries
+import numpy
+
+# Find module path
+MODULE_PATH = os.path.dirname(os.path.realpath(__file__))
+# Find ROOT folder
+ROOT = os.path.split(MODULE_PATH)[0]
+
+# Import Custom Libraries
+try:
+    from . import geodesy
+except Exception:
+    import geodesy
+
+CACHE_FOLDER = os.path.join(ROOT, 'cached', 'sampling_points')
+
+
+def ensure_dir(folder):
+    """Ensures a folder exists"""
+    if not os.path.exists(folder):
+        try:
+            os.makedirs(folder)
+        except Exception:
+            pass
+
+
+def huc_key(huc_digits, huc_string):
+    """Cache key for a WBD watershed"""
+    return 'HUC{}_{}'.format(huc_digits, huc_string)
+
+
+def polygon_key(geometry):
+    """Cache key for a custom watershed (SHA-1 of the OGR geometry's WKB)"""
+    return 'polygon_{}'.format(hashlib.sha1(bytes(geometry.ExportToWkb())).hexdigest())
+
+
+def cache_path(key, spacing_miles, seed, folder=CACHE_FOLDER):
+    """Returns the JSON file holding the point set for a key, starting spacing and seed"""
+    file_name = '{}_{}mi_seed-{}.json'.format(key, spacing_miles, seed)
+    return os.path.join(folder, re.sub(r'[^\w.\-]', '_', file_name))
+
+
+def load_points(key, spacing_miles, seed, folder=CACHE_FOLDER):
+    """Returns (points, used_spacing_miles) stored by save_points(), or None if there are none
+
+    points are [lat, lon] pairs and do not include the observation point
+    the set was originally generated from.
+    """
+    path = cache_path(key, spacing_miles, seed, folder=folder)
+    try:
+        with open(path, 'r') as json_file:
+            stored = json.load(json_file)
+        return stored['points'], stored['used_spacing_miles']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_points(key, spacing_miles, seed, points, used_spacing_miles, folder=CACHE_FOLDER):
+    """Stores a generated point set ([lat, lon] pairs, without the observation point)"""
+    ensure_dir(folder)
+    path = cache_path(key, spacing_miles, seed, folder=folder)
+    temp_path = path + '.tmp'
+    stored = {'key': key,
+              'spacing_miles': spacing_miles,
+              'seed': seed,
+              'used_spacing_miles': used_spacing_miles,
+              'points': [[float(lat), float(lon)] for lat, lon in points]}
+    try:
+        with open(temp_path, 'w') as json_file:
+            json.dump(stored, json_file)
+        os.replace(temp_path, path)
+    except OSError:
+        pass
+
+
+def with_observation_point(lat, lon, points, spacing_miles):
+    """Puts the observation point first and drops stored points closer to it than spacing_miles"""
+    coordinates = [[lat, lon]]
+    if points:
+        points = numpy.asarray(points, dtype=float).reshape(-1, 2)
+        distances = geodesy.great_circle_miles(lat, lon, points[:, 0], points[:, 1])
+        coordinates += [[point_lat, point_lon] for (point_lat, point_lon), distance
+                        in zip(points.tolist(), distances) if distance >= spacing_miles]
+    return coordinates
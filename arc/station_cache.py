@@ -0,0 +1,350 @@
+#  This software was developed by United States Army Corps of Engineers (USACE)
+#  employees in the course of their official duties.  USACE used copyrighted,
+#  open source code to develop this software, as such this software 
+#  (per 17 USC § 101) is considered "joint work."  Pursuant to 17 USC § 105,
+#  portions of the software developed by USACE employees in the course of their
+#  official duties are not subject to copyright protection and are in the public
+#  domain.
+#  
+#  USACE assumes no responsibility whatsoever for the use of this software by
+#  other parties, and makes no guarantees, expressed or implied, about its
+#  quality, reliability, or any other characteristic. 
+#  
+#  The software is provided "as is," without warranty of any kind, express or
+#  implied, including but not limited to the warranties of merchantability,
+#  fitness for a particular purpose, and noninfringement.  In no event shall the
+#  authors or U.S. Government be liable for any claim, damages or other
+#  liability, whether in an action of contract, tort or otherwise, arising from,
+#  out of or in connection with the software or the use or other dealings in the
+#  software.
+#  
+#  Public domain portions of this software can be redistributed and/or modified
+#  freely, provided that any derivative works bear some notice that they are
+#  derived from it, and any modified versions bear some notice that they have
+#  been modified. 
+#  
+#  Copyrighted portions of the software are annotated within the source code.
+#  Open Source Licenses, included in the source code, apply to the applicable
+#  copyrighted portions.  Copyrighted portions of the software are not in the
+#  public domain.
+
+
+
+
+######################################
+##  ------------------------------- ##
+##         station_cache.py         ##
+##  ------------------------------- ##
+##     Written by: Jason Deters     ##
+##  ------------------------------- ##
+##    Last Edited on: 2026-10-18    ##
+##  ------------------------------- ##
+######################################
+
+"""
+Keyed on-disk cache of downloaded weather station objects.
+Records are appended to a data file and located through an append-only index
+log (key, offset, length, timestamp), so saving a station never rewrites
+the others.  Reads come straight out of a memory map of the data file, and
+each record expires on its own schedule.  Superseded and expired records are
+dropped by compaction when they make up most of the file.  Separate runs
+share the cache through an OS file lock held while reading, appending and
+compacting; a run reloads the index when another has changed it.
+batch_engine's date workers open the cache read-only and hand their new
+records back to the process that started them.
+"""
+
+# Import Standard Libraries
+import os
+import sys
+import time
+import mmap
+import pickle
+import threading
+import contextlib
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+# Find module path
+MODULE_PATH = os.path.dirname(os.path.realpath(__file__))
+# Find ROOT folder
+ROOT = os.path.split(MODULE_PATH)[0]
+
+# Import Custom Libraries
+try:
+    from .utilities import JLog
+except Exception:
+    # Reverse compatibility step - Add utilities folder to path directly
+    PYTHON_SCRIPTS_FOLDER = os.path.join(ROOT, 'Python Scripts')
+    TEST = os.path.exists(PYTHON_SCRIPTS_FOLDER)
+    if TEST:
+        UTILITIES_FOLDER = os.path.join(PYTHON_SCRIPTS_FOLDER, 'utilities')
+        sys.path.append(UTILITIES_FOLDER)
+    else:
+        ARC_FOLDER = os.path.join(ROOT, 'arc')
+        UTILITIES_FOLDER = os.path.join(ARC_FOLDER, 'utilities')
+        sys.path.append(UTILITIES_FOLDER)
+    import JLog
+
+CACHE_FOLDER = os.path.join(ROOT, 'cached', 'station_cache')
+LEGACY_PICKLE_PATH = os.path.join(ROOT, 'cached', 'station_classes.pickle')
+EXPIRATION_HOURS = 12
+COMPACT_MIN_BYTES = 1048576     # Don't bother compacting files smaller than this
+COMPACT_LIVE_RATIO = 0.5        # Compact when less than this share of the file is live
+
+
+def ensure_dir(folder):
+    """Ensures a folder exists"""
+    if not os.path.exists(folder):
+        try:
+            os.makedirs(folder)
+        except Exception:
+            pass
+
+
+def station_key(data_type, station_id):
+    """Cache key for one station record"""
+    return '{}:{}'.format(data_type, station_id)
+
+
+@contextlib.contextmanager
+def file_lock(path):
+    """Holds an exclusive OS lock on path, shared by every process (nothing to lock if its folder is missing)"""
+    if not os.path.isdir(os.path.dirname(path)):
+        yield
+        return
+    with open(path, 'a+b') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass    # LK_LOCK gives up after 10 seconds - keep waiting
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class StationCache(object):
+    """Append-only, memory-mapped cache of station_manager.Main objects
+
+    A read_only cache never writes or compacts its files; put/put_many
+    collect records for take_pending instead.  self.lock guards the cache
+    between threads and the file lock (see locked) between processes.
+    """
+
+    def __init__(self, folder=CACHE_FOLDER, expiration_hours=EXPIRATION_HOURS, read_only=False):
+        self.log = JLog.PrintLog()
+        self.folder = folder
+        self.expiration_seconds = expiration_hours * 3600
+        self.data_path = os.path.join(folder, 'stations.dat')
+        self.index_path = os.path.join(folder, 'stations.idx')
+        self.lock_path = os.path.join(folder, 'stations.lock')
+        self.entries = {}   # key: (offset, length, timestamp)
+        self.index_state = None     # State of the index file self.entries was read from
+        self.lock = threading.Lock()
+        self.view = None
+        self.view_size = 0
+        self.read_only = read_only
+        self.pending = []
+        if not read_only:
+            ensure_dir(folder)
+        with self.locked():
+            self.read_index()
+        if read_only:
+            return
+        # The whole-file pickle this cache replaced is no longer read
+        if os.path.exists(LEGACY_PICKLE_PATH):
+            try:
+                os.remove(LEGACY_PICKLE_PATH)
+            except Exception:
+                pass
+        self.compact_if_needed()
+
+    def locked(self):
+        """Returns a context holding the cache's cross-process file lock"""
+        return file_lock(self.lock_path)
+
+    def current_index_state(self):
+        """Identity and size of the index file (changed by appends and compaction), or None"""
+        try:
+            stat = os.stat(self.index_path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime)
+
+    def refresh(self):
+        """Reloads the index if another process has appended to or compacted the cache (file lock held)"""
+        if self.current_index_state() != self.index_state:
+            self.read_index()
+
+    def read_index(self):
+        """Loads the latest entry for each key from the index log (file lock held)"""
+        self.entries = {}
+        # The data file may have been replaced since it was mapped
+        if self.view is not None:
+            self.view.close()
+            self.view = None
+            self.view_size = 0
+        self.index_state = self.current_index_state()
+        if self.index_state is None:
+            return
+        data_size = os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0
+        with open(self.index_path, 'r') as index_file:
+            for line in index_file:
+                fields = line.rstrip('\n').split('\t')
+                if len(fields) != 4:
+                    continue    # Partially written line
+                try:
+                    offset, length, timestamp = int(fields[1]), int(fields[2]), float(fields[3])
+                except ValueError:
+                    continue
+                if offset + length > data_size:
+                    continue    # Record never finished writing
+                self.entries[fields[0]] = (offset, length, timestamp)
+
+    def is_fresh(self, key):
+        """True if key has a record younger than the expiration time"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return False
+        return (time.time() - entry[2]) < self.expiration_seconds
+
+    def live_bytes(self):
+        """Total size of unexpired records"""
+        return sum(entry[1] for key, entry in self.entries.items() if self.is_fresh(key))
+
+    def _get_view(self, end):
+        """Returns a memory map covering at least the first end bytes of the data file"""
+        if self.view is None or self.view_size < end:
+            if self.view is not None:
+                self.view.close()
+            with open(self.data_path, 'rb') as data_file:
+                self.view = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.view_size = len(self.view)
+        return self.view
+
+    def get(self, key):
+        """Returns the cached object for key, or None if missing, expired or unreadable"""
+        with self.lock, self.locked():
+            self.refresh()
+            if not self.is_fresh(key):
+                return None
+            offset, length, timestamp = self.entries[key]
+            try:
+                view = self._get_view(offset + length)
+                return pickle.loads(view[offset:offset + length])
+            except Exception:
+                del self.entries[key]
+                return None
+
+    def put(self, key, obj):
+        """Appends one object to the cache"""
+        self.put_many([(key, obj)])
+
+    def put_many(self, items):
+        """Appends (key, object) pairs, leaving all other records untouched"""
+        if self.read_only:
+            self.pending.extend(items)
+            return
+        records = []
+        for key, obj in items:
+            try:
+                records.append((key, pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)))
+            except Exception:
+                self.log.Wrap('Could not cache station record {}'.format(key))
+        if not records:
+            return
+        with self.lock, self.locked():
+            # Append after whatever other processes have added
+            self.refresh()
+            timestamp = time.time()
+            index_lines = []
+            with open(self.data_path, 'ab') as data_file:
+                data_file.seek(0, os.SEEK_END)
+                for key, payload in records:
+                    offset = data_file.tell()
+                    data_file.write(payload)
+                    self.entries[key] = (offset, len(payload), timestamp)
+                    index_lines.append('{}\t{}\t{}\t{}\n'.format(key, offset, len(payload), timestamp))
+            with open(self.index_path, 'a') as index_file:
+                index_file.writelines(index_lines)
+            self.index_state = self.current_index_state()
+
+    def take_pending(self):
+        """Returns (and forgets) the (key, object) pairs put into a read_only cache"""
+        pending = self.pending
+        self.pending = []
+        return pending
+
+    def compact_if_needed(self):
+        """Compacts the cache if superseded or expired records dominate the data file"""
+        if not os.path.exists(self.data_path):
+            return
+        data_size = os.path.getsize(self.data_path)
+        if data_size >= COMPACT_MIN_BYTES and self.live_bytes() < data_size * COMPACT_LIVE_RATIO:
+            self.compact()
+
+    def compact(self):
+        """Rewrites the cache with only the latest unexpired record for each key"""
+        if self.read_only:
+            return
+        self.log.Wrap('Compacting cached station records...')
+        with self.lock, self.locked():
+            # Keep the records other processes have added
+            self.refresh()
+            if self.view is not None:
+                self.view.close()
+                self.view = None
+                self.view_size = 0
+            # Unique per process, so leftovers of another run are never reused
+            temp_data_path = '{}.{}.tmp'.format(self.data_path, os.getpid())
+            temp_index_path = '{}.{}.tmp'.format(self.index_path, os.getpid())
+            new_entries = {}
+            with open(self.data_path, 'rb') as old_file, open(temp_data_path, 'wb') as data_file, \
+                    open(temp_index_path, 'w') as index_file:
+                for key, (offset, length, timestamp) in sorted(self.entries.items(), key=lambda x: x[1][0]):
+                    if (time.time() - timestamp) >= self.expiration_seconds:
+                        continue
+                    old_file.seek(offset)
+                    payload = old_file.read(length)
+                    new_offset = data_file.tell()
+                    data_file.write(payload)
+                    new_entries[key] = (new_offset, length, timestamp)
+                    index_file.write('{}\t{}\t{}\t{}\n'.format(key, new_offset, length, timestamp))
+            try:
+                os.replace(temp_data_path, self.data_path)
+            except OSError:
+                # Another run still has the data file open (Windows) - compact another time
+                self.log.Wrap('Cached station records are in use; compaction skipped.')
+                for temp_path in [temp_data_path, temp_index_path]:
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+                return
+            # The index file is only ever opened under the file lock, so this can't be blocked
+            os.replace(temp_index_path, self.index_path)
+            self.entries = new_entries
+            self.index_state = self.current_index_state()
+
+    def close(self):
+        """Releases the memory map"""
+        with self.lock:
+            if self.view is not None:
+                self.view.close()
+                self.view = None
+                self.view_size = 0
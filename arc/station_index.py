@@ -0,0 +1,143 @@
+#  This software was developed by United States Army Corps of Engineers (USACE)
+#  employees in the course of their official duties.  USACE used copyrighted,
+#  open source code to develop this software, as such this software 
+#  (per 17 USC § 101) is considered "joint work."  Pursuant to 17 USC § 105,
+#  portions of the software developed by USACE employees in the course of their
+#  official duties are not subject to copyright protection and are in the public
+#  domain.
+#  
+#  USACE assumes no responsibility whatsoever for the use of this software by
+#  other parties, and makes no guarantees, expressed or implied, about its
+#  quality, reliability, or any other characteristic. 
+#  
+#  The software is provided "as is," without warranty of any kind, express or
+#  implied, including but not limited to the warranties of merchantability,
+#  fitness for a particular purpose, and noninfringement.  In no event shall the
+#  authors or U.S. Government be liable for any claim, damages or other
+#  liability, whether in an action of contract, tort or otherwise, arising from,
+#  out of or in connection with the software or the use or other dealings in the
+#  software.
+#  
+#  Public domain portions of this software can be redistributed and/or modified
+#  freely, provided that any derivative works bear some notice that they are
+#  derived from it, and any modified versions bear some notice that they have
+#  been modified. 
+#  
+#  Copyrighted portions of the software are annotated within the source code.
+#  Open Source Licenses, included in the source code, apply to the applicable
+#  copyrighted portions.  Copyrighted portions of the software are not in the
+#  public domain.
+
+
+
+
+######################################
+##  ------------------------------- ##
+##         station_index.py         ##
+##  ------------------------------- ##
+##     Written by: Jason Deters     ##
+##  ------------------------------- ##
+##    Last Edited on: 2026-10-18    ##
+##  ------------------------------- ##
+######################################
+
+"""
+Spatial index over the GHCN-Daily station inventory.
+Station coordinates are held in latitude-sorted arrays so a radius query only
+examines the latitude band that can contain matches, then measures
+great-circle distances for every candidate and every query point at once.
+Building it takes a single argsort, so it is built in memory from the
+inventory each run rather than saved.
+"""
+
+# Import 3rd Party Libraries
+import numpy
+
+# Import Custom Libraries
+try:
+    from . import geodesy
+except Exception:
+    import geodesy
+
+# Slightly generous so the bands never exclude a station the distance test would accept
+MILES_PER_DEGREE_LATITUDE = 69.0
+LON_PAD_DEGREES = 0.01
+
+
+class StationIndex(object):
+    """Latitude-sorted coordinate index of a station inventory DataFrame"""
+
+    def __init__(self, station_ids, latitudes, longitudes):
+        self.station_ids = numpy.asarray(station_ids)
+        self.latitudes = numpy.asarray(latitudes, dtype=float)
+        self.longitudes = numpy.asarray(longitudes, dtype=float)
+        # Inventory positions sorted by latitude, and the sorted latitudes for searchsorted
+        self.order = numpy.argsort(self.latitudes, kind='mergesort')
+        self.sorted_latitudes = self.latitudes[self.order]
+
+    def __len__(self):
+        return len(self.station_ids)
+
+    @classmethod
+    def from_dataframe(cls, station_list):
+        """Builds an index from a ulmo-style station DataFrame (index = station ID)"""
+        return cls(station_ids=station_list.index.values.astype(str),
+                   latitudes=station_list['latitude'].values,
+                   longitudes=station_list['longitude'].values)
+
+    def candidates(self, points, radius_miles):
+        """Returns inventory positions inside the lat/lon band that could be within radius of any point"""
+        points = numpy.asarray(points, dtype=float).reshape(-1, 2)
+        lat_buffer = radius_miles / MILES_PER_DEGREE_LATITUDE
+        min_lat = points[:, 0].min() - lat_buffer
+        max_lat = points[:, 0].max() + lat_buffer
+        start = numpy.searchsorted(self.sorted_latitudes, min_lat, side='left')
+        stop = numpy.searchsorted(self.sorted_latitudes, max_lat, side='right')
+        positions = self.order[start:stop]
+        # Longitude half-width of a circle of this radius, taken at the most poleward point
+        angular_radius = radius_miles * geodesy.KM_PER_MILE / geodesy.EARTH_RADIUS_KM
+        cos_lat = numpy.cos(numpy.radians(numpy.abs(points[:, 0]).max()))
+        if max_lat >= 90 or min_lat <= -90 or angular_radius >= numpy.pi / 2 or numpy.sin(angular_radius) >= cos_lat:
+            return numpy.sort(positions)
+        lon_buffer = numpy.degrees(numpy.arcsin(numpy.sin(angular_radius) / cos_lat)) + LON_PAD_DEGREES
+        lons = self.longitudes[positions]
+        keep = numpy.zeros(len(positions), dtype=bool)
+        for point_lon in numpy.unique(points[:, 1]):
+            delta = numpy.abs(((lons - point_lon) + 180.0) % 360.0 - 180.0)
+            keep |= delta <= lon_buffer
+        return numpy.sort(positions[keep])
+
+    def query_radius(self, site, radius_miles, sampling_points=None, min_radius_miles=None):
+        """Finds stations within radius_miles
+
+        Without sampling_points, a station is included if it is within
+        radius_miles of site.  With sampling_points (watershed analysis), it is
+        included if it is within radius_miles of any sampling point.  If
+        min_radius_miles is given, stations that would already have been found
+        at that radius are left out (only the annulus is returned).
+
+        Returns (positions, site_distances): inventory positions in inventory
+        order, and the great-circle distance in miles of each from site.
+        """
+        site = (float(site[0]), float(site[1]))
+        if sampling_points is None:
+            query_points = numpy.array([site])
+        else:
+            query_points = numpy.asarray(sampling_points, dtype=float).reshape(-1, 2)
+        positions = self.candidates(query_points, radius_miles)
+        lats = self.latitudes[positions]
+        lons = self.longitudes[positions]
+        site_distances = geodesy.great_circle_miles(site[0], site[1], lats, lons)
+        if sampling_points is None:
+            nearest_distances = site_distances
+        else:
+            nearest_distances = geodesy.distance_matrix(query_points, numpy.column_stack([lats, lons])).min(axis=0)
+        include = nearest_distances < radius_miles
+        if min_radius_miles is not None:
+            include &= ~(nearest_distances < min_radius_miles)
+        return positions[include], site_distances[include]
+
+
+def get_station_index(station_list):
+    """Builds the spatial index of a station inventory DataFrame"""
+    return StationIndex.from_dataframe(station_list)
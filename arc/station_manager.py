@@ -35,7 +35,7 @@
 ##  ------------------------------- ##
 ##     Written by: Jason Deters     ##
 ##  ------------------------------- ##
-##    Last Edited on: 2020-05-27    ##
+##    Last Edited on: 2026-10-18    ##
 ##  ------------------------------- ##
 ######################################
 
@@ -49,13 +49,11 @@ by selected type and date range.
 # Import built-in modules
 import os
 import sys
-import traceback
 import time
 
 # Import third-party modules
-from geopy.distance import great_circle
-import ulmo
 import numpy
+import pandas
 
 # Find module path
 MODULE_PATH = os.path.dirname(os.path.realpath(__file__))
@@ -64,8 +62,12 @@ ROOT = os.path.split(MODULE_PATH)[0]
 
 # Import custom modules from Utilities folder
 try:
+    from . import geodesy
+    from . import ghcn_store
     from .utilities import JLog
 except Exception:
+    import geodesy
+    import ghcn_store
     # Reverse compatibility step - Add utilities folder to path directly
     PYTHON_SCRIPTS_FOLDER = os.path.join(ROOT, 'Python Scripts')
     TEST = os.path.exists(PYTHON_SCRIPTS_FOLDER)
@@ -103,10 +105,11 @@ class Constructor(object):
         self.EndDate = EndDate
         self.currentRollingStartDate = currentRollingStartDate
 
-    def __call__(self):
+    def __call__(self, session=None):
         aclass = Main(self.dataType, self.index, self.name, self.location, self.locationTuple,
                       self.elevation, self.distance, self.elevDiff, self.weightedDiff,
-                      self.StartDate, self.EndDate, self.currentRollingStartDate)
+                      self.StartDate, self.EndDate, self.currentRollingStartDate,
+                      session=session)
         return aclass
 
 
@@ -119,8 +122,9 @@ class Main(object):
     """
     def __init__(self, dataType, index, name, location, locationTuple, elevation,
                  distance, elevDiff, weightedDiff, StartDate, EndDate,
-                 currentRollingStartDate):
+                 currentRollingStartDate, session=None):
         self.L = JLog.PrintLog()
+        self.session = session
         self.dataType = dataType
         self.index = index
         self.name = str(name)
@@ -134,22 +138,53 @@ class Main(object):
         self.EndDate = EndDate
         self.currentRollingStartDate = currentRollingStartDate
         self.data = None
-        self.Values = None
+        # Full record (normalized once) and the current date range window of it
+        self.record_dates = None
+        self.record_values = None
+        self.window_dates = None
+        self.window_values = None
+        self._values_series = None
         self.actual_rows = 0
         self.current_actual_rows = 0
         self.run()
     # End of __init__
 
+    def __getstate__(self):
+        """Excludes the shared HTTP session and the rebuildable Values series when pickling"""
+        state = self.__dict__.copy()
+        state['session'] = None
+        state['_values_series'] = None
+        return state
+
+    def __setstate__(self, state):
+        state.setdefault('session', None)
+        # Stations pickled before the record arrays existed carry a Values series instead
+        state.pop('Values', None)
+        state['_values_series'] = None
+        self.__dict__.update(state)
+        if 'record_dates' not in state:
+            self.normalize_data()
+            self.trimData()
+
+    @property
+    def Values(self):
+        """Current date range window as a pandas Series (built on first use)"""
+        if self._values_series is None and self.window_values is not None:
+            self._values_series = pandas.Series(self.window_values,
+                                                index=pandas.DatetimeIndex(self.window_dates),
+                                                name='value')
+        return self._values_series
+
     def run(self):
-        """Download All Station Data and send it to the trimData function"""
+        """Load All Station Data from the local store and send it to the trimData function"""
         tries = 5
         while tries > 0:
             try:
-                self.data = ulmo.ncdc.ghcn_daily.get_data(self.index,
-                                                          elements=self.dataType,
-                                                          update=True,
-                                                          as_dataframe=True)
+                self.data = ghcn_store.get_data(self.index,
+                                                elements=self.dataType,
+                                                session=self.session)
                 tries = 0
+                self.normalize_data()
                 self.trimData()
             except Exception:
                 #self.L.Write(traceback.format_exc())
@@ -157,71 +192,71 @@ class Main(object):
                 time.sleep(2)
     # End of Run
 
+    def normalize_data(self):
+        """Stores the full dataType record once as sorted dates and float values (missing days dropped)"""
+        self.record_dates = None
+        self.record_values = None
+        if self.data is None:
+            return
+        try:
+            series = self.data[self.dataType]['value']
+        except KeyError:
+            self.L.Write('The station "{}" lacked PRCP data (Likely a server-side glitch)'.format(self.name))
+            keys = self.data.keys()
+            self.L.Write('  For debugging: The following data types were found: {}'.format(keys))
+            return
+        index = series.index
+        if isinstance(index, pandas.PeriodIndex):
+            index = index.to_timestamp()
+        values = numpy.asarray(pandas.to_numeric(series.replace('', numpy.nan), errors='coerce'), dtype=float)
+        dates = numpy.asarray(index.values, dtype='datetime64[D]')
+        keep = ~numpy.isnan(values)
+        dates = dates[keep]
+        values = values[keep]
+        if len(dates) > 1 and (dates[1:] < dates[:-1]).any():
+            order = numpy.argsort(dates, kind='mergesort')
+            dates = dates[order]
+            values = values[order]
+        self.record_dates = dates
+        self.record_values = values
+
     def trimData(self):
         """Trims data to current date range"""
-        self.Values = None
+        self.window_dates = None
+        self.window_values = None
+        self._values_series = None
         self.actual_rows = 0
         self.current_actual_rows = 0
-        # GET VALUES
-        try:
-            # Copying prcp data
-            try:
-                df_copy = self.data[self.dataType].copy()
-            except KeyError:
-                self.L.Write('The station "{}" lacked PRCP data (Likely a server-side glitch)'.format(self.name))
-                keys = self.data.keys()
-                self.L.Write('  For debugging: The following data types were found: {}'.format(keys))
+        if self.record_dates is None:
+            return
+        # Slicing relevant rows
+        start = numpy.searchsorted(self.record_dates, numpy.datetime64(self.StartDate, 'D'), side='left')
+        stop = numpy.searchsorted(self.record_dates, numpy.datetime64(self.EndDate, 'D'), side='right')
+        self.window_dates = self.record_dates[start:stop]
+        self.window_values = self.record_values[start:stop]
+        num_rows = len(self.window_values)
+        # Filter out any station with a year with no precipitation
+        if self.dataType == 'PRCP':
+            if whole_year_of_zeros(self.window_values):
+                self.L.Wrap("Whole year of Zeros!  ---Excluding This Dataset---")
                 num_rows = 0
-            try:
-                # Slicing relevant rows
-                self.Values = df_copy.loc[self.StartDate:self.EndDate, 'value']
-                del df_copy
-                self.Values.replace('', numpy.nan, inplace=True)
-                self.Values.dropna(inplace=True)
-                # Index Values and count rows
-                self.Values.index = self.Values.index.to_timestamp()
-                num_rows = len(self.Values.index)
-                # Filter out any station with a year with no precipitation
-                if self.dataType == 'PRCP':
-                    days = 365
-                    daySum = 0
-                    for row in self.Values.iteritems():
-                        if days < 1:
-                            if daySum < 1:
-                                self.L.Wrap("Whole year of Zeros!  ---Excluding This Dataset---")
-                                num_rows = 0
-                                break
-                            days = 365
-                            daySum = 0
-                        days -= 1
-                        daySum += row[1]
-            except UnboundLocalError:
-                print("UnboundLocalError")
-                pass
-            if num_rows > 1:
-                num_null = self.Values.isnull().sum().sum()
-                self.actual_rows = num_rows - num_null
-                # Slicing just current year rows to perform separate tests
-                df_copy = self.Values.copy()
-                current_values = df_copy.loc[self.currentRollingStartDate:self.EndDate]
-                current_values.replace('', numpy.nan, inplace=True)
-                current_values.dropna(inplace=True)
-                current_num_rows = len(current_values.index)
-                test = current_num_rows > 1
-                if test:
-                    current_num_null = current_values.isnull().sum().sum()
-                    self.current_actual_rows = current_num_rows - current_num_null
-                del df_copy
-        except Exception as exc_str:
-#            self.L.Write(traceback.format_exc())
-            self.L.Write(exc_str)
+        if num_rows > 1:
+            self.actual_rows = num_rows
+            # Counting just current year rows to perform separate tests
+            current_start = numpy.searchsorted(self.window_dates,
+                                               numpy.datetime64(self.currentRollingStartDate, 'D'),
+                                               side='left')
+            current_num_rows = num_rows - current_start
+            if current_num_rows > 1:
+                self.current_actual_rows = current_num_rows
     # End of trimData
 
     def updateValues(self, site_loc, site_elev, StartDate, EndDate, currentRollingStartDate):
         """Updates station values based on new location and date range"""
-        self.distance = round(great_circle(site_loc, self.locationTuple).miles, 3)
+        distance = geodesy.great_circle_miles(site_loc[0], site_loc[1], self.locationTuple[0], self.locationTuple[1])
+        self.distance = round(float(distance), 3)
         self.elevDiff = round(abs(site_elev - self.elevation), 3)
-        self.weightedDiff = round(self.distance*((self.elevDiff/1000)+0.45), 3)
+        self.weightedDiff = round(geodesy.weighted_difference(self.distance, self.elevDiff), 3)
         self.StartDate = StartDate
         self.EndDate = EndDate
         self.currentRollingStartDate = currentRollingStartDate
@@ -237,6 +272,38 @@ class Main(object):
         return '{}'.format(self.name)
 
 
+def whole_year_of_zeros(values, days=365):
+    """Tests consecutive 365-record blocks for a total below 1
+
+    Matches the original record-by-record scan: block k (records
+    k*365 to k*365+364) is only tested if a record follows it.
+    """
+    num_checks = (len(values) - 1) // days
+    if num_checks < 1:
+        return False
+    block_sums = numpy.asarray(values[:num_checks * days], dtype=float).reshape(num_checks, days).sum(axis=1)
+    return bool((block_sums < 1).any())
+
+
+def update_stations(stations, site_loc, site_elev, StartDate, EndDate, currentRollingStartDate):
+    """Equivalent to calling updateValues on each station, with the distances calculated in one array operation"""
+    if not stations:
+        return
+    station_coords = [station.locationTuple for station in stations]
+    station_elevations = [station.elevation for station in stations]
+    distances = geodesy.round_values(geodesy.distance_matrix([site_loc], station_coords)[0], 3)
+    elev_diffs = geodesy.round_values(geodesy.elevation_differences([site_elev], station_elevations)[0], 3)
+    weighted_diffs = geodesy.round_values(geodesy.weighted_difference(distances, elev_diffs), 3)
+    for station, distance, elevDiff, weightedDiff in zip(stations, distances.tolist(), elev_diffs.tolist(), weighted_diffs.tolist()):
+        station.distance = distance
+        station.elevDiff = elevDiff
+        station.weightedDiff = weightedDiff
+        station.StartDate = StartDate
+        station.EndDate = EndDate
+        station.currentRollingStartDate = currentRollingStartDate
+        station.trimData()
+
+
 ########################################################################
 
 if __name__ == '__main__':
@@ -0,0 +1,137 @@
+#  This software was developed by United States Army Corps of Engineers (USACE)
+#  employees in the course of their official duties.  USACE used copyrighted,
+#  open source code to develop this software, as such this software 
+#  (per 17 USC § 101) is considered "joint work."  Pursuant to 17 USC § 105,
+#  portions of the software developed by USACE employees in the course of their
+#  official duties are not subject to copyright protection and are in the public
+#  domain.
+#  
+#  USACE assumes no responsibility whatsoever for the use of this software by
+#  other parties, and makes no guarantees, expressed or implied, about its
+#  quality, reliability, or any other characteristic. 
+#  
+#  The software is provided "as is," without warranty of any kind, express or
+#  implied, including but not limited to the warranties of merchantability,
+#  fitness for a particular purpose, and noninfringement.  In no event shall the
+#  authors or U.S. Government be liable for any claim, damages or other
+#  liability, whether in an action of contract, tort or otherwise, arising from,
+#  out of or in connection with the software or the use or other dealings in the
+#  software.
+#  
+#  Public domain portions of this software can be redistributed and/or modified
+#  freely, provided that any derivative works bear some notice that they are
+#  derived from it, and any modified versions bear some notice that they have
+#  been modified. 
+#  
+#  Copyrighted portions of the software are annotated within the source code.
+#  Open Source Licenses, included in the source code, apply to the applicable
+#  copyrighted portions.  Copyrighted portions of the software are not in the
+#  public domain.
+
+
+
+
+######################################
+##  ------------------------------- ##
+##         station_merge.py         ##
+##  ------------------------------- ##
+##     Written by: Jason Deters     ##
+##  ------------------------------- ##
+##    Last Edited on: 2026-10-18    ##
+##  ------------------------------- ##
+######################################
+
+"""
+Gap-filling merge of weather station records onto one daily series.
+Values are held in a float64 array aligned to a fixed daily date range with a
+boolean missing mask.  Each station only fills days that are still missing,
+and the number of days it filled inside each named window (e.g. the Normal
+and Antecedent periods) is counted as it is merged, so the station table can
+be built without re-scanning the series.
+"""
+
+# Import 3rd Party Libraries
+import numpy
+import pandas
+
+DAY = numpy.timedelta64(1, 'D')
+
+
+class MergeEngine(object):
+    """Daily series filled station-by-station, tracking missing days per window"""
+
+    def __init__(self, start_date, end_date, windows):
+        """
+        Arguments:
+            start_date, end_date -- date strings bounding the merged series (inclusive)
+            windows -- dict of window name: (start date string, end date string),
+                       inclusive like label slicing of a pandas Series
+        """
+        self.index = pandas.date_range(start=start_date, end=end_date, freq='D')
+        self.start = numpy.datetime64(self.index[0].date(), 'D')
+        self.values = numpy.full(len(self.index), numpy.nan)
+        self.missing = numpy.ones(len(self.index), dtype=bool)
+        self.windows = {}
+        for name, (window_start, window_end) in windows.items():
+            first = self.index.searchsorted(pandas.Timestamp(window_start), side='left')
+            stop = self.index.searchsorted(pandas.Timestamp(window_end), side='right')
+            self.windows[name] = slice(first, stop)
+        self.window_missing = dict((name, int(self.missing[window].sum())) for name, window in self.windows.items())
+        self.total_missing = len(self.index)
+
+    def positions(self, dates):
+        """Returns positions of dates in the merged series (-1 where outside it)"""
+        days = (numpy.asarray(dates, dtype='datetime64[D]') - self.start) // DAY
+        days[(days < 0) | (days >= len(self.index))] = -1
+        return days
+
+    def _apply(self, positions, values):
+        """Fills missing days at positions with values; returns filled count per window"""
+        fill = numpy.zeros(len(self.index), dtype=bool)
+        fill[positions] = True
+        fill &= self.missing
+        new_values = numpy.full(len(self.index), numpy.nan)
+        new_values[positions] = values
+        self.values[fill] = new_values[fill]
+        self.missing[fill] = False
+        self.total_missing -= int(fill.sum())
+        filled = {}
+        for name, window in self.windows.items():
+            filled[name] = int(fill[window].sum())
+            self.window_missing[name] -= filled[name]
+        return filled
+
+    def fill(self, series):
+        """Fills missing days from a date-indexed station series (like Series.fillna)
+
+        Returns a dict of window name: number of days this series filled.
+        Raises ValueError if there is no series or it cannot be aligned (duplicate dates).
+        """
+        if series is None:
+            raise ValueError('no values to fill with')
+        if len(series) == 0:
+            return dict((name, 0) for name in self.windows)
+        if not series.index.is_unique:
+            raise ValueError('cannot align a series with duplicate dates')
+        values = numpy.asarray(series.values, dtype=float)
+        positions = self.positions(series.index.values)
+        keep = (positions >= 0) & ~numpy.isnan(values)
+        return self._apply(positions[keep], values[keep])
+
+    def interpolate(self):
+        """Fills remaining gaps by time-weighted linear interpolation
+
+        Returns a dict of window name: number of days filled.
+        """
+        interp = self.to_series()
+        try:
+            interp.interpolate(method="time", inplace=True)
+        except Exception:
+            interp.interpolate(inplace=True)
+        values = interp.values
+        positions = numpy.flatnonzero(self.missing & ~numpy.isnan(values))
+        return self._apply(positions, values[positions])
+
+    def to_series(self):
+        """Returns the merged values as a daily pandas Series"""
+        return pandas.Series(self.values.copy(), index=self.index, name='value')
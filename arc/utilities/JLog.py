@@ -226,7 +226,7 @@ class PrintLog(object):
         return
 
     def Time(self, StartTime, Task):
-        elapsed_time = time.clock() - StartTime
+        elapsed_time = time.time() - StartTime
         if elapsed_time < 61:
             seconds = str(int(elapsed_time))
             time_str = "{} took {} seconds to complete".format(Task, seconds)
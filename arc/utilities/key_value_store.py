@@ -0,0 +1,141 @@
+#  This software was developed by United States Army Corps of Engineers (USACE)
+#  employees in the course of their official duties.  USACE used copyrighted,
+#  open source code to develop this software, as such this software 
+#  (per 17 USC § 101) is considered "joint work."  Pursuant to 17 USC § 105,
+#  portions of the software developed by USACE employees in the course of their
+#  official duties are not subject to copyright protection and are in the public
+#  domain.
+#  
+#  USACE assumes no responsibility whatsoever for the use of this software by
+#  other parties, and makes no guarantees, expressed or implied, about its
+#  quality, reliability, or any other characteristic. 
+#  
+#  The software is provided "as is," without warranty of any kind, express or
+#  implied, including but not limited to the warranties of merchantability,
+#  fitness for a particular purpose, and noninfringement.  In no event shall the
+#  authors or U.S. Government be liable for any claim, damages or other
+#  liability, whether in an action of contract, tort or otherwise, arising from,
+#  out of or in connection with the software or the use or other dealings in the
+#  software.
+#  
+#  Public domain portions of this software can be redistributed and/or modified
+#  freely, provided that any derivative works bear some notice that they are
+#  derived from it, and any modified versions bear some notice that they have
+#  been modified. 
+#  
+#  Copyrighted portions of the software are annotated within the source code.
+#  Open Source Licenses, included in the source code, apply to the applicable
+#  copyrighted portions.  Copyrighted portions of the software are not in the
+#  public domain.
+
+
+######################################
+##  ------------------------------- ##
+##       key_value_store.py         ##
+##  ------------------------------- ##
+##      Writen by: Jason Deters     ##
+##  ------------------------------- ##
+##    Last Edited on:  2026-10-18   ##
+##  ------------------------------- ##
+######################################
+
+"""
+Small persistent key/value store on SQLite (write-ahead logging).
+Values are JSON encoded.  Each thread gets its own connection, writes are
+committed immediately and readers never block the writer, so the store can
+be shared by worker threads and by several copies of the tool at once.
+"""
+
+# Import Standard Libraries
+import os
+import json
+import sqlite3
+import threading
+
+# SQLite limits the number of bound parameters per statement
+MAX_VARIABLES = 900
+
+
+def ensure_dir(folder):
+    """Ensures a folder exists"""
+    if folder and not os.path.exists(folder):
+        try:
+            os.makedirs(folder)
+        except Exception:
+            pass
+
+
+class KeyValueStore(object):
+    """Persistent dict-like store of JSON values keyed by strings"""
+
+    def __init__(self, path, table='store'):
+        self.path = path
+        self.table = table
+        self.local = threading.local()
+        ensure_dir(os.path.dirname(path))
+        connection = self.connection()
+        with connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS "{}" (key TEXT PRIMARY KEY, value TEXT NOT NULL)'.format(table))
+
+    def connection(self):
+        """Returns this thread's connection, opening it on first use"""
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self.local.connection = connection
+        return connection
+
+    def get(self, key, default=None):
+        """Returns the value stored for key (or default)"""
+        row = self.connection().execute('SELECT value FROM "{}" WHERE key = ?'.format(self.table), (key,)).fetchone()
+        if row is None:
+            return default
+        return json.loads(row[0])
+
+    def get_many(self, keys):
+        """Returns a dict of the stored values for whichever keys exist"""
+        keys = list(keys)
+        found = {}
+        for start in range(0, len(keys), MAX_VARIABLES):
+            chunk = keys[start:start + MAX_VARIABLES]
+            query = 'SELECT key, value FROM "{}" WHERE key IN ({})'.format(self.table, ','.join('?' * len(chunk)))
+            for key, value in self.connection().execute(query, chunk):
+                found[key] = json.loads(value)
+        return found
+
+    def put(self, key, value):
+        """Stores value for key (replacing any previous value)"""
+        self.put_many({key: value})
+
+    def put_many(self, items):
+        """Stores every key/value pair of a dict in one transaction"""
+        rows = [(key, json.dumps(value)) for key, value in items.items()]
+        if not rows:
+            return
+        connection = self.connection()
+        with connection:
+            connection.executemany('INSERT OR REPLACE INTO "{}" (key, value) VALUES (?, ?)'.format(self.table), rows)
+
+    def __contains__(self, key):
+        return self.connection().execute('SELECT 1 FROM "{}" WHERE key = ?'.format(self.table), (key,)).fetchone() is not None
+
+    def __len__(self):
+        return self.connection().execute('SELECT COUNT(*) FROM "{}"'.format(self.table)).fetchone()[0]
+
+    def items(self):
+        """Yields every stored (key, value) pair"""
+        for key, value in self.connection().execute('SELECT key, value FROM "{}"'.format(self.table)):
+            yield key, json.loads(value)
+
+    def keys(self):
+        """Returns every stored key"""
+        return [row[0] for row in self.connection().execute('SELECT key FROM "{}"'.format(self.table))]
+
+    def close(self):
+        """Closes this thread's connection"""
+        connection = getattr(self.local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self.local.connection = None
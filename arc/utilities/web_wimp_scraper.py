@@ -34,14 +34,15 @@
 ##  ------------------------------- ##
 ##      Writen by: Jason Deters     ##
 ##  ------------------------------- ##
-##    Last Edited on:  2020-05-27   ##
+##    Last Edited on:  2026-10-18   ##
 ##  ------------------------------- ##
 ######################################
 
 """
 Web-Scrapes WebWIMP:
-The Web-based, Water-Budget, Interactive, Modeling Program using
-Selenium to operate the JavaScript forms at "http://climate.geog.udel.edu/~wimp/index.html"
+The Web-based, Water-Budget, Interactive, Modeling Program by submitting
+the forms at "http://climate.geog.udel.edu/~wimp/index.html" directly over HTTP,
+falling back to Selenium (operating the forms in Chrome) when that fails
 
 Parses WebWIMP data for specific monthly values and determine Wet or Dry
 season using instructions from the Regional Supplement copied below:
@@ -79,26 +80,65 @@ Wetlands that periodically lack indicators of wetland hydrology:
 
 # Import Standard Libraries
 import os
-import sys
 import time
 import traceback
 import datetime
 import subprocess
 import pickle
+import queue
+import threading
+try:
+    from urllib.parse import urljoin
+except ImportError:
+    from urlparse import urljoin
 
 # Import Third-Party Libraries
-from selenium import webdriver
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.by import By
-from win32api import GetFileVersionInfo, LOWORD, HIWORD
+import requests
+from bs4 import BeautifulSoup
+# Selenium and win32api are only needed for the web-browser fallback
+try:
+    from selenium import webdriver
+    from selenium.webdriver.common.keys import Keys
+    from selenium.webdriver.common.by import By
+except ImportError:
+    webdriver = None
+try:
+    from win32api import GetFileVersionInfo, LOWORD, HIWORD
+except ImportError:
+    GetFileVersionInfo = None
 
 # Import Custom Libraries
 try:
     from . import JLog
-    from . import get_chromedriver
+    from . import key_value_store
+    from . import wimp_grid
 except Exception:
     import JLog
-    import get_chromedriver
+    import key_value_store
+    import wimp_grid
+try:
+    from . import get_chromedriver
+except Exception:
+    try:
+        import get_chromedriver
+    except Exception:
+        get_chromedriver = None
+
+# Locate the cached folder
+UTILITIES_PATH = os.path.dirname(os.path.realpath(__file__))
+PYTHON_SCRIPTS_PATH = os.path.dirname(UTILITIES_PATH)
+ROOT_PATH = os.path.dirname(PYTHON_SCRIPTS_PATH)
+CACHED_FOLDER = os.path.join(ROOT_PATH, 'cached')
+WIMP_STORE_PATH = os.path.join(CACHED_FOLDER, 'wimp.sqlite')
+LEGACY_PICKLE_PATH = os.path.join(CACHED_FOLDER, 'wimp_dict.pickle')
+WIMP_GRID_PATH = os.path.join(CACHED_FOLDER, 'wimp_grid.npz')
+WIMP_URL = "http://climate.geog.udel.edu/~wimp/index.html"
+# WimpScraperPool defaults
+POOL_WORKERS = 4
+POOL_MAX_EXECUTIONS = 50    # Scrapes before a worker recycles its checker
+POOL_RETRIES = 2            # Extra attempts per point after a failed scrape
+REQUEST_TIMEOUT = 60
+MONTH_TEXT = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
 
 def get_chrome_version():
     """Gets the major, minor and build versions of the local Google Chrome installation"""
@@ -115,8 +155,9 @@ def get_chrome_version():
 
 class wimp_checker(object):
 
-    def __init__(self):
+    def __init__(self, base_url=WIMP_URL):
         self.driver = None
+        self.base_url = base_url
         # Get Chrome Version
         self.chrome_driver_path = get_chromedriver.get_chrome_driver_path()
         self.open_browser()
@@ -145,6 +186,8 @@ class wimp_checker(object):
 
     def close_browser(self):
         # Close browser
+        if self.driver is None:
+            return
         self.driver.stop_client()
         self.driver.quit()
         self.driver = None
@@ -157,7 +200,7 @@ class wimp_checker(object):
         """
         # Create PrintLog
         log = JLog.PrintLog(Indent=2)
-        url = "http://climate.geog.udel.edu/~wimp/index.html"
+        url = self.base_url
         log.Wrap('Scraping Page ({})...'.format(url))
 
         try:
@@ -308,26 +351,10 @@ class wimp_checker(object):
                         self.driver.stop_client()
                         self.driver.quit()
                     return 'PERMANENT SNOW COVER'
-            # Create empty lists
-            rows = []
-            row = []
-            jan_count = 0
-            month_text = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
             raw_list = []
             for elem in self.driver.find_elements_by_xpath("//td"):
                 raw_list.append(elem.text)
-            for text in raw_list:
-                if text == 'Total':
-                    rows.append(row)
-                    break
-                if text == 'Jan':
-                    jan_count += 1
-                if  jan_count > 2:
-                    if text in month_text:
-                        if row:
-                            rows.append(row)
-                            row = []
-                    row.append(text)
+            rows = parse_wimp_rows(raw_list)
             # Get Graph
             if not watershed_analysis:
                 if not output_folder is None:
@@ -380,6 +407,173 @@ class wimp_checker(object):
             except Exception:
                 pass
 
+def parse_wimp_rows(raw_list):
+    """Picks the monthly water balance rows out of the text of every table cell on the results page"""
+    rows = []
+    row = []
+    jan_count = 0
+    for text in raw_list:
+        if text == 'Total':
+            rows.append(row)
+            break
+        if text == 'Jan':
+            jan_count += 1
+        if  jan_count > 2:
+            if text in MONTH_TEXT:
+                if row:
+                    rows.append(row)
+                    row = []
+            row.append(text)
+    return rows
+
+def element_text(element):
+    """Visible text of a BeautifulSoup element, whitespace collapsed (as Selenium reports it)"""
+    return ' '.join(element.get_text().split())
+
+class WimpHttpClient(object):
+    """
+    Queries WebWIMP by submitting its forms directly with requests and
+    parsing the returned pages with BeautifulSoup (no browser needed).
+    Each form is read from the page before it is submitted, so hidden
+    fields and form actions are carried along as a browser would.
+    """
+    def __init__(self, base_url=WIMP_URL, session=None, timeout=REQUEST_TIMEOUT):
+        self.base_url = base_url
+        self.session = session if session is not None else requests.Session()
+        self.timeout = timeout
+
+    def close_browser(self):
+        """Nothing to close (lets the client stand in for wimp_checker)"""
+        return
+
+    def get_page(self, url):
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.url, BeautifulSoup(response.text, 'html.parser')
+
+    def find_form(self, soup, field_name=None, button_value=None):
+        """Returns the first form with an input named field_name (or a button labelled button_value)"""
+        for form in soup.find_all('form'):
+            for element in form.find_all('input'):
+                if field_name is not None and element.get('name') == field_name:
+                    return form
+                if button_value is not None and element.get('value') == button_value:
+                    return form
+        return None
+
+    def submit(self, page, form, values=None, button_value=None):
+        """Submits a form with its current values, updated by values, pressing the button labelled button_value"""
+        page_url = page[0]
+        data = []
+        for element in form.find_all(['input', 'select', 'textarea']):
+            name = element.get('name')
+            if not name:
+                continue
+            if element.name == 'select':
+                options = element.find_all('option')
+                selected = [option for option in options if option.has_attr('selected')] or options[:1]
+                for option in selected:
+                    data.append((name, option.get('value', element_text(option))))
+                continue
+            if element.name == 'textarea':
+                data.append((name, element.get_text()))
+                continue
+            input_type = (element.get('type') or 'text').lower()
+            if input_type in ['submit', 'button', 'image', 'reset']:
+                if button_value is not None and element.get('value') == button_value:
+                    data.append((name, element.get('value')))
+                continue
+            if input_type in ['checkbox', 'radio'] and not element.has_attr('checked'):
+                continue
+            data.append((name, element.get('value', '')))
+        if values:
+            data = [(name, value) for name, value in data if name not in values]
+            data.extend(values.items())
+        action = urljoin(page_url, form.get('action') or page_url)
+        if (form.get('method') or 'get').lower() == 'post':
+            response = self.session.post(action, data=data, timeout=self.timeout)
+        else:
+            response = self.session.get(action, params=data, timeout=self.timeout)
+        response.raise_for_status()
+        return response.url, BeautifulSoup(response.text, 'html.parser')
+
+    def page_says(self, page, text):
+        """True if any span on the page contains text"""
+        return any(text in element_text(span) for span in page[1].find_all('span'))
+
+    def check_wimp(self, lat, lon, output_folder=None, watershed_analysis=False):
+        """
+        Queries WebWIMP:
+        The Web-based, Water-Budget, Interactive, Modeling Program,
+        submitting the same form fields as the browser automation in wimp_checker
+        """
+        # Create PrintLog
+        log = JLog.PrintLog(Indent=2)
+        log.Wrap('Querying Page ({})...'.format(self.base_url))
+        try:
+            page = self.get_page(self.base_url)
+            # Supply today's date as the 'Project Title'
+            current_date_string = datetime.datetime.now().strftime("%Y-%m-%d")
+            title_string = 'ARC Request - {}'.format(current_date_string)
+            page = self.submit(page, self.find_form(page[1], field_name='yname'), {'yname': title_string})
+            # Supply the Latitude and Longitude
+            page = self.submit(page, self.find_form(page[1], field_name='lati'), {'lati': '{}'.format(lat), 'long': '{}'.format(lon)})
+            # Work around 'Point falls within large body of water' errors as wimp_checker does:
+            # revise unchanged, then with Latitude + .01, then with Longitude + .01
+            revisions = [(lat, lon), (lat + .01, lon), (lat, lon + .01)]
+            for revised_lat, revised_lon in revisions:
+                if not self.page_says(page, 'large body of water.'):
+                    break
+                revise_form = self.find_form(page[1], button_value='Revise Longitude and Latitude')
+                page = self.submit(page,
+                                   revise_form,
+                                   {'Latitude': '{}'.format(revised_lat), 'Longitude': '{}'.format(revised_lon)},
+                                   button_value='Revise Longitude and Latitude')
+            if self.page_says(page, 'large body of water.'):
+                log.Wrap('WebWIMP ERROR: - This location falls on a large body of water.')
+                return 'LARGE WATER BODY'
+            # Press "Water Balance"
+            page = self.submit(page, self.find_form(page[1], button_value='Water Balance'), button_value='Water Balance')
+            # Check for permanent snow cover error
+            for span in page[1].find_all('span'):
+                if 'A permanent snow cover exists' in element_text(span):
+                    log.Wrap('WebWIMP ERROR: - {}'.format(element_text(span)))
+                    return 'PERMANENT SNOW COVER'
+            rows = parse_wimp_rows([element_text(cell) for cell in page[1].find_all('td')])
+            # Get Graph
+            if not watershed_analysis and output_folder is not None:
+                self.save_graph(page, output_folder)
+            return rows
+        except Exception:
+            log.Wrap(traceback.format_exc())
+            return 'ERROR'
+
+    def save_graph(self, page, output_folder):
+        """Saves the Water Balance Graph linked from the results page and opens it"""
+        log = JLog.PrintLog(Indent=2)
+        try:
+            for link in page[1].find_all('a'):
+                if element_text(link) == 'Monthly and annual climatic water balance graph':
+                    graph_url = urljoin(page[0], link.get('href'))
+                    break
+            else:
+                return
+            log.Wrap('Getting Web Wimp Water Balance Graph...')
+            response = self.session.get(graph_url, timeout=self.timeout)
+            response.raise_for_status()
+            if not response.headers.get('Content-Type', '').startswith('image'):
+                # The link leads to a page showing the graph
+                image = BeautifulSoup(response.text, 'html.parser').find('img')
+                response = self.session.get(urljoin(response.url, image.get('src')), timeout=self.timeout)
+                response.raise_for_status()
+            web_wimp_graph_path = os.path.join(output_folder, 'Web WIMP Water Balance Graph.png')
+            with open(web_wimp_graph_path, 'wb') as graph_file:
+                graph_file.write(response.content)
+            log.Wrap('  Opening saved graph in sub-process...')
+            subprocess.Popen(web_wimp_graph_path, shell=True)
+        except Exception:
+            log.Wrap(traceback.format_exc())
+
 def make_length(number, length):
     num_str = str(number)
     while len(num_str) < length:
@@ -427,8 +621,9 @@ def calculate_wet_dry_table(wimp_rows, output_folder=None):
     log.Wrap('Parsing scraped WebWimp values and Calculating Wet/Dry Season...')
     # Attempt to create CSV PrintLog and write first line
     csv = False
-    csv_log_file = os.path.join(output_folder, 'WebWimp Values.csv')
+    csv_log_file = None
     if output_folder is not None:
+        csv_log_file = os.path.join(output_folder, 'WebWimp Values.csv')
         csv_log = JLog.PrintLog(Delete=True,
                                 LogOnly=True,
                                 Log=csv_log_file)
@@ -455,7 +650,8 @@ def calculate_wet_dry_table(wimp_rows, output_folder=None):
             # Convert WebWIMP Scraped wimp_rows to smaller subset saved to CSV
             csv_rows.append([mon, diff, dst, def_val, season])
     except Exception:
-        os.remove(csv_log_file)
+        if csv_log_file is not None:
+            os.remove(csv_log_file)
         raise
     return csv_rows
 
@@ -526,117 +722,290 @@ def get_season_from_rows(rows, month=None):
         selected_season = None
     return selected_season
 
+class WimpStore(object):
+    """WebWIMP results keyed by "lat,lon", read one key at a time from a SQLite store
+
+    Safe to share between processes.  The first time it is opened, the
+    contents of the old wimp_dict.pickle are moved into it.
+    """
+    def __init__(self, path=WIMP_STORE_PATH, legacy_pickle_path=LEGACY_PICKLE_PATH):
+        self.log = JLog.PrintLog()
+        self.store = key_value_store.KeyValueStore(path, table='wimp')
+        # Keys already read (or written) by this process
+        self.memo = dict()
+        self.migrate_pickle(legacy_pickle_path)
+
+    def migrate_pickle(self, legacy_pickle_path):
+        """Moves the entries of a legacy wimp_dict.pickle into the store, then deletes the pickle"""
+        if not os.path.exists(legacy_pickle_path):
+            return
+        self.log.Wrap('Moving previously cached WebWIMP Dictionary to the WebWIMP store...')
+        try:
+            with open(legacy_pickle_path, 'rb') as handle:
+                legacy_dict = pickle.load(handle)
+            self.store.put_many(legacy_dict)
+            os.remove(legacy_pickle_path)
+        except Exception:
+            self.log.Wrap('Moving the WebWIMP Dictionary failed.')
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __getitem__(self, key):
+        if key in self.memo:
+            return self.memo[key]
+        value = self.store.get(key)
+        if value is None:
+            raise KeyError(key)
+        self.memo[key] = value
+        return value
+
+    def __contains__(self, key):
+        return key in self.memo or key in self.store
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def __len__(self):
+        return len(self.store)
+
+    def items(self):
+        """Yields every stored (key, value) pair"""
+        return self.store.items()
+
+    def put(self, key, value):
+        """Stores one result immediately"""
+        self.store.put(key, value)
+        self.memo[key] = value
+
+    def get_many(self, keys):
+        """Returns a dict of the stored results for whichever keys exist"""
+        keys = list(keys)
+        found = {key: self.memo[key] for key in keys if key in self.memo}
+        missing = [key for key in keys if key not in found]
+        if missing:
+            stored = self.store.get_many(missing)
+            self.memo.update(stored)
+            found.update(stored)
+        return found
+
+
+class WimpScraperPool(object):
+    """Scrapes many WebWIMP points at once
+
+    Worker threads take points from a work queue, each with its own checker
+    (recycled every max_executions scrapes), and failed scrapes go back on
+    the queue until the retry budget is spent.  Every result is written to
+    the WebWIMP store as soon as it arrives.
+    """
+    def __init__(self, wimp_dict, num_workers=POOL_WORKERS, max_executions=POOL_MAX_EXECUTIONS,
+                 retries=POOL_RETRIES, base_url=WIMP_URL, checker_factory=None):
+        self.log = JLog.PrintLog()
+        self.wimp_dict = wimp_dict
+        self.num_workers = num_workers
+        self.max_executions = max_executions
+        self.retries = retries
+        self.base_url = base_url
+        if checker_factory is None:
+            checker_factory = WimpHttpClient
+        self.checker_factory = checker_factory
+        self.work_queue = queue.Queue()
+        self.results = dict()
+        self.results_lock = threading.Lock()
+
+    def new_checker(self):
+        return self.checker_factory(base_url=self.base_url)
+
+    def store_result(self, keys, rows):
+        """Saves one point's result under each of its keys"""
+        with self.results_lock:
+            for key in keys:
+                self.results[key] = rows
+        for key in keys:
+            try:
+                self.wimp_dict[key] = rows
+            except Exception:
+                self.log.Wrap('WebWIMP results could not be cached.')
+
+    def worker(self):
+        checker = None
+        executions = 0
+        while True:
+            task = self.work_queue.get()
+            if task is None:
+                self.work_queue.task_done()
+                break
+            lat, lon, keys, attempts_left = task
+            try:
+                if checker is None or executions >= self.max_executions:
+                    if checker is not None:
+                        checker.close_browser()
+                    checker = self.new_checker()
+                    executions = 0
+                executions += 1
+                wimp_rows = checker.check_wimp(lat, lon, None, watershed_analysis=True)
+                if wimp_rows in ['LARGE WATER BODY', 'PERMANENT SNOW COVER']:
+                    self.store_result(keys, wimp_rows)
+                elif wimp_rows and wimp_rows != 'ERROR':
+                    self.store_result(keys, calculate_wet_dry_table(wimp_rows))
+                else:
+                    raise ValueError('WebWIMP returned no data at {},{}'.format(lat, lon))
+            except Exception:
+                # Start over with a fresh checker and try again later
+                try:
+                    if checker is not None:
+                        checker.close_browser()
+                except Exception:
+                    pass
+                checker = None
+                if attempts_left > 0:
+                    self.work_queue.put((lat, lon, keys, attempts_left - 1))
+                else:
+                    self.log.Wrap('WebWIMP could not be scraped at {},{}'.format(lat, lon))
+            finally:
+                self.work_queue.task_done()
+        if checker is not None:
+            try:
+                checker.close_browser()
+            except Exception:
+                pass
+
+    def run(self, points):
+        """Scrapes every (lat, lon, keys) task and returns {key: rows} for those that succeeded"""
+        if not points:
+            return dict()
+        for lat, lon, keys in points:
+            self.work_queue.put((lat, lon, keys, self.retries))
+        threads = []
+        for _ in range(min(self.num_workers, len(points))):
+            thread = threading.Thread(target=self.worker)
+            thread.daemon = True
+            thread.start()
+            threads.append(thread)
+        # Wait until every task (including retries) is done, then stop the workers
+        self.work_queue.join()
+        for _ in threads:
+            self.work_queue.put(None)
+        for thread in threads:
+            thread.join()
+        return self.results
+
+
 class WimpScraper(object):
     """Manages the scraping of Web WIMP"""
     def __init__(self, watershed_analysis=False):
         self.log = JLog.PrintLog()
         self.rows = []
+        self.http_client = None
         self.wimp_checker_instance = None
         self.wimp_dict = None
-        self.batch_dict = None
         self.wimp_checker_executions = 0
-        self.unpickle_dict()
+        self.wimp_grid = None
+        self.open_store()
     
-    def pickle_dict(self):
-        # Locate web_wimp_dict_pickle 
-        utilities_path = os.path.dirname(os.path.realpath(__file__))
-        python_scripts_path = os.path.dirname(utilities_path)
-        root_path = os.path.dirname(python_scripts_path)
-        pickle_folder = os.path.join(root_path, 'cached')
-        wimp_dict_pickle_path = os.path.join(pickle_folder, 'wimp_dict.pickle')
-        pickle_lockfile = os.path.join('wimp_dict.pickle.lock')
-        while os.path.exists(pickle_lockfile):
-            print('Waiting for pickle file to be free...')
-            time.sleep(1)
-        with open(pickle_lockfile, 'w') as lockfile_writer:
-            lockfile_writer.write('File is locked...')
-            sys.stdout.flush()
-        # Get latest copy of dictionary (Supporting multiple processes)
-        self.unpickle_dict()
-        # Add all new items to dictionary
-        for key in self.batch_dict:
-            self.wimp_dict[key] = self.batch_dict[key]
-        if self.wimp_dict is not None:
-            for x in range(3):
-                try:
-                    self.log.Wrap('Caching WebWIMP Dictionary for future use...')
-                    # Store Data (serialize)
-                    with open(wimp_dict_pickle_path, 'wb') as handle:
-                        pickle.dump(self.wimp_dict, handle, protocol=pickle.HIGHEST_PROTOCOL)
-                    self.log.Wrap('WebWIMP Dictionary cached.')
-                    os.remove(pickle_lockfile)
-                    break
-                except Exception:
-                    if x < 2:
-                        self.log.Wrap('Caching failed, trying again in 5 seconds...')
-                        time.sleep(5)
-                    else:
-                        self.log.Wrap('WibWIMP Dictionary could not be cached.')
-
-    def unpickle_dict(self):
-        # Locate web_wimp_dict_pickle 
-        utilities_path = os.path.dirname(os.path.realpath(__file__))
-        python_scripts_path = os.path.dirname(utilities_path)
-        root_path = os.path.dirname(python_scripts_path)
-        pickle_folder = os.path.join(root_path, 'cached')
-        wimp_dict_pickle_path = os.path.join(pickle_folder, 'wimp_dict.pickle')
-        wimp_dict_pickle_exists = os.path.exists(wimp_dict_pickle_path)
-        if wimp_dict_pickle_exists:
-            self.log.Wrap('Unserializing previously cached WebWIMP Dictionary..."')
-            try:
-                with open(wimp_dict_pickle_path, 'rb') as handle:
-                    self.wimp_dict = pickle.load(handle)
-            except Exception:
-                self.log.Wrap('Unserializing failed.')
-        else:
+    def open_store(self):
+        """Opens the WebWIMP store (entries are only read as they are needed)"""
+        try:
+            self.wimp_dict = WimpStore()
+        except Exception:
+            self.log.Wrap('Opening the WebWIMP store failed.')
+            self.log.Wrap(traceback.format_exc())
             self.wimp_dict = dict()
 
-    def batch(self, point_list, write_dictionary=False):
-        # Ensure wimp_dict has been unpickled
+    def get_wimp_grid(self):
+        """Returns the 0.1 degree grid of cached results (loaded once; new results are added to it)"""
+        if self.wimp_grid is None:
+            self.wimp_grid = wimp_grid.load_or_build(self.wimp_dict, WIMP_GRID_PATH)
+        return self.wimp_grid
+
+    def add_to_grid(self, results):
+        """Adds newly stored {key: rows} results to the grid, if it has been loaded"""
+        if self.wimp_grid is None:
+            return
+        for key, rows in results.items():
+            self.wimp_grid.add(key, rows)
+        self.wimp_grid.entry_count += len(results)
+
+    def season_names(self, point_list, month, max_cells=1):
+        """Returns 'Wet' / 'Dry' (None where nothing valid is cached nearby) for every [lat, lon] in one call"""
+        grid = self.get_wimp_grid()
+        lats = [point[0] for point in point_list]
+        lons = [point[1] for point in point_list]
+        return grid.season_names(lats, lons, month, max_cells=max_cells)
+
+    def store_rows(self, wimp_dict_key, rows):
+        """Saves one point's results to the WebWIMP store for future use"""
+        try:
+            self.wimp_dict[wimp_dict_key] = rows
+        except Exception:
+            self.log.Wrap('WebWIMP results could not be cached.')
+            return
+        self.add_to_grid({wimp_dict_key: rows})
+
+    def batch(self, point_list, write_dictionary=False, num_workers=POOL_WORKERS, base_url=WIMP_URL):
+        """Scrapes every uncached point in point_list with a WimpScraperPool
+
+        Results are stored under the 0.1 degree key get_season() looks up
+        (and the point's own key when write_dictionary is set).
+        """
+        # Ensure the WebWIMP store is open
         if self.wimp_dict is None:
-            self.unpickle_dict()
-        # Create new batch_dict
-        self.batch_dict = dict()
-        # Locate webWIMP_Cache folder and 
-        utilities_path = os.path.dirname(os.path.realpath(__file__))
-        python_scripts_path = os.path.dirname(utilities_path)
-        root_path = os.path.dirname(python_scripts_path)
-        pickle_folder = os.path.join(root_path, 'cached')
-        wimp_cache_folder = os.path.join(pickle_folder, 'WebWIMP')
-        # Iterate through points
-        new_keys = 0
-        num_points = len(point_list)
-        position = 0
+            self.open_store()
+        # Group points by the cell they will be scraped at
+        tasks = dict()
         for point in point_list:
-            position += 1
-            scrape_coords = False
-            lat = point[0]
-            lon = point[1]
-            wimp_dict_key = '{},{}'.format(lat, lon)
-            # Check for existing entry for key
+            lat = round(float(point[0]), 1)
+            lon = round(float(point[1]), 1)
+            keys = tasks.setdefault((lat, lon), [])
+            for key in ['{},{}'.format(lat, lon), '{},{}'.format(point[0], point[1])]:
+                if key not in keys and (write_dictionary or not keys):
+                    keys.append(key)
+        to_scrape = []
+        for (lat, lon), keys in tasks.items():
+            missing_keys = [key for key in keys if key not in self.wimp_dict]
+            if missing_keys:
+                to_scrape.append((lat, lon, missing_keys))
+        if not to_scrape:
+            return
+        self.log.Wrap('Scraping WebWIMP at {} of {} points ({} workers)...'.format(len(to_scrape), len(point_list), num_workers))
+        pool = WimpScraperPool(self.wimp_dict, num_workers=num_workers, base_url=base_url)
+        results = pool.run(to_scrape)
+        num_scraped = len([task for task in to_scrape if task[2][0] in results])
+        self.log.Wrap('{} of {} WebWIMP results scraped and cached.'.format(num_scraped, len(to_scrape)))
+        self.add_to_grid(results)
+        if self.wimp_grid is not None and self.wimp_grid.entry_count == len(self.wimp_dict):
+            # Nothing else was added meanwhile - save it so the next run needn't rebuild it
             try:
-                self.rows = self.wimp_dict[wimp_dict_key]
-            except KeyError:
-                scrape_coords = True
-            if scrape_coords:
-                self.log.Wrap('{} of {}'.format(position, num_points))
-                coordinate_folder = os.path.join(wimp_cache_folder, '{}, {}'.format(lat, lon))
-                self.rows = []
-                self.get_season(lat=lat,
-                                lon=lon,
-                                output_folder=coordinate_folder,
-                                watershed_analysis=True)
-                if write_dictionary:
-                    if self.rows:
-                        self.batch_dict[wimp_dict_key] = self.rows
-                        new_keys += 1
-                        if new_keys >= 10:
-                            self.pickle_dict()
-                            new_keys = 0
-        if new_keys > 0:
-            self.pickle_dict()
+                self.wimp_grid.save(WIMP_GRID_PATH)
+            except OSError:
+                pass
         return
 
+    def check_wimp_in_browser(self, lat, lon, output_folder=None, watershed_analysis=False):
+        """Scrapes WebWIMP with Selenium (used when the direct form submission fails)"""
+        if webdriver is None or get_chromedriver is None:
+            self.log.Wrap(' Selenium is not available; cannot fall back to the web browser.')
+            return 'ERROR'
+        # Create wimp_checker_instance (preserves Chrome Driver instance for speed in batch operations)
+        if self.wimp_checker_instance is None:
+            self.wimp_checker_instance = wimp_checker()
+        else:
+            self.wimp_checker_executions += 1
+            if self.wimp_checker_executions > 50:
+                self.wimp_checker_instance.close_browser()
+                del self.wimp_checker_instance
+                time.sleep(1)
+                self.wimp_checker_instance = wimp_checker()
+                self.wimp_checker_executions = 0
+        self.log.Wrap(' Calling check_wimp() function in the web browser...')
+        return self.wimp_checker_instance.check_wimp(lat,
+                                                     lon,
+                                                     output_folder,
+                                                     watershed_analysis=watershed_analysis)
+
     def get_season(self, lat, lon, month=None, output_folder=None, watershed_analysis=False):
         """
         Checks for local copies before scraping WebWIMP and calculating
@@ -662,38 +1031,11 @@ class WimpScraper(object):
                 self.rows = self.wimp_dict[wimp_dict_key]
                 if self.rows in error_messages:
                     self.log.Write(' {}'.format(self.rows))
-                    self.log.Wrap(' No data found at {},{}. Trying an adjacent point.'.format(lat, lon))
-                    lat_a = lat + 0.1
-                    lon_a = lon
-                    self.log.Wrap('Scraping WebWIMP at {},{}...'.format(lat_a, lon_a))
-                    wimp_dict_key = '{},{}'.format(lat_a, lon_a)
-                    self.rows = self.wimp_dict[wimp_dict_key]
-                    if self.rows in error_messages:
-                        self.log.Write(' {}'.format(self.rows))
-                        self.log.Wrap(' No data found at {},{}. Trying another adjacent point.'.format(lat_a, lon_a))
-                        lat_a = lat - 0.1
-                        lon_a = lon
-                        self.log.Wrap('Scraping WebWIMP at {},{}...'.format(lat_a, lon_a))
-                        wimp_dict_key = '{},{}'.format(lat_a, lon_a)
-                        self.rows = self.wimp_dict[wimp_dict_key]
-                        if self.rows in error_messages:
-                            self.log.Write(' {}'.format(self.rows))
-                            self.log.Wrap(' No data found at {},{}. Trying another adjacent point.'.format(lat_a, lon_a))
-                            lat_a = lat
-                            lon_a = lon + 0.1
-                            self.log.Wrap('Scraping WebWIMP at {},{}...'.format(lat_a, lon_a))
-                            wimp_dict_key = '{},{}'.format(lat_a, lon_a)
-                            self.rows = self.wimp_dict[wimp_dict_key]
-                            if self.rows in error_messages:
-                                self.log.Write(' {}'.format(self.rows))
-                                self.log.Wrap(' No data found at {},{}. Trying final adjacent point.'.format(lat_a, lon_a))
-                                lat_a = lat
-                                lon_a = lon - 0.1
-                                self.log.Wrap('Scraping WebWIMP at {},{}...'.format(lat_a, lon_a))
-                                wimp_dict_key = '{},{}'.format(lat_a, lon_a)
-                                self.rows = self.wimp_dict[wimp_dict_key]
-                                if self.rows in error_messages:
-                                    self.log.Write(' {}'.format(self.rows))
+                    self.log.Wrap(' No data found at {},{}. Trying adjacent points.'.format(lat, lon))
+                    neighbour_key = self.get_wimp_grid().nearest_valid_key(lat, lon)
+                    if neighbour_key is not None:
+                        self.log.Wrap('Using WebWIMP data at {}...'.format(neighbour_key))
+                        self.rows = self.wimp_dict[neighbour_key]
                 season = get_season_from_rows(self.rows, month)
                 self.log.print_separator_line()
                 self.log.Write('')
@@ -711,24 +1053,18 @@ class WimpScraper(object):
                     self.log.print_separator_line()
                     self.log.Write('')
                     return season
-            # Create wimp_checker_instance (preserves Chrome Driver instance for speed in batch operations)
-            if self.wimp_checker_instance is None:
-                self.wimp_checker_instance = wimp_checker()
-            else:
-                self.wimp_checker_executions += 1
-                if self.wimp_checker_executions > 50:
-                    self.wimp_checker_instance.close_browser()
-                    del self.wimp_checker_instance
-                    time.sleep(1)
-                    self.wimp_checker_instance = wimp_checker()
-                    self.wimp_checker_executions = 0
             # Finally pull the data directly from WebWimp
             self.log.Wrap(' Calling check_wimp() function...')
-            wimp_rows = self.wimp_checker_instance.check_wimp(lat,
-                                                              lon,
-                                                              output_folder,
-                                                              watershed_analysis=watershed_analysis)
-            if wimp_rows == 'ERROR':
+            if self.http_client is None:
+                self.http_client = WimpHttpClient()
+            wimp_rows = self.http_client.check_wimp(lat,
+                                                    lon,
+                                                    output_folder,
+                                                    watershed_analysis=watershed_analysis)
+            if not wimp_rows or wimp_rows == 'ERROR':
+                # No usable rows - fall back to operating the forms in a web browser
+                wimp_rows = self.check_wimp_in_browser(lat, lon, output_folder, watershed_analysis)
+            if not wimp_rows or wimp_rows == 'ERROR':
                 return 'ERROR'
             if wimp_rows == 'LARGE WATER BODY':
                 self.rows = wimp_rows
@@ -744,11 +1080,10 @@ class WimpScraper(object):
             season = get_season_from_rows(self.rows, month)
             self.log.print_separator_line()
             self.log.Write('')
-            # Add Rows to Dictionary and Pickle It for use later
+            # Add Rows to the WebWIMP store for use later
             if rows_needed:
                 if self.rows:
-                    self.batch_dict[wimp_dict_key] = self.rows
-                    self.pickle_dict()
+                    self.store_rows(wimp_dict_key, self.rows)
             return season
         except Exception:
             self.log.Wrap(traceback.format_exc())
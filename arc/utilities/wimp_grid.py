@@ -0,0 +1,277 @@
+#  This software was developed by United States Army Corps of Engineers (USACE)
+#  employees in the course of their official duties.  USACE used copyrighted,
+#  open source code to develop this software, as such this software 
+#  (per 17 USC § 101) is considered "joint work."  Pursuant to 17 USC § 105,
+#  portions of the software developed by USACE employees in the course of their
+#  official duties are not subject to copyright protection and are in the public
+#  domain.
+#  
+#  USACE assumes no responsibility whatsoever for the use of this software by
+#  other parties, and makes no guarantees, expressed or implied, about its
+#  quality, reliability, or any other characteristic. 
+#  
+#  The software is provided "as is," without warranty of any kind, express or
+#  implied, including but not limited to the warranties of merchantability,
+#  fitness for a particular purpose, and noninfringement.  In no event shall the
+#  authors or U.S. Government be liable for any claim, damages or other
+#  liability, whether in an action of contract, tort or otherwise, arising from,
+#  out of or in connection with the software or the use or other dealings in the
+#  software.
+#  
+#  Public domain portions of this software can be redistributed and/or modified
+#  freely, provided that any derivative works bear some notice that they are
+#  derived from it, and any modified versions bear some notice that they have
+#  been modified. 
+#  
+#  Copyrighted portions of the software are annotated within the source code.
+#  Open Source Licenses, included in the source code, apply to the applicable
+#  copyrighted portions.  Copyrighted portions of the software are not in the
+#  public domain.
+
+
+######################################
+##  ------------------------------- ##
+##           wimp_grid.py           ##
+##  ------------------------------- ##
+##      Writen by: Jason Deters     ##
+##  ------------------------------- ##
+##    Last Edited on:  2026-10-18   ##
+##  ------------------------------- ##
+######################################
+
+"""
+Cached WebWIMP results laid out on a 0.1 degree grid.
+A dense grid of entry numbers (-1 where nothing is cached) points into
+compact arrays of the monthly DIFF, DST and DEF values, season codes and a
+status code per entry, so a lookup is array indexing and a whole watershed
+can be resolved in one call.  "Nearest valid cell" searches try the same
+neighbours, in the same order, as the original lookup chain
+(lat + 0.1, lat - 0.1, lon + 0.1, lon - 0.1) before moving further out.
+"""
+
+# Import Standard Libraries
+import os
+
+# Import 3rd Party Libraries
+import numpy
+
+CELL_SIZE = 0.1
+# Status codes
+VALID = 0
+LARGE_WATER_BODY = 1
+PERMANENT_SNOW_COVER = 2
+ERROR = 3
+STATUS_CODES = {'LARGE WATER BODY': LARGE_WATER_BODY,
+                'PERMANENT SNOW COVER': PERMANENT_SNOW_COVER,
+                'ERROR': ERROR}
+# Season codes
+DRY = 0
+WET = 1
+SEASON_NAMES = {DRY: 'Dry', WET: 'Wet'}
+# The original adjacent point order
+FIRST_NEIGHBOURS = [(0, 0), (1, 0), (-1, 0), (0, 1), (0, -1)]
+
+
+def neighbour_offsets(max_cells=1):
+    """(row, column) offsets to try, nearest first, starting with the original adjacent point order"""
+    offsets = list(FIRST_NEIGHBOURS)
+    others = []
+    for d_row in range(-max_cells, max_cells + 1):
+        for d_column in range(-max_cells, max_cells + 1):
+            if (d_row, d_column) not in offsets:
+                others.append((d_row, d_column))
+    others.sort(key=lambda offset: (offset[0] ** 2 + offset[1] ** 2, -offset[0], -offset[1]))
+    return offsets + others
+
+
+def parse_key(key):
+    """Returns (lat, lon) of a "lat,lon" key, or None"""
+    try:
+        lat, lon = key.split(',')
+        return float(lat), float(lon)
+    except (AttributeError, ValueError):
+        return None
+
+
+def parse_rows(rows):
+    """Returns (status, values (12 x 3) DIFF/DST/DEF, seasons (12,)) for one cached result"""
+    values = numpy.full((12, 3), numpy.nan, dtype=numpy.float32)
+    seasons = numpy.full(12, -1, dtype=numpy.int8)
+    if isinstance(rows, str):
+        return STATUS_CODES.get(rows, ERROR), values, seasons
+    try:
+        for month in range(12):
+            row = rows[month]
+            values[month] = [float(row[1]), float(row[2]), float(row[3])]
+            seasons[month] = WET if row[4] == 'Wet' else DRY
+    except Exception:
+        return ERROR, values, seasons
+    return VALID, values, seasons
+
+
+class WimpGrid(object):
+    """0.1 degree grid over every cached WebWIMP result"""
+    def __init__(self, lat_origin, lon_origin, cell_index, keys, status, values, seasons, entry_count):
+        self.lat_origin = int(lat_origin)     # In cells (lat * 10)
+        self.lon_origin = int(lon_origin)
+        self.cell_index = cell_index          # (rows x columns) entry number, -1 where nothing is cached
+        self.keys = keys                      # Store key of each entry
+        self.status = status
+        self.values = values                  # (entries x 12 x 3) DIFF, DST, DEF
+        self.seasons = seasons                # (entries x 12) season codes
+        self.entry_count = int(entry_count)   # Size of the store the grid was built from
+
+    @classmethod
+    def from_items(cls, items, entry_count):
+        """Builds the grid from (key, rows) pairs; where several keys share a cell a valid one wins"""
+        cells = {}
+        for key, rows in items:
+            coordinates = parse_key(key)
+            if coordinates is None:
+                continue
+            cell = (int(round(coordinates[0] / CELL_SIZE)), int(round(coordinates[1] / CELL_SIZE)))
+            status, values, seasons = parse_rows(rows)
+            if cell not in cells or (status == VALID and cells[cell][1] != VALID):
+                cells[cell] = (key, status, values, seasons)
+        if not cells:
+            return cls(0, 0, numpy.full((0, 0), -1, dtype=numpy.int32), numpy.array([], dtype=str),
+                       numpy.zeros(0, dtype=numpy.int8), numpy.zeros((0, 12, 3), dtype=numpy.float32),
+                       numpy.zeros((0, 12), dtype=numpy.int8), entry_count)
+        cell_list = sorted(cells)
+        cell_rows = numpy.array([cell[0] for cell in cell_list])
+        cell_columns = numpy.array([cell[1] for cell in cell_list])
+        lat_origin = cell_rows.min()
+        lon_origin = cell_columns.min()
+        cell_index = numpy.full((cell_rows.max() - lat_origin + 1, cell_columns.max() - lon_origin + 1), -1, dtype=numpy.int32)
+        cell_index[cell_rows - lat_origin, cell_columns - lon_origin] = numpy.arange(len(cell_list))
+        entries = [cells[cell] for cell in cell_list]
+        return cls(lat_origin, lon_origin, cell_index,
+                   numpy.array([entry[0] for entry in entries], dtype=str),
+                   numpy.array([entry[1] for entry in entries], dtype=numpy.int8),
+                   numpy.array([entry[2] for entry in entries], dtype=numpy.float32),
+                   numpy.array([entry[3] for entry in entries], dtype=numpy.int8),
+                   entry_count)
+
+    def grow(self, row, column):
+        """Widens cell_index (if needed) so it covers the cell at (row, column)"""
+        num_rows, num_columns = self.cell_index.shape
+        if not num_rows or not num_columns:
+            self.lat_origin = row
+            self.lon_origin = column
+            self.cell_index = numpy.full((1, 1), -1, dtype=numpy.int32)
+            return
+        lat_origin = min(self.lat_origin, row)
+        lon_origin = min(self.lon_origin, column)
+        lat_end = max(self.lat_origin + num_rows, row + 1)
+        lon_end = max(self.lon_origin + num_columns, column + 1)
+        if (lat_end - lat_origin, lon_end - lon_origin) == (num_rows, num_columns):
+            return
+        cell_index = numpy.full((lat_end - lat_origin, lon_end - lon_origin), -1, dtype=numpy.int32)
+        row_offset = self.lat_origin - lat_origin
+        column_offset = self.lon_origin - lon_origin
+        cell_index[row_offset:row_offset + num_rows, column_offset:column_offset + num_columns] = self.cell_index
+        self.lat_origin = lat_origin
+        self.lon_origin = lon_origin
+        self.cell_index = cell_index
+
+    def add(self, key, rows):
+        """Adds one result to the grid in place; where the cell is taken a valid result replaces an invalid one"""
+        coordinates = parse_key(key)
+        if coordinates is None:
+            return
+        status, values, seasons = parse_rows(rows)
+        entry = self.entries([coordinates[0]], [coordinates[1]])[0]
+        if entry >= 0:
+            if status == VALID and self.status[entry] != VALID:
+                keys = self.keys.tolist()
+                keys[entry] = key
+                self.keys = numpy.array(keys, dtype=str)
+                self.status[entry] = status
+                self.values[entry] = values
+                self.seasons[entry] = seasons
+            return
+        row = int(round(coordinates[0] / CELL_SIZE))
+        column = int(round(coordinates[1] / CELL_SIZE))
+        self.grow(row, column)
+        self.cell_index[row - self.lat_origin, column - self.lon_origin] = len(self.keys)
+        self.keys = numpy.concatenate([self.keys, numpy.array([key], dtype=str)])
+        self.status = numpy.concatenate([self.status, numpy.array([status], dtype=numpy.int8)])
+        self.values = numpy.concatenate([self.values, values[numpy.newaxis]])
+        self.seasons = numpy.concatenate([self.seasons, seasons[numpy.newaxis]])
+
+    def save(self, path):
+        """Writes the grid to disk (atomically replacing any previous copy)"""
+        # Unique per process, so two runs saving at once don't share a temp file
+        temp_path = '{}.{}.tmp.npz'.format(path, os.getpid())
+        numpy.savez(temp_path,
+                    origin=numpy.array([self.lat_origin, self.lon_origin, self.entry_count], dtype=numpy.int64),
+                    cell_index=self.cell_index,
+                    keys=self.keys,
+                    status=self.status,
+                    values=self.values,
+                    seasons=self.seasons)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Reads a grid written by save()"""
+        with numpy.load(path) as arrays:
+            lat_origin, lon_origin, entry_count = arrays['origin'].tolist()
+            return cls(lat_origin, lon_origin, arrays['cell_index'], arrays['keys'],
+                       arrays['status'], arrays['values'], arrays['seasons'], entry_count)
+
+    def entries(self, lats, lons, d_row=0, d_column=0):
+        """Entry numbers of the cells holding (lats, lons), shifted by (d_row, d_column) cells; -1 if none"""
+        rows = numpy.round(numpy.asarray(lats, dtype=float) / CELL_SIZE).astype(numpy.int64) - self.lat_origin + d_row
+        columns = numpy.round(numpy.asarray(lons, dtype=float) / CELL_SIZE).astype(numpy.int64) - self.lon_origin + d_column
+        entries = numpy.full(rows.shape, -1, dtype=numpy.int64)
+        inside = (rows >= 0) & (rows < self.cell_index.shape[0]) & (columns >= 0) & (columns < self.cell_index.shape[1])
+        entries[inside] = self.cell_index[rows[inside], columns[inside]]
+        return entries
+
+    def nearest_valid(self, lats, lons, max_cells=1):
+        """Entry numbers of the nearest valid cell within max_cells of each point (-1 if none)"""
+        lats = numpy.atleast_1d(numpy.asarray(lats, dtype=float))
+        lons = numpy.atleast_1d(numpy.asarray(lons, dtype=float))
+        found = numpy.full(len(lats), -1, dtype=numpy.int64)
+        for d_row, d_column in neighbour_offsets(max_cells):
+            todo = numpy.flatnonzero(found < 0)
+            if not len(todo):
+                break
+            entries = self.entries(lats[todo], lons[todo], d_row, d_column)
+            valid = entries >= 0
+            valid[valid] = self.status[entries[valid]] == VALID
+            found[todo[valid]] = entries[valid]
+        return found
+
+    def nearest_valid_key(self, lat, lon, max_cells=1):
+        """Store key of the nearest valid result to one point, or None"""
+        entry = self.nearest_valid([lat], [lon], max_cells=max_cells)[0]
+        if entry < 0:
+            return None
+        return str(self.keys[entry])
+
+    def season_names(self, lats, lons, month, max_cells=1):
+        """'Wet' / 'Dry' (or None) for every point in month (1-12), in one call"""
+        entries = self.nearest_valid(lats, lons, max_cells=max_cells)
+        codes = numpy.full(len(entries), -1, dtype=numpy.int8)
+        codes[entries >= 0] = self.seasons[entries[entries >= 0], int(month) - 1]
+        return [SEASON_NAMES.get(int(code)) for code in codes]
+
+
+def load_or_build(store, path):
+    """Returns the grid saved at path, rebuilding (and saving) it when the store has changed size"""
+    entry_count = len(store)
+    if os.path.exists(path):
+        try:
+            grid = WimpGrid.load(path)
+            if grid.entry_count == entry_count:
+                return grid
+        except Exception:
+            pass
+    grid = WimpGrid.from_items(store.items(), entry_count)
+    try:
+        grid.save(path)
+    except OSError:
+        pass
+    return grid